@@ -0,0 +1,197 @@
+"""Benchmarks for the sizing entry points.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_sizing                       # print a report
+    python -m benchmarks.bench_sizing --save-baseline       # record benchmarks/baseline.json
+    python -m benchmarks.bench_sizing --compare             # fail if slower than the baseline
+
+Each case calls one function over a sweep of representative inputs and
+reports per-call latency percentiles and calls per second.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+from dataclasses import dataclass
+from time import perf_counter_ns
+from typing import Callable, Dict, List, Sequence, Tuple
+from calc.constants import CONST, constants_hash
+from calc.reactor import compute_reactor_size, optimal_fission_with_dimensions, turbine_based_fission_reactor
+from calc.reactor_grid import smallest_reactor_for_flow
+from calc.turbine import (
+    Turbine, best_vent_count, coils_needed, optimal_turbine_with_dimensions, turbine_based_on_fission_reactor,
+)
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+@dataclass
+class Case:
+    name: str
+    function: Callable
+    inputs: Sequence[Tuple]
+
+# ---------- Input sweeps ----------
+
+def _burn_rates(step: float) -> List[float]:
+    """Fuel burn rates from MIN_BURN_RATE to MAX_BURN_RATE."""
+    rates = []
+    rate = CONST["MIN_BURN_RATE"]
+    while rate <= CONST["MAX_BURN_RATE"]:
+        rates.append(round(rate, 3))
+        rate += step
+    return rates
+
+
+def _turbine_dimensions() -> List[Tuple[int, int]]:
+    return [
+        (x_z, y)
+        for x_z in range(CONST["TURBINE_MIN_BASE"], CONST["TURBINE_MAX_BASE"] + 1, 2)
+        for y in range(CONST["TURBINE_MIN_HEIGHT"], CONST["TURBINE_MAX_HEIGHT"] + 1)
+    ]
+
+
+def _turbine_geometries() -> List[Tuple[Turbine]]:
+    geometries = []
+    for x_z, y in _turbine_dimensions():
+        for shaft_height in range(1, min(2 * x_z - 5, CONST["TURBINE_MAX_ROTOR_HEIGHT"])):
+            blades = shaft_height * 2
+            geometries.append((Turbine(x_z=x_z, y=y, shaft_height=shaft_height, blades=blades, coils=coils_needed(blades)),))
+    return geometries
+
+
+def _reactor_dimensions() -> List[Tuple[int, int, int]]:
+    return [
+        (x, z, y)
+        for x in range(CONST["MIN_REACTOR_BASE"], CONST["MAX_REACTOR_BASE"] + 1)
+        for z in range(CONST["MIN_REACTOR_BASE"], CONST["MAX_REACTOR_BASE"] + 1)
+        for y in range(CONST["MIN_REACTOR_HEIGHT"], CONST["MAX_REACTOR_HEIGHT"] + 1)
+    ]
+
+
+def build_cases() -> List[Case]:
+    steam_per_fuel = CONST["FISSION_STEAM_PER_FUEL"]
+    fuel_rates = range(1, CONST["MAX_BURN_RATE"] + 1)
+    return [
+        Case("turbine_based_on_fission_reactor", turbine_based_on_fission_reactor,
+             [(rate * steam_per_fuel,) for rate in fuel_rates]),
+        Case("optimal_turbine_with_dimensions", optimal_turbine_with_dimensions, _turbine_dimensions()),
+        Case("best_vent_count", best_vent_count, _turbine_geometries()),
+        Case("turbine_based_fission_reactor", turbine_based_fission_reactor,
+             [(rate * steam_per_fuel,) for rate in fuel_rates]),
+        Case("smallest_reactor_for_flow", smallest_reactor_for_flow,
+             [(rate * steam_per_fuel,) for rate in fuel_rates]),
+        Case("compute_reactor_size", compute_reactor_size, [(rate,) for rate in _burn_rates(0.5)]),
+        Case("optimal_fission_with_dimensions", optimal_fission_with_dimensions, _reactor_dimensions()),
+    ]
+
+# ---------- Measurement ----------
+
+def _percentile(sorted_values: List[int], fraction: float) -> float:
+    index = min(int(round(fraction * (len(sorted_values) - 1))), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+def run_case(case: Case, repeat: int, stride: int) -> Dict[str, float]:
+    """Time every call of the sweep; ValueError counts as a normal (rejected) call."""
+    inputs = case.inputs[::stride]
+    latencies = []
+    errors = 0
+    for _ in range(repeat):
+        for args in inputs:
+            start = perf_counter_ns()
+            try:
+                case.function(*args)
+            except ValueError:
+                errors += 1
+            latencies.append(perf_counter_ns() - start)
+    latencies.sort()
+    total = sum(latencies)
+    return {
+        "calls": len(latencies),
+        "errors": errors,
+        "p50_us": _percentile(latencies, 0.50) / 1_000,
+        "p90_us": _percentile(latencies, 0.90) / 1_000,
+        "p99_us": _percentile(latencies, 0.99) / 1_000,
+        "max_us": latencies[-1] / 1_000,
+        "calls_per_sec": len(latencies) / (total / 1e9) if total else float("inf"),
+    }
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], threshold: float) -> List[str]:
+    """Cases whose median latency grew by more than threshold (a fraction)."""
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            continue
+        limit = reference["p50_us"] * (1 + threshold)
+        if result["p50_us"] > limit:
+            regressions.append(
+                f"{name}: p50 {result['p50_us']:.1f} us > {limit:.1f} us "
+                f"(baseline {reference['p50_us']:.1f} us, +{threshold:.0%} allowed)"
+            )
+    return regressions
+
+
+def print_report(results: Dict[str, Dict]) -> None:
+    print(f"{'case':36} {'calls':>7} {'p50 us':>10} {'p90 us':>10} {'p99 us':>10} {'max us':>10} {'calls/s':>11}")
+    for name, r in results.items():
+        print(
+            f"{name:36} {r['calls']:>7} {r['p50_us']:>10.1f} {r['p90_us']:>10.1f} "
+            f"{r['p99_us']:>10.1f} {r['max_us']:>10.1f} {r['calls_per_sec']:>11.0f}"
+        )
+
+# ---------- Command line ----------
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the sizing entry points.")
+    parser.add_argument("--only", action="append", help="run only this case (repeatable)")
+    parser.add_argument("--repeat", type=int, default=1, help="sweeps per case")
+    parser.add_argument("--quick", action="store_true", help="time every 10th input only")
+    parser.add_argument("--save-baseline", nargs="?", const=DEFAULT_BASELINE, metavar="PATH")
+    parser.add_argument("--compare", nargs="?", const=DEFAULT_BASELINE, metavar="PATH")
+    parser.add_argument("--threshold", type=float, default=0.20, help="allowed p50 slowdown (default 0.20)")
+    args = parser.parse_args(argv)
+
+    cases = build_cases()
+    if args.only:
+        unknown = set(args.only) - {c.name for c in cases}
+        if unknown:
+            parser.error(f"unknown case(s): {', '.join(sorted(unknown))}")
+        cases = [c for c in cases if c.name in args.only]
+
+    results = {}
+    for case in cases:
+        results[case.name] = run_case(case, args.repeat, 10 if args.quick else 1)
+    print_report(results)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump({
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "constants": constants_hash(),
+                "quick": args.quick,
+                "cases": results,
+            }, f, indent=2)
+        print(f"\nBaseline saved to {args.save_baseline}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if baseline.get("constants") != constants_hash():
+            print("\nWarning: baseline was recorded with different constants.")
+        regressions = compare(results, baseline["cases"], args.threshold)
+        if regressions:
+            print("\nRegressions:")
+            for line in regressions:
+                print(f"- {line}")
+            return 1
+        print(f"\nNo regression against {args.compare}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,340 @@
+"""Differential check of the accelerated sizing paths against the scalar reference.
+
+Run from the repository root:
+
+    python -m benchmarks.check_equivalence                  # full domain plus 2000 random cases per check
+    python -m benchmarks.check_equivalence --quick          # every 10th input of the full domain
+    python -m benchmarks.check_equivalence --random 10000 --seed 7
+    python -m benchmarks.check_equivalence --profile default   # one profile only
+
+Each check calls a reference function and one accelerated version (grid,
+batched, closed form, table, store...) on the same inputs: every burn rate and
+dimension tuple of the domain, then seeded random cases. Both must return equal
+fields, or both raise ValueError. The turbine references are the frozen baseline
+search of benchmarks/reference.py; the reactor ones come from calc/reactor.py,
+whose sizing arithmetic is still the original, and the farm and sodium store
+checks compare against a direct call. Every check runs under the
+default constants and under ALTERNATE_PROFILE, which moves the vent, condenser
+and steam breakpoints. Mismatches are listed field by field, with the speedup
+of each path, and the exit code is 1 if any check found one.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+from contextlib import ExitStack, redirect_stdout
+from dataclasses import dataclass, field, fields
+from time import perf_counter_ns
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from benchmarks import reference
+from calc.constants import CONST
+from calc.farm import turbine_farm_for_flow
+from calc.profiles import DEFAULT_PROFILE, PROFILES, make_profile, use_profile
+from calc.reactor import optimal_fission_with_dimensions
+from calc.reactor_grid import evaluate_reactor_grid, grid_row_reactor
+from calc.sodium import _reactor_candidates, sodium_plant_with_dimensions
+from calc.store import ResultStore
+from calc.turbine import (
+    Turbine, best_vent_count, coils_needed, max_vents, optimal_turbine_with_dimensions,
+    turbine_based_on_fission_reactor,
+)
+from calc.turbine_grid import turbine_based_on_fission_reactor_grid, turbine_catalogue, turbines_based_on_fission_reactors
+from calc.turbine_table import TurbineTable, build_turbine_table
+
+MAX_SHOWN = 5  # mismatches printed per check
+
+# Checked after the default profile unless --profile is given
+ALTERNATE_PROFILE = "alternate"
+ALTERNATE_OVERRIDES = {
+    "GENERAL_VENT_GAS_FLOW": 48_000,
+    "GENERAL_CONDENSER_RATE": 40_000,
+    "GENERAL_DISPERSER_GAS_FLOW": 1_000,
+    "FISSION_STEAM_PER_FUEL": 25_000,
+}
+
+@dataclass
+class Check:
+    name: str
+    reference: Callable
+    accelerated: Callable
+    inputs: Sequence[Tuple]
+    compared: Optional[Sequence[str]] = None  # fields to compare, all of them by default
+    batched: bool = False                     # accelerated takes the whole list of inputs at once
+
+
+@dataclass
+class CheckResult:
+    cases: int = 0
+    mismatches: int = 0
+    reference_ns: int = 0
+    accelerated_ns: int = 0
+    shown: List[str] = field(default_factory=list)  # first mismatches, described
+
+# ---------- Input domains ----------
+
+def _water_burn_rates(stride: int) -> List[Tuple]:
+    """Every fuel burn rate as steam, and both sides of every vent and condenser step."""
+    steam_per_fuel = CONST["FISSION_STEAM_PER_FUEL"]
+    rates = {rate * steam_per_fuel for rate in range(0, CONST["MAX_BURN_RATE"] + 1)}
+    top = max(max_vents(x_z, CONST["TURBINE_MAX_HEIGHT"], 1) for x_z in range(5, 18, 2)) + 1
+    for step in (CONST["GENERAL_VENT_GAS_FLOW"], CONST["GENERAL_CONDENSER_RATE"]):
+        for k in range(1, top * CONST["GENERAL_VENT_GAS_FLOW"] // step + 1):
+            rates.update((k * step - 1, k * step, k * step + 1))
+    return [(rate,) for rate in sorted(rates)[::stride]]
+
+
+def _random_water_burn_rates(rng: random.Random, count: int) -> List[Tuple]:
+    high = CONST["MAX_BURN_RATE"] * CONST["FISSION_STEAM_PER_FUEL"] * 2
+    return [(rng.randint(0, high) if i % 2 else rng.uniform(0, high),) for i in range(count)]
+
+
+def _turbine_dimensions(stride: int) -> List[Tuple]:
+    """Valid and invalid (even, too small, too large) turbine sizes."""
+    return [
+        (x_z, y)
+        for x_z in range(CONST["TURBINE_MIN_BASE"] - 2, CONST["TURBINE_MAX_BASE"] + 3)
+        for y in range(CONST["TURBINE_MIN_HEIGHT"] - 2, CONST["TURBINE_MAX_HEIGHT"] + 3)
+    ][::stride]
+
+
+def _turbine_geometries(stride: int) -> List[Tuple]:
+    geometries = []
+    for x_z in range(CONST["TURBINE_MIN_BASE"], CONST["TURBINE_MAX_BASE"] + 1, 2):
+        for y in range(CONST["TURBINE_MIN_HEIGHT"], CONST["TURBINE_MAX_HEIGHT"] + 1):
+            for shaft_height in range(1, min(2 * x_z - 5, CONST["TURBINE_MAX_ROTOR_HEIGHT"])):
+                blades = shaft_height * 2
+                geometries.append((x_z, y, shaft_height, blades, coils_needed(blades)))
+    return geometries[::stride]
+
+
+def _reactor_dimensions(stride: int) -> List[Tuple]:
+    return [
+        (x, z, y)
+        for x in range(CONST["MIN_REACTOR_BASE"], CONST["MAX_REACTOR_BASE"] + 1)
+        for z in range(CONST["MIN_REACTOR_BASE"], CONST["MAX_REACTOR_BASE"] + 1)
+        for y in range(CONST["MIN_REACTOR_HEIGHT"], CONST["MAX_REACTOR_HEIGHT"] + 1)
+    ][::stride]
+
+
+def _shuffled(rng: random.Random, inputs: List[Tuple], count: int) -> List[Tuple]:
+    """Random picks of a finite domain, so caches are also hit out of order."""
+    return [rng.choice(inputs) for _ in range(count)]
+
+# ---------- Accelerated paths ----------
+
+def _vents_closed_form(x_z: int, y: int, shaft_height: int, blades: int, coils: int) -> Tuple[int, float]:
+    return best_vent_count(Turbine(x_z=x_z, y=y, shaft_height=shaft_height, blades=blades, coils=coils), "closed_form")
+
+
+def _vents_reference(x_z: int, y: int, shaft_height: int, blades: int, coils: int) -> Tuple[int, float]:
+    return reference.best_vent_count(Turbine(x_z=x_z, y=y, shaft_height=shaft_height, blades=blades, coils=coils))
+
+
+def _vents_scan(x_z: int, y: int, shaft_height: int, blades: int, coils: int) -> Tuple[int, float]:
+    return best_vent_count(Turbine(x_z=x_z, y=y, shaft_height=shaft_height, blades=blades, coils=coils), "scan")
+
+
+def _catalogue_lookup() -> Callable:
+    by_dimensions = {(t.x_z, t.y): t for t in turbine_catalogue()}
+
+    def lookup(x_z: int, y: int) -> Turbine:
+        if (x_z, y) not in by_dimensions:
+            raise ValueError("Not in the turbine catalogue.")
+        return by_dimensions[(x_z, y)]
+    return lookup
+
+
+def _batched_turbines(inputs: Sequence[Tuple]) -> List[Any]:
+    turbines = turbines_based_on_fission_reactors([rate for rate, in inputs], allow_missing=True)
+    return [ValueError("No single turbine.") if t is None else t for t in turbines]
+
+
+def _reactor_lookup(source: str) -> Callable:
+    """Reactor for (x, z, y) read from the reactor grid or the sodium candidate batch."""
+    if source == "grid":
+        columns = evaluate_reactor_grid()
+        rows = {key: i for i, key in enumerate(zip(columns["x"], columns["z"], columns["y"]))}
+        materialize = grid_row_reactor
+    else:
+        batch = _reactor_candidates()
+        rows = {key: i for i, key in enumerate(zip(batch.column("x"), batch.column("z"), batch.column("y")))}
+        materialize = batch.materialize
+
+    def lookup(x: int, z: int, y: int):
+        if (x, z, y) not in rows:
+            raise ValueError(f"No {source} row for {x}x{z}x{y}.")
+        return materialize(rows[(x, z, y)])
+    return lookup
+
+
+def build_checks(stride: int, random_cases: int, seed: int, workdir: str, resources: ExitStack) -> List[Check]:
+    rng = random.Random(seed)
+    water_rates = _water_burn_rates(stride) + _random_water_burn_rates(rng, random_cases)
+    turbine_dimensions = _turbine_dimensions(stride)
+    turbine_dimensions += _shuffled(rng, turbine_dimensions, min(random_cases, len(turbine_dimensions)))
+    reactor_dimensions = _reactor_dimensions(stride)
+    reactor_dimensions += _shuffled(rng, reactor_dimensions, random_cases)
+    # Past the largest single turbine, every 20th rate
+    farm_flows = [(rate * 3,) for rate, in water_rates[::max(len(water_rates) // 20, 1)]]
+
+    table_path = os.path.join(workdir, "turbine_table.bin")
+    build_turbine_table(table_path)
+    table = resources.enter_context(TurbineTable(table_path))
+    store = ResultStore(os.path.join(workdir, "results.sqlite3"))
+    resources.callback(store.close)
+    # Fields the reference fills in (optimal_fission_with_dimensions leaves the others at 0)
+    reactor_fields = ("x", "z", "y", "fuel_assemblies", "control_rods", "water_burn_rate")
+    turbine_reference = reference.turbine_based_on_fission_reactor
+    dimensions_reference = reference.optimal_turbine_with_dimensions
+
+    return [
+        Check("turbine_based_on_fission_reactor / rewritten scalar", turbine_reference,
+              turbine_based_on_fission_reactor, water_rates),
+        Check("turbine_based_on_fission_reactor / grid", turbine_reference,
+              turbine_based_on_fission_reactor_grid, water_rates),
+        Check("turbine_based_on_fission_reactor / batched", turbine_reference,
+              _batched_turbines, water_rates, batched=True),
+        Check("turbine_based_on_fission_reactor / table", turbine_reference,
+              table.lookup, water_rates),
+        Check("turbine_based_on_fission_reactor / store cold", turbine_reference,
+              lambda rate: store.call(turbine_based_on_fission_reactor, rate), water_rates),
+        Check("turbine_based_on_fission_reactor / store warm", turbine_reference,
+              lambda rate: store.call(turbine_based_on_fission_reactor, rate), water_rates),
+        Check("optimal_turbine_with_dimensions / scan", dimensions_reference,
+              optimal_turbine_with_dimensions, turbine_dimensions),
+        Check("optimal_turbine_with_dimensions / closed form", dimensions_reference,
+              lambda x_z, y: optimal_turbine_with_dimensions(x_z, y, "closed_form"), turbine_dimensions),
+        Check("optimal_turbine_with_dimensions / catalogue", dimensions_reference,
+              _catalogue_lookup(), turbine_dimensions),
+        Check("optimal_turbine_with_dimensions / store", dimensions_reference,
+              lambda x_z, y: store.call(optimal_turbine_with_dimensions, x_z, y), turbine_dimensions),
+        Check("best_vent_count / scan", _vents_reference, _vents_scan, _turbine_geometries(stride)),
+        Check("best_vent_count / closed form", _vents_reference, _vents_closed_form, _turbine_geometries(stride)),
+        Check("optimal_fission_with_dimensions / grid", optimal_fission_with_dimensions,
+              _reactor_lookup("grid"), reactor_dimensions, compared=reactor_fields),
+        Check("optimal_fission_with_dimensions / sodium batch", optimal_fission_with_dimensions,
+              _reactor_lookup("sodium"), reactor_dimensions),
+        Check("turbine_farm_for_flow / store cold", turbine_farm_for_flow,
+              lambda flow: store.call(turbine_farm_for_flow, flow), farm_flows),
+        Check("turbine_farm_for_flow / store warm", turbine_farm_for_flow,
+              lambda flow: store.call(turbine_farm_for_flow, flow), farm_flows),
+        Check("sodium_plant_with_dimensions / store", sodium_plant_with_dimensions,
+              lambda x, z, y: store.call(sodium_plant_with_dimensions, x, z, y), reactor_dimensions),
+    ]
+
+# ---------- Comparison ----------
+
+def _call(function: Callable, args: Tuple) -> Tuple[Any, int]:
+    start = perf_counter_ns()
+    try:
+        result = function(*args)
+    except ValueError as error:
+        result = error
+    return result, perf_counter_ns() - start
+
+
+def differences(expected: Any, actual: Any, compared: Optional[Sequence[str]] = None) -> List[str]:
+    """Human readable differences between two results (records, tuples or ValueErrors)."""
+    if isinstance(expected, ValueError) or isinstance(actual, ValueError):
+        if isinstance(expected, ValueError) and isinstance(actual, ValueError):
+            return []
+        return [f"reference {expected!r}, accelerated {actual!r}"]
+    if type(expected) is not type(actual):
+        return [f"reference {type(expected).__name__}, accelerated {type(actual).__name__}"]
+    if hasattr(expected, "__dataclass_fields__"):
+        names = compared or [f.name for f in fields(expected)]
+        return [
+            f"{name}: {getattr(expected, name)!r} != {getattr(actual, name)!r}"
+            for name in names
+            if getattr(expected, name) != getattr(actual, name)
+        ]
+    return [] if expected == actual else [f"{expected!r} != {actual!r}"]
+
+
+def run_check(check: Check) -> CheckResult:
+    result = CheckResult()
+    expected = []
+    for args in check.inputs:
+        value, elapsed = _call(check.reference, args)
+        expected.append(value)
+        result.reference_ns += elapsed
+    if check.batched:
+        start = perf_counter_ns()
+        actual = check.accelerated(check.inputs)
+        result.accelerated_ns = perf_counter_ns() - start
+    else:
+        actual = []
+        for args in check.inputs:
+            value, elapsed = _call(check.accelerated, args)
+            actual.append(value)
+            result.accelerated_ns += elapsed
+
+    for args, reference, accelerated in zip(check.inputs, expected, actual):
+        result.cases += 1
+        diff = differences(reference, accelerated, check.compared)
+        if diff:
+            result.mismatches += 1
+            if len(result.shown) < MAX_SHOWN:
+                result.shown.append(f"{args}: " + "; ".join(diff))
+    return result
+
+
+def print_report(results: Dict[str, CheckResult]) -> None:
+    print(f"{'check':64} {'cases':>7} {'mismatch':>9} {'ref ms':>9} {'fast ms':>9} {'speedup':>8}")
+    for name, r in results.items():
+        speedup = r.reference_ns / r.accelerated_ns if r.accelerated_ns else float("inf")
+        print(
+            f"{name:64} {r.cases:>7} {r.mismatches:>9} {r.reference_ns / 1e6:>9.1f} "
+            f"{r.accelerated_ns / 1e6:>9.1f} {speedup:>7.1f}x"
+        )
+    for name, r in results.items():
+        if r.shown:
+            print(f"\n{name}:")
+            for line in r.shown:
+                print(f"- {line}")
+            if r.mismatches > len(r.shown):
+                print(f"- ... {r.mismatches - len(r.shown)} more")
+
+# ---------- Command line ----------
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Check the accelerated sizing paths against the scalar reference.")
+    parser.add_argument("--only", action="append", help="run only checks whose name contains this (repeatable)")
+    parser.add_argument("--quick", action="store_true", help="check every 10th input of the domain only")
+    parser.add_argument("--random", type=int, default=2000, metavar="N", help="random cases per check (default 2000)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--profile", action="append", metavar="NAME",
+                        help=f"constant profile to check under (repeatable; default: {DEFAULT_PROFILE} and {ALTERNATE_PROFILE})")
+    args = parser.parse_args(argv)
+    profiles = {DEFAULT_PROFILE: PROFILES[DEFAULT_PROFILE], ALTERNATE_PROFILE: make_profile(ALTERNATE_OVERRIDES)}
+    if args.profile:
+        unknown = [name for name in args.profile if name not in PROFILES and name != ALTERNATE_PROFILE]
+        if unknown:
+            parser.error(f"unknown profile {', '.join(unknown)}")
+        profiles = {name: profiles.get(name, PROFILES.get(name)) for name in args.profile}
+
+    results = {}
+    for profile_name, profile in profiles.items():
+        with tempfile.TemporaryDirectory() as workdir, ExitStack() as resources, use_profile(profile):
+            checks = build_checks(10 if args.quick else 1, args.random, args.seed, workdir, resources)
+            if args.only:
+                checks = [c for c in checks if any(part in c.name for part in args.only)]
+                if not checks:
+                    parser.error("no check matches --only")
+            # The sizing functions print warnings for some inputs
+            with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+                for check in checks:
+                    results[f"[{profile_name}] {check.name}"] = run_check(check)
+    print_report(results)
+
+    failed = sum(r.mismatches for r in results.values())
+    if failed:
+        print(f"\n{failed} mismatch(es): the accelerated paths are not identical to the reference.")
+        return 1
+    print("\nAll accelerated paths match the reference.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,196 @@
+import csv
+import os
+import struct
+import sys
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import fields
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+from calc.constants import CONST, constants_hash
+from calc.batch import chunked
+from calc.boiler import Boiler
+from calc.boiler_grid import optimal_boiler_with_dimensions
+from calc.profiles import Constants, set_profile
+from calc.reactor import FissionReactor
+from calc.reactor_grid import evaluate_reactor_grid, grid_row_reactor
+from calc.turbine import Turbine, optimal_turbine_with_dimensions
+
+# Design atlas: the best design for every valid set of dimensions, written as
+# CSV for players and as a columnar binary file for tools. Dimensions are split
+# in chunks evaluated on a process pool; finished chunks are appended to both
+# files in input order as they arrive, so only a few chunks are ever in memory.
+#
+# Binary layout: header, field table (name, array typecode), then one block per
+# chunk: row count followed by every column as a packed little-endian array.
+
+ATLAS_KINDS = ("turbines", "reactors", "sodium_boilers", "water_boilers")
+
+_MAGIC = b"MKATLS01"
+_HEADER = struct.Struct("<8s16sq")  # magic, constants hash, field count
+_FIELD = struct.Struct("<32sc")     # field name, array typecode
+_BLOCK = struct.Struct("<q")        # rows in the block
+
+Dimensions = Tuple[int, ...]
+
+# ---------- Utility Functions ----------
+
+def _turbine_dimensions() -> List[Dimensions]:
+    return [
+        (x_z, y)
+        for x_z in range(CONST["TURBINE_MIN_BASE"], CONST["TURBINE_MAX_BASE"] + 1, 2)
+        for y in range(CONST["TURBINE_MIN_HEIGHT"], CONST["TURBINE_MAX_HEIGHT"] + 1)
+    ]
+
+
+def _box_dimensions(min_base: int, max_base: int, min_height: int, max_height: int) -> List[Dimensions]:
+    return [
+        (x, z, y)
+        for x in range(min_base, max_base + 1)
+        for z in range(min_base, max_base + 1)
+        for y in range(min_height, max_height + 1)
+    ]
+
+
+def _kind(kind: str) -> Tuple[type, Callable[[], List[Dimensions]], Callable]:
+    """(record type, dimensions to sweep, design for one set of dimensions) of an atlas kind."""
+    if kind == "turbines":
+        return Turbine, _turbine_dimensions, lambda x_z, y: optimal_turbine_with_dimensions(x_z, y, "closed_form")
+    if kind == "reactors":
+        # Reactor grid rows already cover every geometry, smallest first, with exact surface areas
+        return FissionReactor, lambda: [(i,) for i in range(len(evaluate_reactor_grid()["x"]))], grid_row_reactor
+    if kind in ("sodium_boilers", "water_boilers"):
+        coolant = kind.split("_")[0]
+        return Boiler, lambda: _box_dimensions(
+            CONST["BOILER_MIN_BASE"], CONST["BOILER_MAX_BASE"], CONST["BOILER_MIN_HEIGHT"], CONST["BOILER_MAX_HEIGHT"]
+        ), lambda x, z, y: optimal_boiler_with_dimensions(x, z, y, coolant)
+    raise ValueError(f"Unknown atlas kind '{kind}' (expected one of {', '.join(ATLAS_KINDS)})")
+
+
+def atlas_fields(record_type: type) -> List[Tuple[str, str]]:
+    """(name, array typecode) of the numeric fields written for a record type."""
+    return [(f.name, "d" if f.type is float else "q") for f in fields(record_type) if f.type in (int, float)]
+
+
+def _evaluate_chunk(kind: str, chunk: List[Dimensions]) -> List[Tuple]:
+    """Field values of the design for each set of dimensions; dimensions without a valid design are skipped."""
+    record_type, _, design = _kind(kind)
+    names = [name for name, _ in atlas_fields(record_type)]
+    rows = []
+    for dimensions in chunk:
+        try:
+            record = design(*dimensions)
+        except ValueError:
+            continue
+        if record is not None:
+            rows.append(tuple(getattr(record, name) for name in names))
+    return rows
+
+
+def _iter_chunks(kind: str, workers: Optional[int], chunk_size: int) -> Iterator[List[Tuple]]:
+    """Evaluated chunks in input order, with at most two chunks per worker in flight."""
+    chunks = chunked(_kind(kind)[1](), chunk_size)
+    if workers == 1:
+        for chunk in chunks:
+            yield _evaluate_chunk(kind, chunk)
+        return
+
+    workers = workers or os.cpu_count() or 1
+    # The header carries this process's constants hash; spawned workers would start from the shipped CONST
+    with ProcessPoolExecutor(max_workers=workers, initializer=set_profile, initargs=(Constants(**CONST),)) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(_evaluate_chunk, kind, chunk))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _pack_block(rows: List[Tuple], typecodes: Sequence[str]) -> bytes:
+    parts = [_BLOCK.pack(len(rows))]
+    for i, typecode in enumerate(typecodes):
+        column = array(typecode, (row[i] for row in rows))
+        if sys.byteorder == "big":
+            column.byteswap()
+        parts.append(column.tobytes())
+    return b"".join(parts)
+
+# ---------- Core Functions ----------
+
+def export_atlas_kind(kind: str, directory: str, workers: Optional[int] = None, chunk_size: int = 64) -> int:
+    """Write <kind>.csv and <kind>.bin in directory and return the number of designs.
+    workers=None uses every core, workers=1 runs in this process.
+    Both files are replaced atomically once complete.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    record_type = _kind(kind)[0]
+    columns = atlas_fields(record_type)
+    typecodes = [typecode for _, typecode in columns]
+    csv_path = os.path.join(directory, f"{kind}.csv")
+    bin_path = os.path.join(directory, f"{kind}.bin")
+    csv_tmp = f"{csv_path}.{os.getpid()}.tmp"
+    bin_tmp = f"{bin_path}.{os.getpid()}.tmp"
+
+    count = 0
+    try:
+        with open(csv_tmp, "w", newline="", encoding="utf-8") as csv_file, open(bin_tmp, "wb") as bin_file:
+            writer = csv.writer(csv_file)
+            writer.writerow(name for name, _ in columns)
+            bin_file.write(_HEADER.pack(_MAGIC, constants_hash().encode(), len(columns)))
+            bin_file.writelines(_FIELD.pack(name.encode(), typecode.encode()) for name, typecode in columns)
+            for rows in _iter_chunks(kind, workers, chunk_size):
+                if not rows:
+                    continue
+                writer.writerows(rows)
+                bin_file.write(_pack_block(rows, typecodes))
+                count += len(rows)
+        os.replace(csv_tmp, csv_path)
+        os.replace(bin_tmp, bin_path)
+    finally:
+        for path in (csv_tmp, bin_tmp):
+            if os.path.exists(path):
+                os.remove(path)
+    return count
+
+
+def export_atlas(
+    directory: str,
+    kinds: Sequence[str] = ATLAS_KINDS,
+    workers: Optional[int] = None,
+    chunk_size: int = 64,
+) -> Dict[str, int]:
+    """Export every kind of the atlas to directory (created if needed). Returns the designs per kind."""
+    for kind in kinds:
+        _kind(kind)
+    os.makedirs(directory, exist_ok=True)
+    return {kind: export_atlas_kind(kind, directory, workers, chunk_size) for kind in kinds}
+
+
+def iter_atlas_blocks(path: str) -> Iterator[Dict[str, array]]:
+    """Read a binary atlas file back, one dict of columns per written chunk."""
+    with open(path, "rb") as f:
+        magic, digest, field_count = _HEADER.unpack(f.read(_HEADER.size))
+        if magic != _MAGIC:
+            raise ValueError(f"{path} is not a design atlas.")
+        if digest.decode() != constants_hash():
+            raise ValueError(f"{path} was built with different constants, export it again.")
+        columns = []
+        for _ in range(field_count):
+            name, typecode = _FIELD.unpack(f.read(_FIELD.size))
+            columns.append((name.rstrip(b"\0").decode(), typecode.decode()))
+
+        while True:
+            header = f.read(_BLOCK.size)
+            if not header:
+                return
+            (rows,) = _BLOCK.unpack(header)
+            block = {}
+            for name, typecode in columns:
+                column = array(typecode)
+                column.frombytes(f.read(rows * column.itemsize))
+                if sys.byteorder == "big":
+                    column.byteswap()
+                block[name] = column
+            yield block
@@ -0,0 +1,103 @@
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple, TypeVar, Union
+from calc.constants import CONST
+from calc.profiles import Constants, set_profile
+from calc.reactor import FissionReactor, optimal_fission_with_dimensions, turbine_based_fission_reactor
+from calc.store import turbine_based_on_fission_reactor_stored
+from calc.turbine import Turbine
+from calc.turbine_grid import turbine_based_on_fission_reactor_grid
+
+# A request is either a target steam flow (mB/t) or reactor dimensions (x, z, y).
+SizingRequest = Union[int, float, Sequence[int]]
+SizingResult = Union[Tuple[FissionReactor, Turbine], ValueError]
+
+T = TypeVar("T")
+
+# ---------- Utility Functions ----------
+
+def chunked(items: Iterable[T], chunk_size: int) -> Iterator[List[T]]:
+    """Split items in lists of chunk_size without reading ahead."""
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _size_chunk(chunk: List[SizingRequest], return_errors: bool, store: bool = False) -> List[SizingResult]:
+    results: List[SizingResult] = []
+    for request in chunk:
+        try:
+            results.append(size_water_setup(request, store))
+        except ValueError as error:
+            if not return_errors:
+                raise
+            results.append(error)
+    return results
+
+# ---------- Core Functions ----------
+
+def size_water_setup(request: SizingRequest, store: bool = False) -> Tuple[FissionReactor, Turbine]:
+    """Size a water-cooled reactor and its turbine, like option 1 of the CLI.
+    With store, the turbine comes from (and goes to) the persistent result store.
+    """
+    if isinstance(request, (tuple, list)):
+        if len(request) != 3:
+            raise ValueError(f"Reactor dimensions must be (x, z, y), got {request!r}")
+        x, z, y = request
+        reactor = optimal_fission_with_dimensions(x, z, y)
+    else:
+        reactor = turbine_based_fission_reactor(request)
+    if store:
+        return reactor, turbine_based_on_fission_reactor_stored(reactor.water_burn_rate)
+    return reactor, turbine_based_on_fission_reactor_grid(reactor.water_burn_rate)
+
+
+def iter_size_water_setups(
+    requests: Iterable[SizingRequest],
+    workers: Optional[int] = 1,
+    chunk_size: int = 64,
+    return_errors: bool = False,
+    store: bool = False,
+) -> Iterator[SizingResult]:
+    """Yield one (reactor, turbine) pair per request, in input order.
+    workers > 1 (or None for every core) spreads chunks over a process pool;
+    only a few chunks per worker are in flight, so requests can be a stream.
+    With return_errors, a request with no valid design yields its ValueError
+    instead of stopping the batch. With store, every worker reads and fills
+    the persistent result store.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    chunks = chunked(requests, chunk_size)
+    if workers == 1:
+        for chunk in chunks:
+            yield from _size_chunk(chunk, return_errors, store)
+        return
+
+    workers = workers or os.cpu_count() or 1
+    # Workers started with spawn would not inherit a profile activated in this process
+    with ProcessPoolExecutor(max_workers=workers, initializer=set_profile, initargs=(Constants(**CONST),)) as pool:
+        max_pending = workers * 2
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(_size_chunk, chunk, return_errors, store))
+            if len(pending) >= max_pending:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def size_water_setups(
+    requests: Iterable[SizingRequest],
+    workers: Optional[int] = 1,
+    chunk_size: int = 64,
+    return_errors: bool = False,
+    store: bool = False,
+) -> List[SizingResult]:
+    """List version of iter_size_water_setups."""
+    return list(iter_size_water_setups(requests, workers, chunk_size, return_errors, store))
@@ -1,9 +1,10 @@
 from dataclasses import dataclass
-from typing import Optional, Dict
+from typing import Optional, Dict, Tuple
+from math import ceil
 from calc.constants import CONST
 
 
-@dataclass
+@dataclass(slots=True)
 class Boiler:
 	x: int = 0
 	z: int = 0
@@ -33,4 +34,123 @@ class Boiler:
 
 # ---------- Utility Functions ----------
 
-# ---------- Core Functions ----------
\ No newline at end of file
+def inner_area(x: int, z: int) -> int:
+	"""Area of one internal slice, excluding the casing."""
+	return (x - 2) * (z - 2)
+
+def boiler_dispersers(x: int, z: int) -> int:
+	"""Pressure dispersers needed to fill the catch layer."""
+	return inner_area(x, z)
+
+def cavity_heights(y: int) -> int:
+	"""Internal blocks shared by the steam and water cavities (catch layer excluded)."""
+	return y - 3
+
+def heating_elements_needed(steam_flow: int) -> int:
+	"""Superheating elements needed to boil steam_flow mB/t."""
+	return max(int(ceil(steam_flow / CONST["BOILER_SUPERHEATER_CAPACITY"])), 1)
+
+def max_boil_rate(boiler: Boiler) -> int:
+	"""Steam the boiler can sustain per tick, limited by its heaters and one tick of buffers."""
+	return min(boiler.boil_capacity, boiler.water_capacity, boiler.steam_capacity)
+
+def boiler_handles(boiler: Boiler, steam_flow: int, sodium: bool = True) -> bool:
+	"""Check the boiler can boil steam_flow mB/t.
+	Heaters must boil the whole flow and each tank must hold at least one tick of it.
+	Sodium boilers also need room for one tick of heated and cooled sodium.
+	"""
+	if max_boil_rate(boiler) < steam_flow:
+		return False
+	if sodium:
+		sodium_flow = steam_flow * CONST["SODIUM_TO_STEAM_RATIO"]
+		return boiler.heated_coolant_capacity >= sodium_flow and boiler.coolant_capacity >= sodium_flow
+	return True
+
+def water_side_flow(water_cavity: int, heating_element: int, sodium: bool = True) -> int:
+	"""Steam flow a water cavity of water_cavity blocks supports with heating_element
+	elements in it (0 when they do not fit). Elements take water volume.
+	"""
+	if not 1 <= heating_element <= water_cavity - 1:
+		return 0
+	water_volume = water_cavity - heating_element
+	limit = min(heating_element * CONST["BOILER_SUPERHEATER_CAPACITY"], water_volume * CONST["BOILER_WATER_PER_BLOCK"])
+	if sodium:
+		heated = water_volume * CONST["BOILER_WATER_PER_BLOCK"] * CONST["BOILER_HEATED_COOLANT_MULT"]
+		limit = min(limit, heated // CONST["SODIUM_TO_STEAM_RATIO"])
+	return int(limit)
+
+def water_side_limit(water_cavity: int, sodium: bool = True) -> Tuple[int, int]:
+	"""Highest steam flow a water cavity of water_cavity blocks supports, and the
+	heating elements to place in it (fewest on ties).
+	"""
+	per_block = CONST["BOILER_WATER_PER_BLOCK"]
+	if sodium:
+		per_block = min(per_block, per_block * CONST["BOILER_HEATED_COOLANT_MULT"] / CONST["SODIUM_TO_STEAM_RATIO"])
+	# min(elements * superheater, (cavity - elements) * per_block) peaks around this element count
+	peak = int(water_cavity * per_block // (CONST["BOILER_SUPERHEATER_CAPACITY"] + per_block))
+	best, best_elements = 0, 0
+	for heating_element in (peak - 1, peak, peak + 1):
+		limit = water_side_flow(water_cavity, heating_element, sodium)
+		if limit > best:
+			best, best_elements = limit, heating_element
+	return best, best_elements
+
+# ---------- Core Functions ----------
+
+def boiler_size(x: int, z: int, y: int, steam_cavity_height: int, heating_element: int) -> Boiler:
+	"""Builds a boiler object and its capacities for the given layout."""
+	if x < CONST["BOILER_MIN_BASE"] or x > CONST["BOILER_MAX_BASE"] or z < CONST["BOILER_MIN_BASE"] or z > CONST["BOILER_MAX_BASE"]:
+		raise ValueError(f"Boiler base {x}x{z} out of bounds ({CONST['BOILER_MIN_BASE']}-{CONST['BOILER_MAX_BASE']})")
+	if y < CONST["BOILER_MIN_HEIGHT"] or y > CONST["BOILER_MAX_HEIGHT"]:
+		raise ValueError(f"Boiler height {y} out of bounds ({CONST['BOILER_MIN_HEIGHT']}-{CONST['BOILER_MAX_HEIGHT']})")
+	water_cavity_height = cavity_heights(y) - steam_cavity_height
+	if steam_cavity_height < 1 or water_cavity_height < 1:
+		raise ValueError(f"A {y} high boiler cannot have a steam cavity of {steam_cavity_height}")
+	water_volume = inner_area(x, z) * water_cavity_height - heating_element
+	if heating_element < 0 or water_volume < 1:
+		raise ValueError(f"{heating_element} superheating elements do not fit in the water cavity")
+
+	steam_volume = inner_area(x, z) * steam_cavity_height
+	water_capacity = water_volume * CONST["BOILER_WATER_PER_BLOCK"]
+	steam_capacity = steam_volume * CONST["BOILER_STEAM_PER_BLOCK"]
+	return Boiler(
+		x=x,
+		z=z,
+		y=y,
+		heating_element=heating_element,
+		dispersers=boiler_dispersers(x, z),
+		steam_cavity_height=steam_cavity_height,
+		water_cavity_height=water_cavity_height,
+		water_capacity=water_capacity,
+		coolant_capacity=int(steam_capacity * CONST["BOILER_COOLANT_MULT"]),
+		steam_capacity=steam_capacity,
+		heated_coolant_capacity=water_capacity * CONST["BOILER_HEATED_COOLANT_MULT"],
+		boil_capacity=heating_element * CONST["BOILER_SUPERHEATER_CAPACITY"],
+	)
+
+def boiler_with_dimensions_for_flow(x: int, z: int, y: int, steam_flow: int, sodium: bool = True) -> Optional[Boiler]:
+	"""Layout of an x*z*y boiler able to boil steam_flow, or None if it is too small.
+	Uses the fewest heating elements and the smallest steam cavity that works.
+	"""
+	heating_element = heating_elements_needed(steam_flow)
+	for steam_cavity_height in range(1, cavity_heights(y)):
+		if inner_area(x, z) * (cavity_heights(y) - steam_cavity_height) <= heating_element:
+			return None
+		boiler = boiler_size(x, z, y, steam_cavity_height, heating_element)
+		if boiler_handles(boiler, steam_flow, sodium):
+			return boiler
+	return None
+
+def boiler_max_flow(x: int, z: int, y: int, sodium: bool = True) -> int:
+	"""Highest steam flow an x*z*y boiler can boil with its best layout.
+	boiler_with_dimensions_for_flow finds a layout for every flow up to this value.
+	"""
+	best = 0
+	for steam_cavity_height in range(1, cavity_heights(y)):
+		steam = boiler_size(x, z, y, steam_cavity_height, 0)
+		steam_limit = steam.steam_capacity
+		if sodium:
+			steam_limit = min(steam_limit, steam.coolant_capacity // CONST["SODIUM_TO_STEAM_RATIO"])
+		water_cavity = inner_area(x, z) * steam.water_cavity_height
+		best = max(best, min(steam_limit, water_side_limit(water_cavity, sodium)[0]))
+	return best
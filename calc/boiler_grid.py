@@ -0,0 +1,139 @@
+from bisect import bisect_left
+from functools import lru_cache
+from math import ceil
+from typing import Dict, List, Tuple
+from calc.constants import CONST
+from calc.boiler import Boiler, boiler_size, heating_elements_needed, water_side_limit
+
+# Column-wise evaluation of every boiler layout. Rows are (x, z, y, steam cavity
+# height) sorted by block count; the heating element axis is resolved per row in
+# closed form, since the boil rate only grows with elements until they start
+# eating the water volume.
+
+GridColumns = Dict[str, List[int]]
+
+COOLANTS = ("sodium", "water")
+
+# ---------- Utility Functions ----------
+
+def _is_sodium(coolant: str) -> bool:
+    if coolant not in COOLANTS:
+        raise ValueError(f"Unknown coolant '{coolant}' (expected one of {', '.join(COOLANTS)})")
+    return coolant == "sodium"
+
+
+@lru_cache(maxsize=None)
+def evaluate_boiler_grid(coolant: str = "sodium") -> GridColumns:
+    """Every boiler layout as columns, smallest block count first."""
+    sodium = _is_sodium(coolant)
+    layouts = sorted(
+        (x * z * y, x, z, y, steam_cavity_height)
+        for x in range(CONST["BOILER_MIN_BASE"], CONST["BOILER_MAX_BASE"] + 1)
+        for z in range(CONST["BOILER_MIN_BASE"], CONST["BOILER_MAX_BASE"] + 1)
+        for y in range(CONST["BOILER_MIN_HEIGHT"], CONST["BOILER_MAX_HEIGHT"] + 1)
+        for steam_cavity_height in range(1, y - 3)
+    )
+    blocks, xs, zs, ys, steam_heights = (list(column) for column in zip(*layouts))
+
+    areas = [(x - 2) * (z - 2) for x, z in zip(xs, zs)]
+    steam_capacities = [a * h * CONST["BOILER_STEAM_PER_BLOCK"] for a, h in zip(areas, steam_heights)]
+    if sodium:
+        steam_limits = [
+            min(c, int(c * CONST["BOILER_COOLANT_MULT"]) // CONST["SODIUM_TO_STEAM_RATIO"])
+            for c in steam_capacities
+        ]
+    else:
+        steam_limits = steam_capacities
+    water_cavities = [a * (y - 3 - h) for a, y, h in zip(areas, ys, steam_heights)]
+
+    # The water side only depends on the cavity volume, so solve it once per volume
+    water_table = [water_side_limit(w, sodium) for w in range(max(water_cavities) + 1)]
+    water_limits = [water_table[w][0] for w in water_cavities]
+    max_flows = [min(s, w) for s, w in zip(steam_limits, water_limits)]
+
+    return {
+        "blocks": blocks,
+        "x": xs,
+        "z": zs,
+        "y": ys,
+        "steam_cavity_height": steam_heights,
+        "steam_limit": steam_limits,
+        "water_limit": water_limits,
+        "heating_element": [water_table[w][1] for w in water_cavities],
+        "max_flow": max_flows,
+    }
+
+
+@lru_cache(maxsize=None)
+def _running_max_flow(coolant: str) -> Tuple[int, ...]:
+    """Best max_flow among the rows up to each row, for bisecting the smallest boiler."""
+    running = []
+    best = 0
+    for flow in evaluate_boiler_grid(coolant)["max_flow"]:
+        best = max(best, flow)
+        running.append(best)
+    return tuple(running)
+
+
+@lru_cache(maxsize=None)
+def _rows_by_dimensions(coolant: str) -> Dict[Tuple[int, int, int], List[int]]:
+    columns = evaluate_boiler_grid(coolant)
+    rows: Dict[Tuple[int, int, int], List[int]] = {}
+    for index, key in enumerate(zip(columns["x"], columns["z"], columns["y"])):
+        rows.setdefault(key, []).append(index)
+    return rows
+
+
+def _row_boiler(coolant: str, index: int, steam_flow: int) -> Boiler:
+    columns = evaluate_boiler_grid(coolant)
+    return boiler_size(
+        columns["x"][index],
+        columns["z"][index],
+        columns["y"][index],
+        columns["steam_cavity_height"][index],
+        heating_elements_needed(steam_flow),
+    )
+
+# ---------- Core Functions ----------
+
+def boiler_steam_flow(flow: int, coolant: str = "sodium") -> int:
+    """Steam a boiler must produce for flow mB/t of heated sodium or of water."""
+    if _is_sodium(coolant):
+        return int(ceil(flow / CONST["SODIUM_TO_STEAM_RATIO"]))
+    return flow
+
+
+def smallest_boiler_for_flow(flow: int, coolant: str = "sodium") -> Boiler:
+    """Boiler with the fewest blocks able to take flow mB/t of heated sodium (or water)."""
+    steam_flow = boiler_steam_flow(flow, coolant)
+    running = _running_max_flow(coolant)
+    index = bisect_left(running, steam_flow)
+    if index == len(running):
+        raise ValueError("No single boiler can carry this flow.")
+    return _row_boiler(coolant, index, steam_flow)
+
+
+def optimal_boiler_with_dimensions(x: int, z: int, y: int, coolant: str = "sodium") -> Boiler:
+    """Boiler layout with the highest sustainable boil rate for given dimensions."""
+    if not (CONST["BOILER_MIN_BASE"] <= x <= CONST["BOILER_MAX_BASE"] and CONST["BOILER_MIN_BASE"] <= z <= CONST["BOILER_MAX_BASE"]):
+        raise ValueError(f"Boiler base {x}x{z} out of bounds ({CONST['BOILER_MIN_BASE']}-{CONST['BOILER_MAX_BASE']})")
+    if not CONST["BOILER_MIN_HEIGHT"] <= y <= CONST["BOILER_MAX_HEIGHT"]:
+        raise ValueError(f"Boiler height {y} out of bounds ({CONST['BOILER_MIN_HEIGHT']}-{CONST['BOILER_MAX_HEIGHT']})")
+    rows = _rows_by_dimensions(coolant).get((x, z, y), [])
+    max_flows = evaluate_boiler_grid(coolant)["max_flow"]
+    index = max(rows, key=lambda i: max_flows[i], default=-1)  # first (smallest steam cavity) on ties
+    if index < 0 or max_flows[index] <= 0:
+        raise ValueError(f"No boiler layout fits in {x}x{z}x{y}.")
+    return _row_boiler(coolant, index, max_flows[index])
+
+
+def boiler_geometry_max_flows(coolant: str = "sodium") -> List[Tuple[int, int, int, int, int]]:
+    """(block count, max steam flow, x, z, y) per geometry with a usable layout, smallest first."""
+    columns = evaluate_boiler_grid(coolant)
+    best: Dict[Tuple[int, int, int], int] = {}
+    for key, flow in zip(zip(columns["x"], columns["z"], columns["y"]), columns["max_flow"]):
+        best[key] = max(best.get(key, 0), flow)
+    return sorted(
+        ((x * z * y, flow, x, z, y) for (x, z, y), flow in best.items() if flow > 0),
+        key=lambda c: (c[0], c[2], c[3], c[4]),
+    )
@@ -0,0 +1,82 @@
+from array import array
+from dataclasses import fields
+from typing import Dict, Iterable, List, MutableSequence, Optional, Sequence
+
+# Struct-of-arrays container for candidate designs. A search stores plain
+# numbers in one typed column per field (int -> "q", float -> "d") and only
+# the rows it returns are materialized as Turbine / FissionReactor objects.
+# Non-numeric fields such as energy_si_prefix keep their dataclass default.
+# A column that receives a value its typecode cannot hold (an int beyond 64
+# bits, a float in an int field under a profile with float constants) falls
+# back to a plain list, so a batch accepts anything the records accept.
+
+# ---------- Core Functions ----------
+
+class CandidateBatch:
+    """Columns for the numeric fields of record_type, one row per candidate."""
+
+    def __init__(self, record_type: type):
+        self.record_type = record_type
+        self.columns: Dict[str, MutableSequence] = {
+            f.name: array("d" if f.type is float else "q")
+            for f in fields(record_type)
+            if f.type in (int, float)
+        }
+
+    @classmethod
+    def from_columns(cls, record_type: type, **columns: Iterable) -> "CandidateBatch":
+        """Build a batch from whole columns. Missing columns are filled with zeros."""
+        batch = cls(record_type)
+        length = None
+        for name, values in columns.items():
+            if name not in batch.columns:
+                raise ValueError(f"{record_type.__name__} has no numeric field '{name}'")
+            batch._extend(name, list(values))
+            if length is None:
+                length = len(batch.columns[name])
+            elif len(batch.columns[name]) != length:
+                raise ValueError(f"Column '{name}' has {len(batch.columns[name])} rows, expected {length}")
+        for column in batch.columns.values():
+            if len(column) < (length or 0):
+                column.extend([0] * length)
+        return batch
+
+    def __len__(self) -> int:
+        return len(next(iter(self.columns.values()), ()))
+
+    def _extend(self, name: str, values: List) -> None:
+        column = self.columns[name]
+        size = len(column)
+        try:
+            column.extend(values)
+        except (OverflowError, TypeError):
+            self.columns[name] = list(column[:size]) + values
+
+    def append(self, **values) -> int:
+        """Add one row and return its index. Missing fields are 0."""
+        unknown = values.keys() - self.columns.keys()
+        if unknown:
+            raise ValueError(f"{self.record_type.__name__} has no numeric field '{min(unknown)}'")
+        for name, column in self.columns.items():
+            value = values.get(name, 0)
+            try:
+                column.append(value)
+            except (OverflowError, TypeError):
+                self.columns[name] = list(column) + [value]
+        return len(self) - 1
+
+    def column(self, name: str) -> MutableSequence:
+        return self.columns[name]
+
+    def argmax(self, name: str, rows: Optional[Sequence[int]] = None) -> int:
+        """First row (of rows, or of the whole batch) with the largest value, or -1 when empty."""
+        column = self.columns[name]
+        candidates = range(len(column)) if rows is None else rows
+        return max(candidates, key=column.__getitem__, default=-1)
+
+    def materialize(self, index: int):
+        """Build the record object for one row."""
+        return self.record_type(**{name: column[index] for name, column in self.columns.items()})
+
+    def materialize_rows(self, rows: Iterable[int]) -> List:
+        return [self.materialize(index) for index in rows]
@@ -1,3 +1,8 @@
+import hashlib
+import json
+from functools import lru_cache, wraps
+from typing import Callable, List, Tuple
+
 CONST = {
     # == General Units ==
     "MB_PER_BUCKET": 1000,  # Millibuckets in one bucket
@@ -9,6 +14,7 @@ CONST = {
     "SODIUM_TO_STEAM_RATIO": 10,                # Ratio of sodium to steam in boilers
     "FISSION_SURFACE_AREA_TARGET": 4.0,         # target average surface area per fuel assembly
     "CASING_HEAT_CAPACITY": 1_000,              # J/K per casing block
+    "FISSION_HEAT_PER_FUEL": 1_000_000,         # J of heat released per mB of fuel burned
 
     "MAX_REACTOR_BASE": 18,                     # Maximum base of the reactor (in blocks)
     "MAX_REACTOR_HEIGHT": 18,                   # Maximum height of the reactor (in blocks)
@@ -19,6 +25,7 @@ CONST = {
     "MIN_BURN_RATE": 0.1,                       # Minimum burn rate (mB/t)
     
     "MAX_TEMPERATURE": 1200,                    # Maximum operating temperature (°K)
+    "AMBIENT_TEMPERATURE": 300,                 # Temperature of a cold reactor (°K)
 
     # == Boiler ==
     "BOILER_WATER_PER_BLOCK": 16_000,           # mB of water processed per boiler block
@@ -54,4 +61,50 @@ CONST = {
     
     "BOILER_SODIUM_CONVERSION_FACTOR": 200_000 / 10, #sodium heat -> steam flow equivalence
     "TURBINE_FLOW_FORMULA": "min(dispersers * 1280 * volume, vents * 32000)",
-}
\ No newline at end of file
+}
+
+
+_hashed: Tuple[Tuple, str] = ((), "")
+
+
+def constants_hash() -> str:
+    """Short digest of the current CONST values, used to tag generated data.
+    Only recomputed when a value changed, so callers can check it on every use.
+    """
+    global _hashed
+    values = tuple(CONST.items())
+    if values != _hashed[0]:
+        payload = json.dumps(CONST, sort_keys=True, default=str)
+        _hashed = (values, hashlib.sha256(payload.encode()).hexdigest()[:16])
+    return _hashed[1]
+
+
+# Functions emptying caches derived from CONST that are not lru_caches
+# (calc.profiles.clear_caches empties those of the calc modules itself)
+_CACHE_CLEARS: List[Callable[[], None]] = []
+
+
+def register_cache(clear: Callable[[], None]) -> Callable[[], None]:
+    """Have clear called whenever the constants change through calc.profiles."""
+    _CACHE_CLEARS.append(clear)
+    return clear
+
+
+def clear_registered_caches() -> None:
+    for clear in _CACHE_CLEARS:
+        clear()
+
+
+def constants_cache(function: Callable) -> Callable:
+    """lru_cache that also keys on constants_hash(), so a direct CONST edit
+    gets fresh results instead of the ones cached for the old values.
+    """
+    cached = lru_cache(maxsize=None)(lambda digest, *args, **kwargs: function(*args, **kwargs))
+
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        return cached(constants_hash(), *args, **kwargs)
+
+    wrapper.cache_clear = cached.cache_clear
+    wrapper.cache_info = cached.cache_info
+    return wrapper
@@ -0,0 +1,174 @@
+from dataclasses import dataclass, field, replace
+from functools import lru_cache
+from math import ceil
+from typing import List, Optional, Tuple
+from calc.constants import CONST
+from calc.pareto import pareto_front, turbine_block_count
+from calc.turbine import Turbine
+from calc.turbine_grid import turbine_catalogue
+
+# Splitting a steam flow across several turbines. Flows are counted in buckets
+# (one vent worth of steam by default): the demand is rounded up and every
+# turbine capacity rounded down, so a planned farm always carries the flow.
+
+OBJECTIVES = ("blocks", "power")
+
+@dataclass
+class TurbineFarm:
+    turbines: List[Turbine] = field(default_factory=list)
+    flows: List[int] = field(default_factory=list)  # mB/t of steam sent to each turbine
+    steam_flow: int = 0      # mB/t of steam to carry
+    max_flow: int = 0        # mB/t the farm can carry
+    block_count: int = 0
+    max_production: float = 0.0  # at steam_flow
+
+    def farm_print(self) -> None:
+        print(f"A farm of {len(self.turbines)} Turbines ({self.block_count} blocks)")
+        print(f"- Steam Flow {self.steam_flow} mB/t, Max Flow {self.max_flow} mB/t")
+        print(f"- Energy Production {self.max_production:.2f} mJ\n")
+        for turbine, flow in zip(self.turbines, self.flows):
+            print(f"{flow} mB/t to:")
+            turbine.turbine_print()
+
+    def summarize(self) -> str:
+        return ", ".join(t.summarize() for t in self.turbines)
+
+# ---------- Utility Functions ----------
+
+def supported_flow(turbine: Turbine) -> int:
+    """Steam flow a turbine carries, limited by vents/dispersers and by condensers."""
+    return min(turbine.max_flow, turbine.max_water_output)
+
+
+def energy_per_flow(turbine: Turbine) -> float:
+    """Energy produced per mB/t of steam."""
+    return turbine.max_production / turbine.max_flow if turbine.max_flow else 0.0
+
+
+@lru_cache(maxsize=None)
+def _designs(objective: str) -> Tuple[Turbine, ...]:
+    """Catalogue designs worth considering: the others are beaten on every axis."""
+    candidates = [t for t in turbine_catalogue() if supported_flow(t) > 0]
+    objectives = [(supported_flow, True), (turbine_block_count, False)]
+    if objective == "power":
+        objectives.append((energy_per_flow, True))
+    return tuple(pareto_front(candidates, objectives))
+
+
+def _assign_flows(turbines: List[Turbine], steam_flow: int) -> List[int]:
+    """Send the steam to the most productive turbines first."""
+    flows = [0] * len(turbines)
+    remaining = steam_flow
+    for i in sorted(range(len(turbines)), key=lambda i: energy_per_flow(turbines[i]), reverse=True):
+        flows[i] = min(supported_flow(turbines[i]), remaining)
+        remaining -= flows[i]
+    return flows
+
+
+def _score(turbines: List[Turbine], steam_flow: int, objective: str) -> Tuple:
+    """Higher is better: fewer blocks then more power, or the reverse."""
+    flows = _assign_flows(turbines, steam_flow)
+    power = sum(energy_per_flow(t) * f for t, f in zip(turbines, flows))
+    blocks = sum(turbine_block_count(t) for t in turbines)
+    return (-blocks, power) if objective == "blocks" else (power, -blocks)
+
+
+def _plan(
+    designs: List[Tuple[Turbine, int]], demand: int, steam_flow: int, max_turbines: int, objective: str,
+) -> Optional[List[Turbine]]:
+    """Best farm of at most max_turbines designs covering demand buckets, by branch and bound.
+    Designs are taken in decreasing energy per flow and the steam is filled into
+    them in that order, as _assign_flows does, so each turbine scores its real
+    production at its real flow. A branch is dropped when even its best case
+    (all remaining steam at its best energy per flow, the fewest blocks that
+    could carry it) cannot beat the best farm found so far.
+    """
+    designs = sorted(designs, key=lambda d: energy_per_flow(d[0]), reverse=True)
+    count = len(designs)
+    flows = [supported_flow(t) for t, _ in designs]
+    per_flow = [energy_per_flow(t) for t, _ in designs]
+    blocks = [turbine_block_count(t) for t, _ in designs]
+    # Over designs[index:]: largest size, fewest blocks and fewest blocks per bucket
+    largest_from = [0] * (count + 1)
+    fewest_blocks_from = [float("inf")] * (count + 1)
+    blocks_per_bucket_from = [float("inf")] * (count + 1)
+    for index in range(count - 1, -1, -1):
+        size = designs[index][1]
+        largest_from[index] = max(size, largest_from[index + 1])
+        fewest_blocks_from[index] = min(blocks[index], fewest_blocks_from[index + 1])
+        blocks_per_bucket_from[index] = min(blocks[index] / size, blocks_per_bucket_from[index + 1])
+    power_first = objective == "power"
+    best: List = [None, None]  # score, design indices
+
+    def score(power: float, block_count: int) -> Tuple:
+        return (power, -block_count) if power_first else (-block_count, power)
+
+    def search(index: int, remaining: int, steam: int, left: int, power: float, block_count: int, taken: List[int]) -> None:
+        if remaining <= 0:
+            if best[0] is None or score(power, block_count) > best[0]:
+                best[0], best[1] = score(power, block_count), list(taken)
+            return
+        if index == count or remaining > left * largest_from[index]:
+            return
+        fewest = max(fewest_blocks_from[index], int(ceil(remaining * blocks_per_bucket_from[index] - 1e-9)))
+        if best[0] is not None and score(power + steam * per_flow[index], block_count + fewest) <= best[0]:
+            return
+        # Take one more of this design first, so good farms are found early
+        used = min(flows[index], steam)
+        taken.append(index)
+        search(index, remaining - designs[index][1], steam - used, left - 1,
+               power + per_flow[index] * used, block_count + blocks[index], taken)
+        taken.pop()
+        search(index + 1, remaining, steam, left, power, block_count, taken)
+
+    search(0, demand, steam_flow, max_turbines, 0.0, 0, [])
+    return None if best[1] is None else [designs[i][0] for i in best[1]]
+
+
+def _build_farm(turbines: List[Turbine], steam_flow: int) -> TurbineFarm:
+    turbines = [replace(t) for t in turbines]
+    flows = _assign_flows(turbines, steam_flow)
+    return TurbineFarm(
+        turbines=turbines,
+        flows=flows,
+        steam_flow=steam_flow,
+        max_flow=sum(supported_flow(t) for t in turbines),
+        block_count=sum(turbine_block_count(t) for t in turbines),
+        max_production=sum(energy_per_flow(t) * f for t, f in zip(turbines, flows)),
+    )
+
+# ---------- Core Functions ----------
+
+def turbine_farm_for_flow(
+    steam_flow: int,
+    max_turbines: int = 16,
+    objective: str = "blocks",
+    identical: bool = False,
+    bucket: Optional[int] = None,
+) -> TurbineFarm:
+    """Plan up to max_turbines turbines carrying steam_flow mB/t.
+    objective "blocks" minimises total blocks (then maximises power), "power"
+    maximises energy production (then minimises blocks). With identical, every
+    turbine of the farm has the same design.
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError(f"Unknown objective '{objective}' (expected one of {', '.join(OBJECTIVES)})")
+    bucket = bucket or CONST["GENERAL_VENT_GAS_FLOW"]
+    demand = int(ceil(steam_flow / bucket))
+    designs = [(t, supported_flow(t) // bucket) for t in _designs(objective)]
+    designs = [(t, size) for t, size in designs if size > 0]
+
+    best: Optional[List[Turbine]] = None
+    if identical:
+        for t, size in designs:
+            count = max(int(ceil(demand / size)), 1)
+            if count <= max_turbines:
+                farm = [t] * count
+                if best is None or _score(farm, steam_flow, objective) > _score(best, steam_flow, objective):
+                    best = farm
+    else:
+        best = _plan(designs, demand, steam_flow, max_turbines, objective)
+
+    if best is None:
+        raise ValueError(f"{steam_flow} mB/t of steam needs more than {max_turbines} turbines.")
+    return _build_farm(best, steam_flow)
@@ -0,0 +1,106 @@
+import json
+from dataclasses import asdict
+from typing import Any, Dict, Iterable, Iterator, TextIO
+from calc.farm import turbine_farm_for_flow
+from calc.reactor import optimal_fission_with_dimensions, turbine_based_fission_reactor
+from calc.sodium import sodium_plant_for_flow, sodium_plant_with_dimensions
+from calc.store import (
+    sodium_plant_for_flow_stored, sodium_plant_with_dimensions_stored, turbine_based_on_fission_reactor_stored,
+    turbine_farm_for_flow_stored,
+)
+from calc.turbine_grid import turbine_based_on_fission_reactor_grid
+
+# Headless mode of the CLI. Each input line is one request:
+#   {"setup": "water" | "sodium", "mode": "flow", "max_flow": 400000}
+#   {"setup": "water" | "sodium", "mode": "dimensions", "x": 5, "z": 5, "y": 6}
+# An optional "id" is echoed back. Each request gives exactly one output line,
+# written as soon as it is computed, so memory stays bounded by a single line.
+
+SETUPS = ("water", "sodium")
+MODES = ("flow", "dimensions")
+
+# ---------- Utility Functions ----------
+
+def _int_field(request: Dict[str, Any], name: str) -> int:
+    value = request.get(name)
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError(f"'{name}' must be a number, got {value!r}")
+    if isinstance(value, float) and not value.is_integer():  # also rejects Infinity and NaN
+        raise ValueError(f"'{name}' must be a whole number, got {value!r}")
+    return int(value)
+
+
+def _water_setup(request: Dict[str, Any], store: bool = False) -> Dict[str, Any]:
+    if request["mode"] == "flow":
+        reactor = turbine_based_fission_reactor(_int_field(request, "max_flow"))
+    else:
+        reactor = optimal_fission_with_dimensions(*(_int_field(request, axis) for axis in ("x", "z", "y")))
+    result = {"reactor": asdict(reactor)}
+    size_turbine = turbine_based_on_fission_reactor_stored if store else turbine_based_on_fission_reactor_grid
+    try:
+        result["turbine"] = asdict(size_turbine(reactor.water_burn_rate))
+    except ValueError:
+        # Same fallback as the interactive CLI: split the steam across several turbines
+        size_farm = turbine_farm_for_flow_stored if store else turbine_farm_for_flow
+        result["farm"] = asdict(size_farm(reactor.water_burn_rate))
+    return result
+
+
+def _sodium_setup(request: Dict[str, Any], store: bool = False) -> Dict[str, Any]:
+    if request["mode"] == "flow":
+        size = sodium_plant_for_flow_stored if store else sodium_plant_for_flow
+        plant = size(_int_field(request, "max_flow"))
+    else:
+        size = sodium_plant_with_dimensions_stored if store else sodium_plant_with_dimensions
+        plant = size(*(_int_field(request, axis) for axis in ("x", "z", "y")))
+    return {"plant": asdict(plant)}
+
+# ---------- Core Functions ----------
+
+def solve_request(request: Dict[str, Any], store: bool = False) -> Dict[str, Any]:
+    """Size one setup described by a request dict, like options 1 and 2 of the CLI.
+    With store, the turbine, farm and sodium plant searches go through the persistent result store.
+    """
+    if not isinstance(request, dict):
+        raise ValueError("A request must be a JSON object")
+    setup = request.get("setup", "water")
+    mode = request.get("mode", "flow")
+    if setup not in SETUPS:
+        raise ValueError(f"Unknown setup '{setup}' (expected one of {', '.join(SETUPS)})")
+    if mode not in MODES:
+        raise ValueError(f"Unknown mode '{mode}' (expected one of {', '.join(MODES)})")
+    request = dict(request, setup=setup, mode=mode)
+    result = _water_setup(request, store) if setup == "water" else _sodium_setup(request, store)
+    return {"setup": setup, "mode": mode, **result}
+
+
+def iter_jsonl_results(lines: Iterable[str], store: bool = False) -> Iterator[Dict[str, Any]]:
+    """Yield one result dict per non-blank line, in input order.
+    A line that cannot be parsed or sized yields {"line": n, "error": message}
+    instead of stopping the stream.
+    """
+    for number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        request: Any = None
+        try:
+            request = json.loads(line)
+            result = solve_request(request, store)
+        except (ValueError, TypeError, ArithmeticError) as error:  # json.JSONDecodeError is a ValueError
+            result = {"error": str(error)}
+        header: Dict[str, Any] = {"line": number}
+        if isinstance(request, dict) and "id" in request:
+            header["id"] = request["id"]
+        yield {**header, **result}
+
+
+def stream_jsonl(lines: Iterable[str], out: TextIO, store: bool = False) -> int:
+    """Write one JSON result per request to out, flushing after each one.
+    Returns the number of requests that failed.
+    """
+    errors = 0
+    for result in iter_jsonl_results(lines, store):
+        errors += "error" in result
+        out.write(json.dumps(result, separators=(",", ":")) + "\n")
+        out.flush()
+    return errors
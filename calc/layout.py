@@ -0,0 +1,216 @@
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Iterator, List, Optional, Tuple
+from calc.constants import CONST
+from calc.reactor import FissionReactor, boil_efficiency, heat_capacity
+
+# Voxel model of the reactor interior. The (x-2) x (z-2) x (y-2) cells are
+# bits of Python ints, cell (col, row, level) at bit (level * depth + row) * width + col,
+# with level 0 at the bottom. Fuel faces touching another assembly are found
+# with one shift and mask per axis and counted with int.bit_count, so a whole
+# 16x16x16 interior is evaluated in a handful of big-int operations.
+
+@dataclass(slots=True)
+class ReactorLayout:
+    x: int = 0
+    z: int = 0
+    y: int = 0
+    fuel: int = 0          # bitboard of fuel assemblies
+    control_rods: int = 0  # bitboard of control rod assemblies
+
+    @property
+    def dimensions(self) -> Tuple[int, int, int]:
+        """Interior width, depth and height in cells."""
+        return self.x - 2, self.z - 2, self.y - 2
+
+    @property
+    def coolant(self) -> int:
+        """Bitboard of the cells left for coolant (or empty)."""
+        return _masks(*self.dimensions)[0] & ~(self.fuel | self.control_rods)
+
+    def layout_print(self) -> None:
+        """Top view: F for a fuel column, C for a lone control rod, . for coolant."""
+        width, depth, height = self.dimensions
+        plane_size = width * depth
+        plane_mask = (1 << plane_size) - 1
+        fuel_columns = 0
+        for level in range(height):
+            fuel_columns |= (self.fuel >> (level * plane_size)) & plane_mask
+        rods = (self.control_rods >> ((height - 1) * plane_size)) & plane_mask
+        print(f"A {self.x}x{self.z}x{self.y} Reactor layout")
+        for row in range(depth):
+            cells = []
+            for col in range(width):
+                bit = 1 << (row * width + col)
+                cells.append("F" if fuel_columns & bit else "C" if rods & bit else ".")
+            print("  " + " ".join(cells))
+
+# ---------- Utility Functions ----------
+
+@lru_cache(maxsize=None)
+def _masks(width: int, depth: int, height: int) -> Tuple[int, int, int, int, int]:
+    """(every cell, cells with a +x neighbour, with a +z neighbour, with a +y neighbour, top level)."""
+    plane_size = width * depth
+    rows = _repunit(width, depth * height)
+    planes = _repunit(plane_size, height)
+    full = (1 << (plane_size * height)) - 1
+    has_x = ((1 << (width - 1)) - 1) * rows
+    has_z = ((1 << (width * (depth - 1))) - 1) * planes
+    has_y = (1 << (plane_size * (height - 1))) - 1
+    top = full ^ has_y
+    return full, has_x, has_z, has_y, top
+
+
+def _repunit(step: int, count: int) -> int:
+    """Bits 0, step, 2*step, ... (count of them): multiplying by it repeats a pattern."""
+    return sum(1 << (i * step) for i in range(count))
+
+
+def touching_pairs(cells: int, width: int, depth: int, height: int) -> int:
+    """Pairs of face-adjacent cells in a bitboard."""
+    _, has_x, has_z, has_y, _ = _masks(width, depth, height)
+    return (
+        (cells & (cells >> 1) & has_x).bit_count()
+        + (cells & (cells >> width) & has_z).bit_count()
+        + (cells & (cells >> (width * depth)) & has_y).bit_count()
+    )
+
+
+def exposed_faces(layout: ReactorLayout) -> int:
+    """Fuel assembly faces not touching another fuel assembly."""
+    width, depth, height = layout.dimensions
+    return layout.fuel.bit_count() * 6 - 2 * touching_pairs(layout.fuel, width, depth, height)
+
+
+def valid_layout(layout: ReactorLayout) -> bool:
+    """Cells inside the interior, no overlap, and every fuel column topped by a control rod."""
+    width, depth, height = layout.dimensions
+    if width < 1 or depth < 1 or height < 2:
+        return False
+    full, _, _, _, top = _masks(width, depth, height)
+    if (layout.fuel | layout.control_rods) & ~full or layout.fuel & layout.control_rods:
+        return False
+    above_fuel = (layout.fuel << (width * depth)) & full
+    return not layout.fuel & top and not above_fuel & ~(layout.fuel | layout.control_rods)
+
+
+def column_layout(x: int, z: int, y: int, pattern: int) -> ReactorLayout:
+    """Full-height fuel columns under a control rod for every bit of a 2D pattern."""
+    width, depth, height = x - 2, z - 2, y - 2
+    plane_size = width * depth
+    return ReactorLayout(
+        x=x,
+        z=z,
+        y=y,
+        fuel=pattern * _repunit(plane_size, height - 1),
+        control_rods=pattern << (plane_size * (height - 1)),
+    )
+
+
+def checker_pattern(width: int, depth: int, parity: int = 0) -> int:
+    """2D pattern of the cells with (row + col) % 2 == parity."""
+    return sum(
+        1 << (row * width + col)
+        for row in range(depth)
+        for col in range(width)
+        if (row + col) % 2 == parity
+    )
+
+
+def checker_layout(x: int, z: int, y: int) -> ReactorLayout:
+    """The pattern assumed by fuel_assemblies_dimensions."""
+    return column_layout(x, z, y, checker_pattern(x - 2, z - 2))
+
+
+def layout_reactor(layout: ReactorLayout) -> FissionReactor:
+    """FissionReactor with the exact counts of a layout."""
+    fuel_assemblies = layout.fuel.bit_count()
+    surface_area = exposed_faces(layout)
+    return FissionReactor(
+        x=layout.x,
+        z=layout.z,
+        y=layout.y,
+        fuel_assemblies=fuel_assemblies,
+        control_rods=layout.control_rods.bit_count(),
+        water_burn_rate=fuel_assemblies * CONST["FISSION_STEAM_PER_FUEL"],
+        heat_capacity=heat_capacity(layout.x, layout.z, layout.y),
+        fuel_surface_area=surface_area,
+        boil_efficiency=boil_efficiency(surface_area, fuel_assemblies),
+        max_burn_rate=fuel_assemblies,
+    )
+
+
+def _densify(width: int, depth: int, levels: int, seed: List[bool], target: float) -> Optional[List[bool]]:
+    """Add columns to a 2D pattern, fewest filled neighbours first, while the
+    average exposed faces per assembly stays at or above target.
+    Returns None when the seed itself misses the target.
+    """
+    cells = width * depth
+    neighbours = [
+        [n for n in (i - 1 if i % width else -1, i + 1 if (i + 1) % width else -1, i - width, i + width) if 0 <= n < cells]
+        for i in range(cells)
+    ]
+    filled = list(seed)
+    filled_neighbours = [sum(filled[n] for n in neighbours[i]) for i in range(cells)]
+    columns = sum(filled)
+    pairs = sum(filled_neighbours[i] for i in range(cells) if filled[i]) // 2
+
+    def meets_target(columns: int, pairs: int) -> bool:
+        # per level: 6 faces per assembly, minus 2 per touching pair (sideways and between levels)
+        touching = pairs * levels + columns * (levels - 1)
+        return columns * levels * 6 - 2 * touching >= target * columns * levels
+
+    if columns and not meets_target(columns, pairs):
+        return None
+    while True:
+        # Every added column costs more the more filled neighbours it has, so when
+        # the cheapest one breaks the target, all of them do
+        free = [i for i in range(cells) if not filled[i]]
+        if not free:
+            return filled
+        best = min(free, key=lambda i: (filled_neighbours[i], len(neighbours[i])))
+        if not meets_target(columns + 1, pairs + filled_neighbours[best]):
+            return filled
+        filled[best] = True
+        columns += 1
+        pairs += filled_neighbours[best]
+        for n in neighbours[best]:
+            filled_neighbours[n] += 1
+
+# ---------- Core Functions ----------
+
+def candidate_layouts(x: int, z: int, y: int, target: Optional[float] = None) -> Iterator[ReactorLayout]:
+    """Layouts meeting the surface area target (FISSION_SURFACE_AREA_TARGET by default),
+    grown from both checker patterns and from an empty interior.
+    """
+    target = CONST["FISSION_SURFACE_AREA_TARGET"] if target is None else target
+    width, depth, levels = x - 2, z - 2, y - 3
+    if width < 1 or depth < 1 or levels < 1:
+        return
+    seeds = [
+        [(i // width + i % width) % 2 == parity for i in range(width * depth)]
+        for parity in (0, 1)
+    ]
+    seeds.append([False] * (width * depth))
+    for seed in seeds:
+        filled = _densify(width, depth, levels, seed, target)
+        if filled is not None:
+            yield column_layout(x, z, y, sum(1 << i for i, on in enumerate(filled) if on))
+
+
+@lru_cache(maxsize=4096)
+def _best_layout(x: int, z: int, y: int, target: float) -> Optional[ReactorLayout]:
+    return max(
+        candidate_layouts(x, z, y, target),
+        key=lambda layout: (layout.fuel.bit_count(), exposed_faces(layout)),
+        default=None,
+    )
+
+
+def best_layout(x: int, z: int, y: int, target: Optional[float] = None) -> ReactorLayout:
+    """Layout with the most fuel assemblies whose boil efficiency reaches the target."""
+    target = CONST["FISSION_SURFACE_AREA_TARGET"] if target is None else target
+    layout = _best_layout(x, z, y, target)
+    if layout is None or not layout.fuel:
+        raise ValueError(f"No fuel layout of {x}x{z}x{y} reaches {target} exposed faces per assembly.")
+    return ReactorLayout(layout.x, layout.z, layout.y, layout.fuel, layout.control_rods)
@@ -0,0 +1,196 @@
+from bisect import bisect_left, bisect_right
+from dataclasses import replace
+from functools import lru_cache
+from math import ceil
+from typing import Dict, Iterator, List, Optional, Tuple
+from calc.constants import CONST
+from calc.reactor import FissionReactor
+from calc.reactor_grid import evaluate_reactor_grid, grid_row_reactor
+from calc.turbine import (
+    Turbine, blade_rate, coils_needed, energy_capacity, lower_volume, max_vents, max_water_output, pressure_dispersers,
+)
+
+# Join index between reactor geometries (steam produced: water_burn_rate) and
+# turbine designs (steam taken: min(max_flow, max_water_output)). Both sides
+# are kept sorted by flow, so "which turbines match this reactor" is a bisect
+# range instead of a scan, and a footprint join walks the reactors once with
+# one range lookup each.
+#
+# The turbine side is the design space the sizers search: every size, shaft
+# height and vent count up to the vent breakpoint, with the condensers that
+# flow needs. For each size and supported flow only the most productive design
+# is kept. Results are new records, never shared with the index or each other.
+#
+# A pair wastes either steam or turbine capacity. With saturate=True the
+# turbine runs at full flow and the waste is the reactor steam it cannot take;
+# otherwise the turbine takes all the steam and the waste is its idle capacity.
+
+# Sorted flows, and the rows they came from in the same order
+FlowIndex = Tuple[Tuple[int, ...], Tuple[int, ...]]
+
+# x_z, y, shaft_height, vents, condensers, max_flow, max_production
+TurbineDesign = Tuple[int, int, int, int, int, int, float]
+
+# ---------- Utility Functions ----------
+
+def supported_flow(turbine: Turbine) -> int:
+    """Steam a turbine can take per tick (vents, tank and condensers)."""
+    return min(turbine.max_flow, turbine.max_water_output)
+
+
+def _check_waste(waste: float) -> None:
+    if not 0 <= waste < 1:
+        raise ValueError(f"waste must be in [0, 1), got {waste}")
+
+
+def _waste(steam: float, flow: float, saturate: bool) -> float:
+    if saturate:
+        return (steam - flow) / steam if steam else 0.0
+    return (flow - steam) / flow if flow else 0.0
+
+
+def _range(flows: Tuple[int, ...], low: float, high: float) -> range:
+    """Positions of the sorted flows within [low, high]."""
+    return range(bisect_left(flows, low), bisect_right(flows, high))
+
+
+@lru_cache(maxsize=None)
+def _reactor_index(max_base: Optional[int] = None) -> FlowIndex:
+    """Reactor grid rows sorted by water_burn_rate, optionally only those fitting in max_base x max_base."""
+    columns = evaluate_reactor_grid()
+    rows = sorted(
+        (fuel * CONST["FISSION_STEAM_PER_FUEL"], index)
+        for index, (fuel, x, z) in enumerate(zip(columns["fuel_assemblies"], columns["x"], columns["z"]))
+        if fuel > 0 and (max_base is None or max(x, z) <= max_base)
+    )
+    return tuple(flow for flow, _ in rows), tuple(index for _, index in rows)
+
+
+@lru_cache(maxsize=None)
+def _turbine_designs() -> Tuple[TurbineDesign, ...]:
+    """Most productive design for every turbine size and supported flow."""
+    vent_flow = CONST["GENERAL_VENT_GAS_FLOW"]
+    condenser_rate = CONST["GENERAL_CONDENSER_RATE"]
+    best: Dict[Tuple[int, int, int], TurbineDesign] = {}
+    for x_z in range(CONST["TURBINE_MIN_BASE"], CONST["TURBINE_MAX_BASE"] + 1, 2):
+        tank_flow_per_volume = pressure_dispersers(x_z) * CONST["GENERAL_DISPERSER_GAS_FLOW"]
+        for y in range(CONST["TURBINE_MIN_HEIGHT"], CONST["TURBINE_MAX_HEIGHT"] + 1):
+            for shaft_height in range(1, min(2 * x_z - 5, CONST["TURBINE_MAX_ROTOR_HEIGHT"])):
+                blades = shaft_height * 2
+                coils = coils_needed(blades)
+                vent_limit = max_vents(x_z, y, shaft_height)
+                space = ((y - 3) - shaft_height) * (x_z - 2) ** 2 - coils
+                if vent_limit < 1 or space < 0:
+                    continue
+                tank_flow = tank_flow_per_volume * lower_volume(x_z, shaft_height)
+                energy_per_flow = CONST["MAX_ENERGY_PER_STEAM"] * blade_rate(blades, coils)
+                # Past the breakpoint more vents add neither flow nor energy
+                breakpoint = min(max(int(ceil(tank_flow / vent_flow)), 1), vent_limit)
+                for vents in range(1, breakpoint + 1):
+                    max_flow = min(tank_flow, vents * vent_flow)
+                    condensers = min(int(ceil(max_flow / condenser_rate)), space)
+                    production = energy_per_flow * max_flow
+                    key = (x_z, y, min(max_flow, condensers * condenser_rate))
+                    if key not in best or production > best[key][6]:
+                        best[key] = (x_z, y, shaft_height, vents, condensers, max_flow, production)
+    return tuple(best.values())
+
+
+def _design_turbine(design: TurbineDesign) -> Turbine:
+    x_z, y, shaft_height, vents, condensers, max_flow, production = design
+    blades = shaft_height * 2
+    return Turbine(
+        x_z=x_z,
+        y=y,
+        vents=vents,
+        dispersers=pressure_dispersers(x_z),
+        condensers=condensers,
+        shaft_height=shaft_height,
+        blades=blades,
+        coils=coils_needed(blades),
+        capacity=energy_capacity(x_z, y),
+        max_flow=max_flow,
+        tank_volume=lower_volume(x_z, shaft_height),
+        max_water_output=max_water_output(condensers),
+        max_production=production,
+    )
+
+
+@lru_cache(maxsize=None)
+def _turbine_index(max_base: Optional[int] = None) -> FlowIndex:
+    """Turbine designs sorted by supported flow, optionally only those fitting in max_base x max_base."""
+    condenser_rate = CONST["GENERAL_CONDENSER_RATE"]
+    rows = sorted(
+        (min(max_flow, condensers * condenser_rate), index)
+        for index, (x_z, _, _, _, condensers, max_flow, _) in enumerate(_turbine_designs())
+        if max_base is None or x_z <= max_base
+    )
+    return tuple(flow for flow, _ in rows), tuple(index for _, index in rows)
+
+
+def _matching_turbines(steam: float, waste: float, saturate: bool, max_base: Optional[int] = None) -> List[Turbine]:
+    flows, rows = _turbine_index(max_base)
+    designs = _turbine_designs()
+    matches = [_design_turbine(designs[rows[i]]) for i in _range(flows, *_turbine_bounds(steam, waste, saturate))]
+    matches.sort(key=lambda t: (_waste(steam, supported_flow(t), saturate), t.x_z * t.x_z * t.y, -t.max_production))
+    return matches
+
+
+def _turbine_bounds(steam: float, waste: float, saturate: bool) -> Tuple[float, float]:
+    """Supported flows matching a reactor's steam within waste."""
+    if saturate:
+        return steam * (1 - waste), steam
+    return steam, steam / (1 - waste)
+
+
+def _reactor_bounds(flow: float, waste: float, saturate: bool) -> Tuple[float, float]:
+    """Reactor steam matching a turbine's supported flow within waste."""
+    if saturate:
+        return flow, flow / (1 - waste)
+    return flow * (1 - waste), flow
+
+# ---------- Core Functions ----------
+
+def turbines_for_reactor(reactor: FissionReactor, waste: float = 0.05, saturate: bool = True) -> List[Turbine]:
+    """Turbine designs matching the reactor's steam within waste, least waste first
+    (then fewest blocks, then most energy). One design per size and supported flow.
+    """
+    _check_waste(waste)
+    return _matching_turbines(reactor.water_burn_rate, waste, saturate)
+
+
+def reactors_for_turbine(turbine: Turbine, waste: float = 0.05, saturate: bool = True) -> List[FissionReactor]:
+    """Reactor geometries matching the turbine's supported flow within waste, least waste first (then fewest blocks).
+    The reverse of optimal_fuel_assemblies: every reactor, not just the assembly count.
+    """
+    _check_waste(waste)
+    flows, rows = _reactor_index()
+    flow = supported_flow(turbine)
+    positions = _range(flows, *_reactor_bounds(flow, waste, saturate))
+    blocks = evaluate_reactor_grid()["blocks"]
+    order = sorted(positions, key=lambda i: (_waste(flows[i], flow, saturate), blocks[rows[i]]))
+    return [grid_row_reactor(rows[i]) for i in order]
+
+
+def iter_pairs_within_footprint(
+    max_base: int, waste: float = 0.05, saturate: bool = True
+) -> Iterator[Tuple[FissionReactor, Turbine]]:
+    """Every (reactor, turbine) pair that both fit in max_base x max_base and match within waste,
+    by increasing reactor steam.
+    """
+    _check_waste(waste)
+    reactor_flows, reactor_rows = _reactor_index(max_base)
+    previous_steam, matches = None, []
+    for steam, row in zip(reactor_flows, reactor_rows):
+        if steam != previous_steam:
+            matches = _matching_turbines(steam, waste, saturate, max_base)
+            previous_steam = steam
+        if matches:
+            reactor = grid_row_reactor(row)
+            for turbine in matches:
+                yield replace(reactor), replace(turbine)
+
+
+def pairs_within_footprint(max_base: int, waste: float = 0.05, saturate: bool = True) -> List[Tuple[FissionReactor, Turbine]]:
+    """List version of iter_pairs_within_footprint."""
+    return list(iter_pairs_within_footprint(max_base, waste, saturate))
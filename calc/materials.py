@@ -0,0 +1,289 @@
+from functools import lru_cache
+from math import ceil
+from typing import Dict, Optional, Tuple
+from calc.constants import CONST
+from calc.boiler import Boiler, boiler_dispersers, boiler_size, heating_elements_needed, water_side_flow
+from calc.boiler_grid import evaluate_boiler_grid
+from calc.reactor import FissionReactor, boil_efficiency, heat_capacity
+from calc.reactor_grid import evaluate_reactor_grid
+from calc.turbine import (
+    Turbine, best_vent_count, coils_needed, energy_capacity, lower_volume, max_water_output, pressure_dispersers,
+    blade_rate,
+)
+
+# Bills of materials and the inverse question: the most power (or burn rate,
+# or boil rate) a material budget can build. The frame edges of every
+# multiblock are casing; the other shell blocks are glass unless they are vents,
+# valves, ports or the controller.
+#
+# Designs are precomputed once with their material needs and sorted by the best
+# value they can reach. A query scans them in that order, fits the one free
+# quantity (vents, assemblies, heating elements) to the budget in O(1), and
+# stops as soon as the next design could not beat the best found.
+
+MATERIALS = (
+    "casing", "glass", "vents", "valves", "ports", "controller", "rotors", "blades", "coils",
+    "dispersers", "condensers", "complex", "fuel_assemblies", "control_rods", "heating_elements",
+)
+
+Materials = Dict[str, int]
+
+TURBINE_VALVES = 2   # steam in, water/energy out
+BOILER_VALVES = 2    # water (or heated sodium) in, steam out; sodium boilers need one more for cooled sodium
+REACTOR_PORTS = 2    # coolant in, heated coolant out; fuel and waste share them by mode
+
+# ---------- Utility Functions ----------
+
+def frame_blocks(x: int, z: int, y: int) -> int:
+    """Edge blocks of an x*z*y box, which must be casing."""
+    return 4 * (x - 2) + 4 * (z - 2) + 4 * (y - 2) + 8
+
+
+def face_blocks(x: int, z: int, y: int) -> int:
+    """Shell blocks of an x*z*y box that are not on an edge."""
+    return x * z * y - (x - 2) * (z - 2) * (y - 2) - frame_blocks(x, z, y)
+
+
+def fits_budget(materials: Materials, budget: Materials) -> bool:
+    """True if every budgeted material is covered. Materials left out of the budget are unlimited."""
+    return all(materials.get(name, 0) <= limit for name, limit in budget.items())
+
+
+def _check_budget(budget: Materials) -> None:
+    unknown = set(budget) - set(MATERIALS)
+    if unknown:
+        raise ValueError(f"Unknown materials {sorted(unknown)} (expected some of {', '.join(MATERIALS)})")
+
+
+def _limit(budget: Materials, name: str) -> float:
+    return budget.get(name, float("inf"))
+
+
+def turbine_materials(turbine: Turbine) -> Materials:
+    x_z, y = turbine.x_z, turbine.y
+    return {
+        "casing": frame_blocks(x_z, x_z, y),
+        "glass": face_blocks(x_z, x_z, y) - turbine.vents - TURBINE_VALVES,
+        "vents": turbine.vents,
+        "valves": TURBINE_VALVES,
+        "rotors": turbine.shaft_height,
+        "blades": turbine.blades,
+        "coils": turbine.coils,
+        "dispersers": turbine.dispersers,
+        "condensers": turbine.condensers,
+        "complex": 1,
+    }
+
+
+def reactor_materials(reactor: FissionReactor) -> Materials:
+    x, z, y = reactor.x, reactor.z, reactor.y
+    return {
+        "casing": frame_blocks(x, z, y),
+        "glass": face_blocks(x, z, y) - REACTOR_PORTS - 1,
+        "ports": REACTOR_PORTS,
+        "controller": 1,
+        "fuel_assemblies": reactor.fuel_assemblies,
+        "control_rods": reactor.control_rods,
+    }
+
+
+def boiler_materials(boiler: Boiler, sodium: bool = True) -> Materials:
+    x, z, y = boiler.x, boiler.z, boiler.y
+    valves = BOILER_VALVES + (1 if sodium else 0)
+    return {
+        "casing": frame_blocks(x, z, y),
+        "glass": face_blocks(x, z, y) - valves,
+        "valves": valves,
+        "dispersers": boiler.dispersers,
+        "heating_elements": boiler.heating_element,
+    }
+
+
+@lru_cache(maxsize=None)
+def _turbine_index() -> Tuple[Tuple, ...]:
+    """Every turbine layout with its best vent count, highest production first.
+    Row: (production, blocks, x_z, y, shaft_height, blades, coils, dispersers, vents, tank_flow, energy_per_flow, condenser_space)
+    """
+    rows = []
+    for x_z in range(CONST["TURBINE_MIN_BASE"], CONST["TURBINE_MAX_BASE"] + 1, 2):
+        for y in range(CONST["TURBINE_MIN_HEIGHT"], CONST["TURBINE_MAX_HEIGHT"] + 1):
+            for shaft_height in range(1, min(2 * x_z - 5, CONST["TURBINE_MAX_ROTOR_HEIGHT"])):
+                blades = shaft_height * 2
+                coils = coils_needed(blades)
+                geometry = Turbine(x_z=x_z, y=y, shaft_height=shaft_height, blades=blades, coils=coils)
+                vents, production = best_vent_count(geometry, "closed_form")
+                if vents < 1 or face_blocks(x_z, x_z, y) < TURBINE_VALVES + 1:
+                    continue
+                dispersers = pressure_dispersers(x_z)
+                rows.append((
+                    production, x_z * x_z * y, x_z, y, shaft_height, blades, coils, dispersers, vents,
+                    dispersers * CONST["GENERAL_DISPERSER_GAS_FLOW"] * lower_volume(x_z, shaft_height),
+                    CONST["MAX_ENERGY_PER_STEAM"] * blade_rate(blades, coils),
+                    ((y - 3) - shaft_height) * (x_z - 2) ** 2 - coils,
+                ))
+    rows.sort(key=lambda row: (-row[0], row[1]))
+    return tuple(rows)
+
+
+def _turbine_vents(row: Tuple, budget: Materials) -> int:
+    """Most vents (up to the layout's best) the budget allows for a layout, 0 if none."""
+    _, _, x_z, y, shaft_height, blades, coils, dispersers, best_vents, tank_flow, _, space = row
+    fixed = {
+        "casing": frame_blocks(x_z, x_z, y), "valves": TURBINE_VALVES, "rotors": shaft_height,
+        "blades": blades, "coils": coils, "dispersers": dispersers, "complex": 1,
+    }
+    if not fits_budget(fixed, budget):
+        return 0
+    vents = min(best_vents, _limit(budget, "vents"))
+    # condensers = min(ceil(flow / rate), space) grows with the vents
+    condensers = _limit(budget, "condensers")
+    if space > condensers and tank_flow > condensers * CONST["GENERAL_CONDENSER_RATE"]:
+        vents = min(vents, condensers * CONST["GENERAL_CONDENSER_RATE"] // CONST["GENERAL_VENT_GAS_FLOW"])
+    # every vent takes the place of a glass block
+    least_vents = max(1, face_blocks(x_z, x_z, y) - TURBINE_VALVES - _limit(budget, "glass"))
+    return int(vents) if vents >= least_vents else 0
+
+
+def _index_turbine(row: Tuple, vents: int) -> Turbine:
+    _, _, x_z, y, shaft_height, blades, coils, dispersers, _, tank_flow, energy_per_flow, space = row
+    max_flow = min(tank_flow, vents * CONST["GENERAL_VENT_GAS_FLOW"])
+    condensers = min(int(ceil(max_flow / CONST["GENERAL_CONDENSER_RATE"])), space)
+    return Turbine(
+        x_z=x_z,
+        y=y,
+        vents=vents,
+        dispersers=dispersers,
+        condensers=condensers,
+        shaft_height=shaft_height,
+        blades=blades,
+        coils=coils,
+        capacity=energy_capacity(x_z, y),
+        max_flow=max_flow,
+        tank_volume=lower_volume(x_z, shaft_height),
+        max_production=energy_per_flow * max_flow,
+        max_water_output=max_water_output(condensers),
+    )
+
+
+@lru_cache(maxsize=None)
+def _reactor_index() -> Tuple[Tuple[int, int, int, int, int], ...]:
+    """(fuel capacity, blocks, x, z, y) of every reactor geometry, most fuel first."""
+    columns = evaluate_reactor_grid()
+    rows = [
+        (fuel, blocks, x, z, y)
+        for fuel, blocks, x, z, y in zip(
+            columns["fuel_assemblies"], columns["blocks"], columns["x"], columns["z"], columns["y"]
+        )
+        if fuel > 0 and face_blocks(x, z, y) >= REACTOR_PORTS + 1
+    ]
+    rows.sort(key=lambda row: (-row[0], row[1]))
+    return tuple(rows)
+
+
+_BOILER_NEEDS = ("casing", "glass", "valves", "dispersers", "heating_elements")
+
+
+@lru_cache(maxsize=None)
+def _boiler_index(coolant: str) -> Tuple[Tuple, ...]:
+    """Every usable boiler layout, highest max flow first.
+    Row: (max flow, blocks, x, z, y, steam cavity, needs, steam limit, water cavity volume)
+    where needs holds the amounts of _BOILER_NEEDS at max flow.
+    """
+    columns = evaluate_boiler_grid(coolant)
+    valves = BOILER_VALVES + (1 if coolant == "sodium" else 0)
+    rows = [
+        (flow, blocks, x, z, y, steam, (
+            frame_blocks(x, z, y), face_blocks(x, z, y) - valves, valves, boiler_dispersers(x, z),
+            heating_elements_needed(flow),
+        ), steam_limit, (x - 2) * (z - 2) * (y - 3 - steam))
+        for flow, blocks, x, z, y, steam, steam_limit in zip(
+            columns["max_flow"], columns["blocks"], columns["x"], columns["z"], columns["y"],
+            columns["steam_cavity_height"], columns["steam_limit"],
+        )
+        if flow > 0
+    ]
+    rows.sort(key=lambda row: (-row[0], row[1]))
+    return tuple(rows)
+
+# ---------- Core Functions ----------
+
+def max_power_turbine(budget: Materials) -> Turbine:
+    """Turbine with the highest max_production buildable from the budget (fewest blocks on ties)."""
+    _check_budget(budget)
+    best: Optional[Tuple[float, int, Tuple, int]] = None
+    for row in _turbine_index():
+        if best is not None and row[0] < best[0]:
+            break  # sorted by the production reachable with unlimited vents
+        vents = _turbine_vents(row, budget)
+        if not vents:
+            continue
+        production = row[10] * min(row[9], vents * CONST["GENERAL_VENT_GAS_FLOW"])
+        if best is None or (production, -row[1]) > (best[0], -best[1]):
+            best = (production, row[1], row, vents)
+    if best is None:
+        raise ValueError("No turbine can be built from this budget.")
+    return _index_turbine(best[2], best[3])
+
+
+def max_burn_reactor(budget: Materials) -> FissionReactor:
+    """Reactor with the most fuel assemblies (burn rate) buildable from the budget.
+    Assemblies fill whole columns under a control rod, so a partly filled reactor
+    needs fewer rods.
+    """
+    _check_budget(budget)
+    best: Optional[Tuple[int, int, int, int, int, int]] = None
+    for capacity, blocks, x, z, y in _reactor_index():
+        if best is not None and capacity < best[0]:
+            break
+        fixed = {"casing": frame_blocks(x, z, y), "glass": face_blocks(x, z, y) - REACTOR_PORTS - 1,
+                 "ports": REACTOR_PORTS, "controller": 1}
+        if not fits_budget(fixed, budget):
+            continue
+        levels = y - 3
+        fuel = int(min(capacity, _limit(budget, "fuel_assemblies"), _limit(budget, "control_rods") * levels))
+        if fuel > 0 and (best is None or (fuel, -blocks) > (best[0], -best[1])):
+            best = (fuel, blocks, x, z, y, levels)
+    if best is None:
+        raise ValueError("No reactor can be built from this budget.")
+    fuel, _, x, z, y, levels = best
+    control_rods = -(-fuel // levels)
+    surface_area = fuel * 4 + control_rods * 2  # each column: 6 faces per assembly, 2 lost per stacked pair
+    return FissionReactor(
+        x=x,
+        z=z,
+        y=y,
+        fuel_assemblies=fuel,
+        control_rods=control_rods,
+        water_burn_rate=fuel * CONST["FISSION_STEAM_PER_FUEL"],
+        heat_capacity=heat_capacity(x, z, y),
+        fuel_surface_area=surface_area,
+        boil_efficiency=boil_efficiency(surface_area, fuel),
+        max_burn_rate=fuel,
+    )
+
+
+def max_flow_boiler(budget: Materials, coolant: str = "sodium") -> Boiler:
+    """Boiler layout with the highest steam flow buildable from the budget (fewest blocks on ties).
+    Below the elements of its max flow, a layout boils elements * superheater
+    capacity, so each one takes as many elements as it needs or the budget allows.
+    """
+    _check_budget(budget)
+    rows = _boiler_index(coolant)
+    sodium = coolant == "sodium"
+    limits = [_limit(budget, name) for name in _BOILER_NEEDS[:-1]]
+    element_limit = _limit(budget, "heating_elements")
+    best: Optional[Tuple[int, int, Tuple, int]] = None
+    for row in rows:
+        max_flow, blocks, _, _, _, _, needs, steam_limit, water_cavity = row
+        if best is not None and max_flow < best[0]:
+            break
+        if not all(need <= limit for need, limit in zip(needs, limits)):
+            continue
+        elements = int(min(needs[-1], element_limit))
+        flow = max_flow if elements == needs[-1] else min(steam_limit, water_side_flow(water_cavity, elements, sodium))
+        if flow > 0 and (best is None or (flow, -blocks) > (best[0], -best[1])):
+            best = (flow, blocks, row, elements)
+    if best is None:
+        raise ValueError("No boiler can be built from this budget.")
+    _, _, (_, _, x, z, y, steam_cavity_height, *_), elements = best
+    return boiler_size(x, z, y, steam_cavity_height, elements)
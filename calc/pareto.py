@@ -0,0 +1,165 @@
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+# An objective is (value getter, True to maximize / False to minimize).
+Objective = Tuple[Callable[[Any], float], bool]
+
+# ---------- Utility Functions ----------
+
+def turbine_block_count(turbine) -> int:
+    """Blocks of the turbine bounding box."""
+    return turbine.x_z * turbine.x_z * turbine.y
+
+
+def turbine_footprint(turbine) -> int:
+    return turbine.x_z * turbine.x_z
+
+
+def reactor_block_count(reactor) -> int:
+    """Blocks of the reactor bounding box."""
+    return reactor.x * reactor.z * reactor.y
+
+
+def reactor_footprint(reactor) -> int:
+    return reactor.x * reactor.z
+
+
+TURBINE_OBJECTIVES: List[Objective] = [
+    (lambda t: t.max_production, True),
+    (turbine_block_count, False),
+    (lambda t: t.max_water_output, True),
+    (turbine_footprint, False),
+]
+
+REACTOR_OBJECTIVES: List[Objective] = [
+    (lambda r: r.water_burn_rate, True),
+    (reactor_block_count, False),
+    (lambda r: r.heat_capacity, True),
+    (reactor_footprint, False),
+]
+
+
+def _default_objectives(candidates: Sequence[Any]) -> List[Objective]:
+    if hasattr(candidates[0], "x_z"):
+        return TURBINE_OBJECTIVES
+    if hasattr(candidates[0], "fuel_assemblies"):
+        return REACTOR_OBJECTIVES
+    raise ValueError(f"No default objectives for {type(candidates[0]).__name__}, pass them explicitly.")
+
+
+def _front_2d(order: List[int], points: List[Tuple]) -> List[int]:
+    """Skyline sweep for two objectives over points sorted best-first."""
+    kept = []
+    best_second = None
+    best_second_first = None
+    for i in order:
+        first, second = points[i]
+        if best_second is not None and (
+            second < best_second or (second == best_second and first < best_second_first)
+        ):
+            continue
+        kept.append(i)
+        if best_second is None or second > best_second:
+            best_second, best_second_first = second, first
+    return kept
+
+
+def _dominated_by_any(above: Sequence[Tuple], p: Tuple, k: int) -> bool:
+    return any(all(a >= b for a, b in zip(q[k:], p[k:])) for q in above)
+
+
+def _screen(above: List[Tuple], below: List[Tuple], k: int) -> List[Tuple]:
+    """Points of below not weakly dominated by a point of above on objectives k and later.
+    Every point of above must be at least as good as every point of below on the
+    objectives before k, and the two lists must not share a point.
+    """
+    if not above or not below:
+        return below
+    last = len(below[0]) - 1
+    if k == last:
+        best = max(q[k] for q in above)
+        return [p for p in below if p[k] > best]
+    if len(above) * len(below) <= 64:
+        return [p for p in below if not _dominated_by_any(above, p, k)]
+
+    # Objective k best-first, points of above first on ties, so a point of above
+    # in the lower half is strictly worse on k than any point of below in the upper half
+    merged = sorted(
+        [(q[k], True, q) for q in above] + [(p[k], False, p) for p in below],
+        key=lambda entry: entry[:2],
+        reverse=True,
+    )
+    if k == last - 1:
+        kept = []
+        best = None
+        for _, from_above, p in merged:
+            if from_above:
+                if best is None or p[last] > best:
+                    best = p[last]
+            elif best is None or p[last] > best:
+                kept.append(p)
+        return kept
+
+    half = len(merged) // 2
+    above_upper = [p for _, from_above, p in merged[:half] if from_above]
+    below_upper = [p for _, from_above, p in merged[:half] if not from_above]
+    above_lower = [p for _, from_above, p in merged[half:] if from_above]
+    below_lower = [p for _, from_above, p in merged[half:] if not from_above]
+    # The upper half of above beats the lower half of below on k, so only later objectives decide
+    below_lower = _screen(above_upper, below_lower, k + 1)
+    return _screen(above_upper, below_upper, k) + _screen(above_lower, below_lower, k)
+
+
+def _skyline(points: List[Tuple]) -> List[Tuple]:
+    """Kung's divide and conquer over distinct points sorted best-first."""
+    if len(points) <= 16:
+        kept: List[Tuple] = []
+        for p in points:
+            if not _dominated_by_any(kept, p, 0):
+                kept.append(p)
+        return kept
+    half = len(points) // 2
+    top = _skyline(points[:half])
+    # Points of the first half are at least as good on the first objective
+    return top + _screen(top, _skyline(points[half:]), 1)
+
+
+def _front_nd(order: List[int], points: List[Tuple]) -> List[int]:
+    """Skyline for three objectives or more; identical points are kept or dropped together."""
+    rows: Dict[Tuple, List[int]] = {}
+    for i in order:
+        rows.setdefault(points[i], []).append(i)
+    return [i for p in _skyline(list(rows)) for i in rows[p]]
+
+# ---------- Core Functions ----------
+
+def dominates(a: Any, b: Any, objectives: Optional[Sequence[Objective]] = None) -> bool:
+    """True if a is at least as good as b on every objective and better on one."""
+    objectives = objectives or _default_objectives([a])
+    pa = [get(a) if maximize else -get(a) for get, maximize in objectives]
+    pb = [get(b) if maximize else -get(b) for get, maximize in objectives]
+    return pa != pb and all(x >= y for x, y in zip(pa, pb))
+
+
+def pareto_front(candidates: Sequence[Any], objectives: Optional[Sequence[Objective]] = None) -> List[Any]:
+    """Return the non-dominated candidates, in input order.
+    Candidates are sorted once, then two objectives take a linear sweep and
+    more take Kung's divide and conquer: O(n log n) for two or three objectives,
+    O(n log^(d-2) n) for d objectives (O(n log^2 n) for the four turbine ones).
+    Candidates with identical objective values are all kept.
+    """
+    if not candidates:
+        return []
+    objectives = objectives or _default_objectives(candidates)
+    points = [
+        tuple(get(c) if maximize else -get(c) for get, maximize in objectives)
+        for c in candidates
+    ]
+    order = sorted(range(len(points)), key=points.__getitem__, reverse=True)
+    if len(objectives) == 1:
+        top = points[order[0]]
+        kept = [i for i in order if points[i] == top]
+    elif len(objectives) == 2:
+        kept = _front_2d(order, points)
+    else:
+        kept = _front_nd(order, points)
+    return [candidates[i] for i in sorted(kept)]
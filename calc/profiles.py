@@ -0,0 +1,202 @@
+import json
+import sys
+import threading
+from collections import namedtuple
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+from calc.constants import CONST, clear_registered_caches
+from calc.turbine import Turbine
+from calc.turbine_grid import turbines_based_on_fission_reactors
+
+# Named constant profiles for modpacks that change the game numbers. A profile
+# is the shipped CONST with some values overridden, resolved once into an
+# immutable namedtuple (attribute access, hashable, comparable).
+#
+# Profiles are process-global. The sizing code reads CONST at call time, so
+# use_profile swaps the values of CONST in place for the duration of a block and
+# clears every cache derived from them (the lru_cache grids and indexes of the
+# calc modules, and the caches registered with calc.constants.register_cache).
+# Switching holds a process-wide lock: use_profile blocks of different threads
+# wait for each other, so each one sees its own constants from start to end.
+# Searches running on other threads outside a block read CONST without the lock
+# and can see a switch halfway, so code that searches on threads pins the
+# profile (the HTTP service does while it serves): switching while pinned raises
+# RuntimeError. Run other profiles in worker processes started with set_profile
+# as initializer.
+
+Constants = namedtuple("Constants", list(CONST))
+
+DEFAULT_PROFILE = "default"
+
+_DEFAULTS = dict(CONST)
+PROFILES: Dict[str, Constants] = {DEFAULT_PROFILE: Constants(**_DEFAULTS)}
+
+_active: Constants = PROFILES[DEFAULT_PROFILE]
+
+_lock = threading.RLock()  # held while switching and for the whole of a use_profile block
+_pins = 0  # pin_profile calls not yet undone, switching is forbidden while positive
+
+# Fields compared to decide whether a profile changes the optimal turbine
+_TURBINE_LAYOUT = ("x_z", "y", "shaft_height", "vents", "condensers")
+
+# ---------- Utility Functions ----------
+
+def make_profile(overrides: Dict[str, Any]) -> Constants:
+    """The shipped constants with overrides applied. Unknown names and non-numeric values for numeric constants raise ValueError."""
+    unknown = set(overrides) - set(_DEFAULTS)
+    if unknown:
+        raise ValueError(f"Unknown constants {sorted(unknown)}")
+    for name, value in overrides.items():
+        numeric = isinstance(_DEFAULTS[name], (int, float))
+        if numeric and (isinstance(value, bool) or not isinstance(value, (int, float))):
+            raise ValueError(f"Constant {name} must be a number, got {value!r}")
+    return Constants(**dict(_DEFAULTS, **overrides))
+
+
+def register_profile(name: str, overrides: Dict[str, Any]) -> Constants:
+    if name == DEFAULT_PROFILE:
+        raise ValueError(f"The '{DEFAULT_PROFILE}' profile cannot be replaced")
+    profile = PROFILES[name] = make_profile(overrides)
+    return profile
+
+
+def load_profiles(path: str) -> List[str]:
+    """Register the profiles of a JSON file {"name": {"CONSTANT": value, ...}, ...}; returns their names."""
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data, dict) or not all(isinstance(v, dict) for v in data.values()):
+        raise ValueError(f"{path} must map profile names to objects of constant overrides")
+    for name, overrides in data.items():
+        register_profile(name, overrides)
+    return list(data)
+
+
+def get_profile(profile: Union[str, Constants]) -> Constants:
+    if isinstance(profile, Constants):
+        return profile
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown profile '{profile}' (expected one of {', '.join(PROFILES)})")
+    return PROFILES[profile]
+
+
+def current_constants() -> Constants:
+    """The active profile, resolved."""
+    return _active
+
+
+def clear_caches() -> None:
+    """Empty every cache derived from CONST: the lru_caches of the calc modules and the registered ones."""
+    for name, module in list(sys.modules.items()):
+        if name.startswith("calc.") and module is not None:
+            for value in vars(module).values():
+                if callable(value) and hasattr(value, "cache_clear"):
+                    value.cache_clear()
+    clear_registered_caches()
+
+
+def _apply(values: Dict[str, Any], constants: Constants) -> None:
+    """Set CONST to values. Every profile has every key, so CONST is updated in
+    place and never misses one, even for a moment.
+    """
+    global _active
+    if _pins:
+        raise RuntimeError("The profile is pinned by a running service, profiles cannot be switched until it stops.")
+    CONST.update(values)
+    _active = constants
+    clear_caches()
+
+# ---------- Core Functions ----------
+
+def pin_profile() -> Constants:
+    """Forbid profile switches until unpin_profile, for code reading CONST from
+    several threads. Waits for the use_profile blocks of other threads to end;
+    returns the pinned profile.
+    """
+    global _pins
+    with _lock:
+        _pins += 1
+        return _active
+
+
+def unpin_profile() -> None:
+    global _pins
+    with _lock:
+        if not _pins:
+            raise RuntimeError("unpin_profile called without pin_profile.")
+        _pins -= 1
+
+
+def set_profile(profile: Union[str, Constants]) -> Constants:
+    """Activate a profile for the rest of the process, e.g. as the initializer of pool workers."""
+    constants = get_profile(profile)
+    with _lock:
+        if constants != _active or tuple(CONST.values()) != constants:
+            _apply(constants._asdict(), constants)
+    return constants
+
+
+@contextmanager
+def use_profile(profile: Union[str, Constants]) -> Iterator[Constants]:
+    """Run a block with CONST set to a profile, then put the previous values back."""
+    constants = get_profile(profile)
+    with _lock:
+        previous, saved = _active, dict(CONST)
+        switch = constants != previous
+        if switch:
+            _apply(constants._asdict(), constants)
+        try:
+            yield constants
+        finally:
+            if switch:
+                _apply(saved, previous)
+
+
+@dataclass
+class SensitivityResult:
+    profiles: List[str]
+    burn_rates: List[float]   # mB/t of fuel
+    turbines: List[List[Optional[Turbine]]] = field(default_factory=list)  # [profile][burn rate], None when no single turbine fits
+
+    def changed(self, baseline: int = 0) -> List[Tuple[str, float]]:
+        """(profile, burn rate) pairs whose optimal turbine layout differs from the baseline profile's."""
+        def layout(turbine: Optional[Turbine]) -> Optional[Tuple]:
+            return None if turbine is None else tuple(getattr(turbine, name) for name in _TURBINE_LAYOUT)
+
+        base = [layout(t) for t in self.turbines[baseline]]
+        return [
+            (name, rate)
+            for name, row in zip(self.profiles, self.turbines)
+            for rate, turbine, reference in zip(self.burn_rates, row, base)
+            if layout(turbine) != reference
+        ]
+
+    def result_print(self) -> None:
+        print(f"Optimal turbine per profile ({', '.join(self.profiles)})")
+        for column, rate in enumerate(self.burn_rates):
+            cells = [
+                "-" if row[column] is None else
+                f"{row[column].x_z}x{row[column].x_z}x{row[column].y} s{row[column].shaft_height} v{row[column].vents} c{row[column].condensers}"
+                for row in self.turbines
+            ]
+            print(f"- {rate} mB/t: " + " | ".join(cells))
+        changed = self.changed()
+        print(f"{len(changed)} of {len(self.burn_rates) * (len(self.profiles) - 1)} results differ from {self.profiles[0]}")
+
+
+def sensitivity_sweep(profiles: Sequence[str], fuel_burn_rates: Sequence[float]) -> SensitivityResult:
+    """Optimal turbine for every fuel burn rate under every profile (the first one is the baseline).
+    Each distinct set of constants is activated once and sizes the whole batch of
+    burn rates on the shared turbine grid; profiles resolving to the same
+    constants reuse that result.
+    """
+    resolved = [get_profile(name) for name in profiles]
+    by_constants: Dict[Constants, List[Optional[Turbine]]] = {}
+    result = SensitivityResult(list(profiles), list(fuel_burn_rates))
+    for constants in resolved:
+        if constants not in by_constants:
+            with use_profile(constants):
+                water_burn_rates = [rate * CONST["FISSION_STEAM_PER_FUEL"] for rate in fuel_burn_rates]
+                by_constants[constants] = turbines_based_on_fission_reactors(water_burn_rates, allow_missing=True)
+        result.turbines.append(by_constants[constants])
+    return result
@@ -0,0 +1,93 @@
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Dict, Iterator
+
+# Opt-in counters and stage timings for the sizing functions.
+# Call sites test ENABLED before doing any work, so a disabled profiler costs
+# one attribute lookup per instrumented block.
+
+ENABLED = False
+
+@dataclass
+class ProfileReport:
+    counters: Dict[str, int] = field(default_factory=dict)   # candidates, iterations, filter results
+    timings: Dict[str, float] = field(default_factory=dict)  # seconds spent per stage
+    stage_calls: Dict[str, int] = field(default_factory=dict)
+
+    def report_print(self) -> None:
+        print("=== Profile ===")
+        if self.timings:
+            print("Stages:")
+            for name in sorted(self.timings):
+                total = self.timings[name]
+                calls = self.stage_calls[name]
+                print(f"- {name}: {calls} calls, {total * 1_000:.3f} ms total, {total / calls * 1e6:.1f} us/call")
+        if self.counters:
+            print("Counters:")
+            for name in sorted(self.counters):
+                print(f"- {name}: {self.counters[name]}")
+
+    def as_dict(self) -> Dict[str, Dict]:
+        return {
+            "counters": dict(self.counters),
+            "timings": dict(self.timings),
+            "stage_calls": dict(self.stage_calls),
+        }
+
+_report = ProfileReport()
+
+# ---------- Core Functions ----------
+
+def enable(reset_report: bool = True) -> None:
+    global ENABLED
+    if reset_report:
+        reset()
+    ENABLED = True
+
+
+def disable() -> None:
+    global ENABLED
+    ENABLED = False
+
+
+def reset() -> None:
+    global _report
+    _report = ProfileReport()
+
+
+def report() -> ProfileReport:
+    """Snapshot of everything recorded since the last reset."""
+    return ProfileReport(**_report.as_dict())
+
+
+def count(name: str, amount: int = 1) -> None:
+    """Add amount to a counter. Callers check ENABLED first on hot paths."""
+    if ENABLED:
+        _report.counters[name] = _report.counters.get(name, 0) + amount
+
+
+@contextmanager
+def _timed(name: str) -> Iterator[None]:
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        _report.timings[name] = _report.timings.get(name, 0.0) + perf_counter() - start
+        _report.stage_calls[name] = _report.stage_calls.get(name, 0) + 1
+
+
+def stage(name: str):
+    """Context manager timing a stage when profiling is enabled."""
+    return _timed(name) if ENABLED else _NULL_STAGE
+
+
+class _NullStage:
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc) -> bool:
+        return False
+
+
+_NULL_STAGE = _NullStage()
@@ -2,8 +2,9 @@ from dataclasses import dataclass
 from typing import Tuple, List
 from math import ceil
 from calc.constants import CONST
+from calc import profiling
 
-@dataclass
+@dataclass(slots=True)
 class FissionReactor:
     x: int = 0
     z: int = 0
@@ -52,6 +53,29 @@ def heat_capacity(x: int, z: int, y: int) -> int:
     return (top_bottom + front_back + left_right) * CONST["CASING_HEAT_CAPACITY"]
 
 
+def casing_blocks(x: int, z: int, y: int) -> int:
+    """Blocks of the reactor shell (casing, glass, ports, controller)."""
+    return x * z * y - area_inside_reactor(x, z, y)
+
+
+def checker_fuel_surface_area(x: int, z: int, y: int) -> int:
+    """Exposed faces of the fuel in the checker pattern of fuel_assemblies_dimensions.
+    Columns never touch sideways, so only the levels of one column touch each other.
+    """
+    num_fuel_assemblies, num_columns = fuel_assemblies_dimensions(x, z, y)
+    if num_fuel_assemblies <= 0:
+        return 0
+    levels = y - 3
+    return num_columns * (levels * 6 - (levels - 1) * 2)
+
+
+def boil_efficiency(surface_area: int, fuel_assemblies: int) -> float:
+    """Average exposed faces per assembly against the target, capped at 1."""
+    if fuel_assemblies <= 0:
+        return 0.0
+    return min(surface_area / fuel_assemblies / CONST["FISSION_SURFACE_AREA_TARGET"], 1.0)
+
+
 def _divisors_sorted(n: int) -> List[int]:
     """Return all positive divisors of n sorted ascending."""
     if n <= 0:
@@ -84,22 +108,29 @@ def optimal_structure(fuel_assemblies: int) -> Tuple[int, int, int]:
     y = difference + 1 + 2  # Plus 1 for controllers, then casing +2
     return x, z, y
 
-# ---------- Core Functions ----------
-
-def optimal_fission_with_dimensions(x: int, z: int, y: int) -> FissionReactor:
-    # Validate bounds 
+def reactor_bounds_warnings(x: int, z: int, y: int) -> List[str]:
+    """Warnings optimal_fission_with_dimensions prints for out of bounds dimensions."""
+    warnings = []
     if x < CONST["MIN_REACTOR_BASE"]:
-        print("Reactor length too small, min 3 blocks.")
+        warnings.append("Reactor length too small, min 3 blocks.")
     elif x > CONST["MAX_REACTOR_BASE"]:
-        print("Reactor length too large, max 18 blocks.")
+        warnings.append("Reactor length too large, max 18 blocks.")
     if z < CONST["MIN_REACTOR_BASE"]:
-        print("Reactor width too small, min 3 blocks.")
+        warnings.append("Reactor width too small, min 3 blocks.")
     elif z > CONST["MAX_REACTOR_BASE"]:
-        print("Reactor width too large, max 18 blocks.")
+        warnings.append("Reactor width too large, max 18 blocks.")
     if y < CONST["MIN_REACTOR_HEIGHT"]:
-        print("Reactor height too small, min 4 blocks.")
+        warnings.append("Reactor height too small, min 4 blocks.")
     elif y > CONST["MAX_REACTOR_HEIGHT"]:
-        print("Reactor height too large, max 18 blocks.")
+        warnings.append("Reactor height too large, max 18 blocks.")
+    return warnings
+
+# ---------- Core Functions ----------
+
+def optimal_fission_with_dimensions(x: int, z: int, y: int) -> FissionReactor:
+    # Validate bounds 
+    for warning in reactor_bounds_warnings(x, z, y):
+        print(warning)
 
     fuel_assemblies, control_rods = fuel_assemblies_dimensions(x, z, y)
     water_burn_rate = fuel_assemblies * CONST["FISSION_STEAM_PER_FUEL"]
@@ -125,18 +156,23 @@ def turbine_based_fission_reactor(max_flow: int) -> FissionReactor:
     reactor = FissionReactor(fuel_assemblies=fuel_assemblies)
 
     # Find larger than needed reactor, then shave it off
-    for i in range(4, CONST["MAX_REACTOR_BASE"]):
-        x_inner = i - 2
-        y_inner = i - 2
-        z_inner = i - 2
-        efficient_area = int(ceil((x_inner * z_inner) / 2.0)) * y_inner
-        control_rods = int(ceil((x_inner * x_inner) / 2.0))
-        if efficient_area > fuel_assemblies + control_rods:
-            reactor.x = x_inner + 2
-            reactor.y = y_inner + 2
-            reactor.z = z_inner + 2
-            reactor.control_rods = control_rods
-            break
+    grow_iterations = 0
+    with profiling.stage("turbine_based_fission_reactor.grow"):
+        for i in range(4, CONST["MAX_REACTOR_BASE"]):
+            grow_iterations += 1
+            x_inner = i - 2
+            y_inner = i - 2
+            z_inner = i - 2
+            efficient_area = int(ceil((x_inner * z_inner) / 2.0)) * y_inner
+            control_rods = int(ceil((x_inner * x_inner) / 2.0))
+            if efficient_area > fuel_assemblies + control_rods:
+                reactor.x = x_inner + 2
+                reactor.y = y_inner + 2
+                reactor.z = z_inner + 2
+                reactor.control_rods = control_rods
+                break
+    if profiling.ENABLED:
+        profiling.count("turbine_based_fission_reactor.grow_iterations", grow_iterations)
 
     # Check if x can be reduced by 1
     x_inner = reactor.x - 3
@@ -147,6 +183,8 @@ def turbine_based_fission_reactor(max_flow: int) -> FissionReactor:
     if area >= fuel_assemblies + control_rods:
         reactor.x -= 1
         reactor.control_rods = control_rods
+        if profiling.ENABLED:
+            profiling.count("turbine_based_fission_reactor.shaved_x")
 
     # Check if y can be reduced by 1
     y_inner = reactor.y - 3
@@ -155,6 +193,8 @@ def turbine_based_fission_reactor(max_flow: int) -> FissionReactor:
     area = (x_inner * y_inner * z_inner) // 2
     if area >= fuel_assemblies + control_rods:
         reactor.y -= 1
+        if profiling.ENABLED:
+            profiling.count("turbine_based_fission_reactor.shaved_y")
 
     # Surface area
     surface_area = fuel_assemblies * 6
@@ -205,6 +245,8 @@ def compute_reactor_size(fuel_rate_wanted: float) -> Tuple[int, Tuple[int, int]]
         for height in range(CONST["MIN_REACTOR_HEIGHT"], CONST["MAX_REACTOR_HEIGHT"]):
             internal_volume = (base - 2) * (base - 2) * (height - 3)
             if internal_volume >= ceil(assemblies_needed * 2):
+                if profiling.ENABLED:
+                    profiling.count("compute_reactor_size.candidates", (base - CONST["MIN_REACTOR_BASE"]) * (CONST["MAX_REACTOR_HEIGHT"] - CONST["MIN_REACTOR_HEIGHT"]) + height - CONST["MIN_REACTOR_HEIGHT"] + 1)
                 return assemblies_needed, (base, height)
 
     # Fallback to a structure derived from factorization if loops didn't return
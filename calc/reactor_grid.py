@@ -0,0 +1,127 @@
+from bisect import bisect_left
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+from calc.constants import CONST
+from calc.pareto import Objective, pareto_front
+from calc.reactor import (
+    FissionReactor, boil_efficiency, casing_blocks, checker_fuel_surface_area,
+    fuel_assemblies_dimensions, heat_capacity,
+)
+
+# Column-wise evaluation of every reactor geometry within the MIN/MAX_REACTOR_*
+# bounds, with the checker pattern of fuel_assemblies_dimensions. Rows are
+# sorted by block count, and only the rows a query returns become
+# FissionReactor objects. Unlike turbine_based_fission_reactor (grow a cube,
+# then shave x and y), every geometry is considered.
+
+GridColumns = Dict[str, List]
+
+# (column, True to maximize / False to minimize)
+REACTOR_GRID_OBJECTIVES: Tuple[Tuple[str, bool], ...] = (
+    ("fuel_assemblies", True),
+    ("casing_blocks", False),
+    ("heat_capacity", True),
+    ("boil_efficiency", True),
+)
+
+# ---------- Utility Functions ----------
+
+def _fuel_needed(max_flow: int) -> int:
+    """Assemblies asked for by a steam flow, as in turbine_based_fission_reactor."""
+    return max_flow // CONST["FISSION_STEAM_PER_FUEL"]
+
+
+@lru_cache(maxsize=None)
+def evaluate_reactor_grid() -> GridColumns:
+    """Every reactor geometry as columns, smallest block count first."""
+    geometries = sorted(
+        (x * z * y, x, z, y)
+        for x in range(CONST["MIN_REACTOR_BASE"], CONST["MAX_REACTOR_BASE"] + 1)
+        for z in range(CONST["MIN_REACTOR_BASE"], CONST["MAX_REACTOR_BASE"] + 1)
+        for y in range(CONST["MIN_REACTOR_HEIGHT"], CONST["MAX_REACTOR_HEIGHT"] + 1)
+    )
+    blocks, xs, zs, ys = (list(column) for column in zip(*geometries))
+    fuel, rods = (list(column) for column in zip(*map(fuel_assemblies_dimensions, xs, zs, ys)))
+    surface_areas = list(map(checker_fuel_surface_area, xs, zs, ys))
+    return {
+        "blocks": blocks,
+        "x": xs,
+        "z": zs,
+        "y": ys,
+        "fuel_assemblies": fuel,
+        "control_rods": rods,
+        "casing_blocks": list(map(casing_blocks, xs, zs, ys)),
+        "heat_capacity": list(map(heat_capacity, xs, zs, ys)),
+        "fuel_surface_area": surface_areas,
+        "boil_efficiency": list(map(boil_efficiency, surface_areas, fuel)),
+    }
+
+
+@lru_cache(maxsize=None)
+def _running_max_fuel() -> Tuple[int, ...]:
+    """Most assemblies among the rows up to each row, for bisecting the smallest reactor."""
+    running = []
+    best = 0
+    for fuel in evaluate_reactor_grid()["fuel_assemblies"]:
+        best = max(best, fuel)
+        running.append(best)
+    return tuple(running)
+
+
+@lru_cache(maxsize=None)
+def _front_rows(fuel_needed: int, objectives: Tuple[Tuple[str, bool], ...]) -> Tuple[int, ...]:
+    columns = evaluate_reactor_grid()
+    fuel = columns["fuel_assemblies"]
+    if ("fuel_assemblies", True) in objectives and fuel_needed > 0:
+        # Whatever dominates a row has at least as many assemblies, so the front of
+        # the rows holding fuel_needed is the whole grid's front cut at fuel_needed
+        return tuple(i for i in _front_rows(0, objectives) if fuel[i] >= fuel_needed)
+    rows = [i for i in range(len(fuel)) if fuel[i] >= fuel_needed]
+    if not rows:
+        return ()
+    getters: List[Objective] = [(columns[name].__getitem__, maximize) for name, maximize in objectives]
+    return tuple(pareto_front(rows, getters))
+
+
+def grid_row_reactor(index: int) -> FissionReactor:
+    """Materialize one grid row as a FissionReactor."""
+    columns = evaluate_reactor_grid()
+    fuel_assemblies = columns["fuel_assemblies"][index]
+    return FissionReactor(
+        x=columns["x"][index],
+        z=columns["z"][index],
+        y=columns["y"][index],
+        fuel_assemblies=fuel_assemblies,
+        control_rods=columns["control_rods"][index],
+        water_burn_rate=fuel_assemblies * CONST["FISSION_STEAM_PER_FUEL"],
+        heat_capacity=columns["heat_capacity"][index],
+        fuel_surface_area=columns["fuel_surface_area"][index],
+        boil_efficiency=columns["boil_efficiency"][index],
+        max_burn_rate=fuel_assemblies,
+    )
+
+# ---------- Core Functions ----------
+
+def smallest_reactor_for_flow(max_flow: int) -> FissionReactor:
+    """Reactor with the fewest blocks holding the assemblies for max_flow mB/t of steam.
+    Ties go to the first geometry in (x, z, y) order.
+    """
+    running = _running_max_fuel()
+    index = bisect_left(running, _fuel_needed(max_flow))
+    if index == len(running):
+        raise ValueError("No single reactor can carry this flow.")
+    return grid_row_reactor(index)
+
+
+def reactor_options_for_flow(
+    max_flow: int,
+    objectives: Optional[Sequence[Tuple[str, bool]]] = None,
+) -> List[FissionReactor]:
+    """Non-dominated reactors holding the assemblies for max_flow mB/t of steam,
+    smallest first. Objectives are grid columns, by default fuel assemblies,
+    casing blocks, heat capacity and boil efficiency (REACTOR_GRID_OBJECTIVES).
+    """
+    rows = _front_rows(_fuel_needed(max_flow), tuple(objectives or REACTOR_GRID_OBJECTIVES))
+    if not rows:
+        raise ValueError("No single reactor can carry this flow.")
+    return [grid_row_reactor(index) for index in rows]
@@ -0,0 +1,257 @@
+import asyncio
+import json
+from collections import OrderedDict
+from concurrent.futures import Executor
+from dataclasses import asdict, dataclass
+from math import ceil
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+from calc.constants import CONST, constants_hash
+from calc.jsonl import solve_request
+from calc.profiles import pin_profile, unpin_profile
+from calc.reactor import optimal_fission_with_dimensions, turbine_based_fission_reactor
+from calc.turbine import optimal_turbine_with_dimensions, turbine_based_on_fission_reactor
+
+# Small HTTP service over the sizing functions, built on asyncio streams only.
+#   GET /turbine?flow=400000          turbine for a water burn rate
+#   GET /turbine?x_z=9&y=12           best turbine for given dimensions
+#   GET /reactor?flow=400000          reactor for a steam flow
+#   GET /reactor?x=5&z=5&y=6          reactor for given dimensions
+#   GET /setup?setup=sodium&mode=flow&max_flow=400000   same requests as --jsonl
+#   GET /stats                        cache and coalescing counters
+# Results are kept as encoded JSON in an LRU cache, identical requests that are
+# still running share one computation, and searches run in an executor. Keys
+# include the constants hash, and the profile is pinned while the service is
+# listening (searches run on threads, see calc.profiles): switch profiles before
+# starting it, or serve each profile from its own process.
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+Request = Tuple[str, Tuple]  # kind of result and normalised arguments
+Key = Tuple[str, Tuple, str]  # the same and the constants hash
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+@dataclass
+class ServiceStats:
+    requests: int = 0
+    cache_hits: int = 0
+    coalesced: int = 0   # requests that waited on an identical in-flight computation
+    computed: int = 0
+    errors: int = 0
+
+
+class ResultCache:
+    """Least recently used mapping of request keys to encoded results."""
+
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Key, bytes]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Key) -> Optional[bytes]:
+        body = self._entries.get(key)
+        if body is not None:
+            self._entries.move_to_end(key)
+        return body
+
+    def put(self, key: Key, body: bytes) -> None:
+        self._entries[key] = body
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+# ---------- Utility Functions ----------
+
+STATUS_TEXT = {
+    200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 422: "Unprocessable Entity",
+    500: "Internal Server Error",
+}
+
+
+def _int_param(params: Dict[str, str], name: str, low: int, high: int) -> int:
+    """Integer parameter within [low, high], checked before any search sees it."""
+    try:
+        value = int(params[name])
+    except KeyError:
+        raise HTTPError(400, f"Missing parameter '{name}'") from None
+    except ValueError:
+        raise HTTPError(400, f"Parameter '{name}' must be an integer") from None
+    if not low <= value <= high:
+        raise HTTPError(400, f"Parameter '{name}' must be between {low} and {high}, got {value}")
+    return value
+
+
+def _flow_param(params: Dict[str, str], name: str) -> int:
+    """Steam flow of a reactor burning between MIN_BURN_RATE and MAX_BURN_RATE mB/t."""
+    steam_per_fuel = CONST["FISSION_STEAM_PER_FUEL"]
+    low = int(ceil(CONST["MIN_BURN_RATE"] * steam_per_fuel))
+    return _int_param(params, name, low, int(CONST["MAX_BURN_RATE"] * steam_per_fuel))
+
+
+def _reactor_params(params: Dict[str, str]) -> Tuple[int, int, int]:
+    base = (CONST["MIN_REACTOR_BASE"], CONST["MAX_REACTOR_BASE"])
+    return (
+        _int_param(params, "x", *base), _int_param(params, "z", *base),
+        _int_param(params, "y", CONST["MIN_REACTOR_HEIGHT"], CONST["MAX_REACTOR_HEIGHT"]),
+    )
+
+
+def _encode(result: Any) -> bytes:
+    return json.dumps(asdict(result) if hasattr(result, "__dataclass_fields__") else result).encode()
+
+
+def _run(function: Callable, args: Tuple) -> bytes:
+    """Encoded result of one search; module level so a process pool can run it."""
+    return _encode(function(*args))
+
+
+def _sizing_call(path: str, params: Dict[str, str]) -> Tuple[Request, Callable, Tuple]:
+    """Cache key, function and arguments for a request path, normalised so equal requests share a key."""
+    if path == "/turbine":
+        if "flow" in params:
+            flow = _flow_param(params, "flow")
+            return ("turbine", (flow,)), turbine_based_on_fission_reactor, (flow,)
+        x_z = _int_param(params, "x_z", CONST["TURBINE_MIN_BASE"], CONST["TURBINE_MAX_BASE"])
+        y = _int_param(params, "y", CONST["TURBINE_MIN_HEIGHT"], CONST["TURBINE_MAX_HEIGHT"])
+        return ("turbine", (x_z, y)), optimal_turbine_with_dimensions, (x_z, y, "closed_form")
+    if path == "/reactor":
+        if "flow" in params:
+            flow = _flow_param(params, "flow")
+            return ("reactor", (flow,)), turbine_based_fission_reactor, (flow,)
+        x, z, y = _reactor_params(params)
+        return ("reactor", (x, z, y)), optimal_fission_with_dimensions, (x, z, y)
+    if path == "/setup":
+        request: Dict[str, Any] = {"setup": params.get("setup", "water"), "mode": params.get("mode", "flow")}
+        if request["mode"] == "flow":
+            request["max_flow"] = _flow_param(params, "max_flow")
+        else:
+            request.update(zip(("x", "z", "y"), _reactor_params(params)))
+        return ("setup", tuple(sorted(request.items()))), solve_request, (request,)
+    raise HTTPError(404, f"Unknown path '{path}'")
+
+
+def _response(status: int, body: bytes) -> bytes:
+    head = (
+        f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        "Connection: close\r\n\r\n"
+    )
+    return head.encode("latin-1") + body
+
+# ---------- Core Functions ----------
+
+class SizingService:
+    """Coalescing, caching front end to the sizing functions.
+    executor None uses the event loop's default thread pool; pass a
+    ProcessPoolExecutor to run several searches in parallel (with
+    initializer=calc.profiles.set_profile under a profile and the spawn start method).
+    """
+
+    def __init__(self, cache_size: int = 4096, executor: Optional[Executor] = None):
+        self.cache = ResultCache(cache_size)
+        self.executor = executor
+        self.stats = ServiceStats()
+        self._inflight: Dict[Key, "asyncio.Future[bytes]"] = {}
+
+    async def _compute(self, key: Key, function: Callable, args: Tuple) -> bytes:
+        try:
+            body = await asyncio.get_running_loop().run_in_executor(self.executor, _run, function, args)
+        finally:
+            del self._inflight[key]
+        self.stats.computed += 1
+        self.cache.put(key, body)
+        return body
+
+    async def size(self, path: str, params: Dict[str, str]) -> bytes:
+        """Encoded result for a request, from the cache, an identical running request, or a new search."""
+        request, function, args = _sizing_call(path, params)
+        key = (*request, constants_hash())
+        body = self.cache.get(key)
+        if body is not None:
+            self.stats.cache_hits += 1
+            return body
+        task = self._inflight.get(key)
+        if task is None:
+            task = self._inflight[key] = asyncio.ensure_future(self._compute(key, function, args))
+        else:
+            self.stats.coalesced += 1
+        # shield: a client hanging up must not cancel a search others are waiting on
+        return await asyncio.shield(task)
+
+    async def handle(self, method: str, target: str) -> Tuple[int, bytes]:
+        self.stats.requests += 1
+        url = urlsplit(target)
+        try:
+            if method != "GET":
+                raise HTTPError(405, "Only GET is supported")
+            if url.path == "/stats":
+                return 200, _encode({**asdict(self.stats), "cached": len(self.cache), "in_flight": len(self._inflight)})
+            return 200, await self.size(url.path, dict(parse_qsl(url.query)))
+        except HTTPError as error:
+            self.stats.errors += 1
+            return error.status, _encode({"error": str(error)})
+        except ValueError as error:
+            self.stats.errors += 1
+            return 422, _encode({"error": str(error)})
+        except Exception as error:
+            self.stats.errors += 1
+            return 500, _encode({"error": f"Internal error: {type(error).__name__}"})
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            request_line = (await reader.readline()).decode("latin-1").split()
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass  # headers are not used
+            if len(request_line) != 3:
+                status, body = 400, _encode({"error": "Malformed request line"})
+            else:
+                status, body = await self.handle(request_line[0], request_line[1])
+            writer.write(_response(status, body))
+            # Shut the socket down, not only close it: forked pool workers may hold a copy of it
+            if writer.can_write_eof():
+                writer.write_eof()
+            await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> asyncio.AbstractServer:
+        """Listen for requests. The profile stays pinned until the server is closed."""
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        pin_profile()
+        asyncio.ensure_future(_unpin_when_closed(server))
+        return server
+
+
+async def _unpin_when_closed(server: asyncio.AbstractServer) -> None:
+    try:
+        await server.wait_closed()
+    finally:
+        unpin_profile()
+
+
+async def _serve(host: str, port: int, cache_size: int) -> None:
+    service = SizingService(cache_size)
+    server = await service.start(host, port)
+    address = server.sockets[0].getsockname()
+    print(f"Serving on http://{address[0]}:{address[1]}")
+    async with server:
+        await server.serve_forever()
+
+
+def serve(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, cache_size: int = 4096) -> None:
+    """Run the service until interrupted. Binds to localhost unless told otherwise."""
+    try:
+        asyncio.run(_serve(host, port, cache_size))
+    except KeyboardInterrupt:
+        pass
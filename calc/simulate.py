@@ -0,0 +1,265 @@
+from dataclasses import dataclass, field
+from typing import Iterable, List, Optional, Sequence, Tuple
+from calc.constants import CONST
+from calc.boiler import Boiler
+from calc.reactor import FissionReactor, heat_capacity
+from calc.turbine import Turbine, steam_capacity
+
+# Tick-level transient model of a reactor -> (boiler ->) turbine chain.
+# Each tick the turbine takes steam from its tank, the boiler (sodium setups)
+# turns heated sodium into steam, the reactor boils coolant with its heat, and
+# what cannot be boiled stays in the reactor and raises its temperature.
+#
+# Every rate is the min of a few limits. While the same limits stay active and
+# the inputs are constant, each tick adds the same delta to the state, so the
+# simulator jumps straight to the tick before a limit would switch (or to the
+# end of the segment) instead of stepping through hours of steady operation.
+
+@dataclass
+class Segment:
+    seconds: float
+    burn_rate: float                       # mB/t of fuel at the start of the segment
+    end_burn_rate: Optional[float] = None  # ramp linearly to this burn rate
+    turbine_online: bool = True
+    load: Optional[float] = None           # energy drawn from the turbine per tick, None for all of it
+
+
+@dataclass
+class SimulationResult:
+    ticks: int = 0
+    temperature: float = 0.0       # °K at the end
+    max_temperature: float = 0.0
+    overheat_tick: Optional[int] = None     # first tick at or above MAX_TEMPERATURE
+    steam_full_tick: Optional[int] = None   # first tick with a full steam tank
+    max_steam: float = 0.0         # mB in the steam tanks
+    max_heated_coolant: float = 0.0  # mB of heated sodium waiting in the boiler
+    energy_produced: float = 0.0
+    energy_wasted: float = 0.0     # produced while the turbine energy buffer was full
+    steps: int = 0                 # ticks actually stepped, the rest were jumped
+    samples: List[Tuple[int, float, float, float]] = field(default_factory=list)  # (tick, °K, steam, energy) per segment
+
+    @property
+    def time_to_overheat(self) -> Optional[float]:
+        """Seconds until MAX_TEMPERATURE, or None if it was never reached."""
+        if self.overheat_tick is None:
+            return None
+        return self.overheat_tick / CONST["TICKS_PER_SECOND"]
+
+    def result_print(self) -> None:
+        seconds = self.ticks / CONST["TICKS_PER_SECOND"]
+        print(f"Simulated {seconds:.1f} s ({self.ticks} ticks, {self.steps} stepped)")
+        print(f"- Temperature {self.temperature:.1f} K, max {self.max_temperature:.1f} K")
+        if self.overheat_tick is not None:
+            print(f"- Overheats after {self.time_to_overheat:.2f} s")
+        if self.steam_full_tick is not None:
+            print(f"- Steam tanks full after {self.steam_full_tick / CONST['TICKS_PER_SECOND']:.2f} s")
+        print(f"- Max steam {self.max_steam:.0f} mB, Max heated coolant {self.max_heated_coolant:.0f} mB")
+        print(f"- Energy produced {self.energy_produced:.2f}, wasted {self.energy_wasted:.2f}")
+
+
+@dataclass
+class _Chain:
+    heat_capacity: float      # J/K of the reactor
+    heat_per_coolant: float   # J removed per mB of coolant heated (steam or heated sodium)
+    max_coolant: float        # mB/t of coolant the reactor can heat
+    steam_capacity: float     # mB of steam buffered before the turbine
+    turbine_flow: float       # mB/t of steam the turbine takes
+    energy_per_steam: float
+    energy_capacity: float
+    sodium: bool = False
+    hot_capacity: float = 0.0   # mB of heated sodium the boiler holds
+    boil_capacity: float = 0.0  # mB/t of steam the boiler makes
+
+# State: (heat above ambient J, heated sodium mB, steam mB, buffered energy, produced, wasted)
+State = Tuple[float, float, float, float, float, float]
+
+# ---------- Utility Functions ----------
+
+def _chain(reactor: FissionReactor, turbine: Turbine, boiler: Optional[Boiler]) -> _Chain:
+    heat_per_fuel = CONST["FISSION_HEAT_PER_FUEL"]
+    coolant_per_fuel = CONST["FISSION_SODIUM_HEATED_PER_FUEL"] if boiler else CONST["FISSION_STEAM_PER_FUEL"]
+    turbine_steam = steam_capacity(turbine.x_z, turbine.shaft_height)
+    return _Chain(
+        heat_capacity=reactor.heat_capacity or heat_capacity(reactor.x, reactor.z, reactor.y),
+        heat_per_coolant=heat_per_fuel / coolant_per_fuel,
+        max_coolant=reactor.fuel_assemblies * coolant_per_fuel,
+        steam_capacity=turbine_steam + (boiler.steam_capacity if boiler else 0),
+        turbine_flow=min(turbine.max_flow, turbine.max_water_output),
+        energy_per_steam=turbine.max_production / turbine.max_flow if turbine.max_flow else 0.0,
+        energy_capacity=turbine.capacity,
+        sodium=boiler is not None,
+        hot_capacity=boiler.heated_coolant_capacity if boiler else 0.0,
+        boil_capacity=boiler.boil_capacity if boiler else 0.0,
+    )
+
+
+def _min(guards: List[Tuple[float, ...]], *limits: float) -> float:
+    """min of the limits, remembered so the jump logic knows when the choice would change."""
+    guards.append(limits)
+    return min(limits)
+
+
+def _step(state: State, chain: _Chain, burn_rate: float, online: bool, load: Optional[float], guards: List) -> State:
+    heat, hot, steam, energy, produced, wasted = state
+    heat_available = heat + burn_rate * CONST["FISSION_HEAT_PER_FUEL"]
+
+    used = _min(guards, chain.turbine_flow if online else 0.0, steam)
+    free = chain.steam_capacity - steam + used
+    if chain.sodium:
+        boiled = _min(guards, hot / CONST["SODIUM_TO_STEAM_RATIO"], chain.boil_capacity, free)
+        hot -= boiled * CONST["SODIUM_TO_STEAM_RATIO"]
+        heated = _min(guards, heat_available / chain.heat_per_coolant, chain.max_coolant, chain.hot_capacity - hot)
+        hot += heated
+    else:
+        boiled = heated = _min(guards, heat_available / chain.heat_per_coolant, chain.max_coolant, free)
+    steam += boiled - used
+    heat = heat_available - heated * chain.heat_per_coolant
+
+    output = used * chain.energy_per_steam
+    produced += output
+    if load is not None:
+        buffered = energy + output - load
+        energy = -_min(guards, -buffered, 0.0)              # cannot draw below empty
+        energy = _min(guards, energy, chain.energy_capacity)
+        wasted += buffered - energy if buffered > energy else 0.0
+    return heat, hot, steam, energy, produced, wasted
+
+
+def _close(a: float, b: float) -> bool:
+    return abs(a - b) <= 1e-9 * max(1.0, abs(a), abs(b))
+
+
+def _signature(guards: List[Tuple[float, ...]]) -> Tuple[int, ...]:
+    return tuple(limits.index(min(limits)) for limits in guards)
+
+
+def _linear_ticks(previous: List, current: List) -> float:
+    """Further ticks during which every min keeps its current choice, given two
+    consecutive ticks of guards whose arguments change linearly.
+    """
+    ticks = float("inf")
+    for before, after in zip(previous, current):
+        active = after.index(min(after))
+        active_slope = after[active] - before[active]
+        for i, limit in enumerate(after):
+            closing = (limit - before[i]) - active_slope
+            if i != active and closing < 0 and not _close(closing, 0.0):
+                ticks = min(ticks, (limit - after[active]) / -closing)
+    return ticks
+
+
+def _record(result: SimulationResult, state: State, tick: int, chain: _Chain, overheat_heat: float) -> None:
+    heat, hot, steam = state[:3]
+    result.max_temperature = max(result.max_temperature, CONST["AMBIENT_TEMPERATURE"] + heat / chain.heat_capacity)
+    result.max_steam = max(result.max_steam, steam)
+    result.max_heated_coolant = max(result.max_heated_coolant, hot)
+    if result.overheat_tick is None and heat >= overheat_heat:
+        result.overheat_tick = tick
+    if result.steam_full_tick is None and steam >= chain.steam_capacity and not _close(chain.steam_capacity, 0.0):
+        result.steam_full_tick = tick
+
+# ---------- Core Functions ----------
+
+def simulate(
+    reactor: FissionReactor,
+    turbine: Turbine,
+    scenario: Sequence[Segment],
+    boiler: Optional[Boiler] = None,
+    stop_on_overheat: bool = True,
+) -> SimulationResult:
+    """Run a scenario on a water-cooled plant, or a sodium-cooled one when a boiler is given.
+    The reactor starts cold, with empty tanks and an empty turbine energy buffer.
+    """
+    chain = _chain(reactor, turbine, boiler)
+    overheat_heat = (CONST["MAX_TEMPERATURE"] - CONST["AMBIENT_TEMPERATURE"]) * chain.heat_capacity
+    state: State = (0.0, 0.0, 0.0, 0.0, 0.0, 0.0)
+    result = SimulationResult(max_temperature=CONST["AMBIENT_TEMPERATURE"])
+    tick = 0
+
+    for segment in scenario:
+        if segment.burn_rate < 0 or (segment.end_burn_rate or 0) < 0:
+            raise ValueError("Burn rates cannot be negative.")
+        ticks = int(round(segment.seconds * CONST["TICKS_PER_SECOND"]))
+        ramp = segment.end_burn_rate is not None and segment.end_burn_rate != segment.burn_rate
+        history: List[Tuple[State, List]] = []  # last ticks, to spot a constant delta
+        done = 0
+        while done < ticks:
+            burn_rate = segment.burn_rate
+            if ramp:
+                burn_rate += (segment.end_burn_rate - segment.burn_rate) * (done + 1) / ticks
+            guards: List = []
+            new_state = _step(state, chain, burn_rate, segment.turbine_online, segment.load, guards)
+            done += 1
+            tick += 1
+            result.steps += 1
+            _record(result, new_state, tick, chain, overheat_heat)
+            if stop_on_overheat and result.overheat_tick is not None:
+                state = new_state
+                break
+
+            history.append((state, guards))
+            state = new_state
+            if ramp or len(history) < 2:
+                continue
+            (s0, g0), (s1, g1) = history[-2:]
+            delta = [b - a for a, b in zip(s1, state)]
+            if _signature(g0) != _signature(g1) or not all(
+                _close(d, b - a) for d, a, b in zip(delta, s0, s1)
+            ):
+                history = history[-1:]
+                continue
+
+            # Same delta twice under the same limits: it repeats until a limit switches
+            jump = min(_linear_ticks(g0, g1) - 1, ticks - done)
+            heat_rate = delta[0]
+            if result.overheat_tick is None and heat_rate > 0:
+                to_overheat = -(-(overheat_heat - state[0]) // heat_rate)
+                if to_overheat <= jump:
+                    result.overheat_tick = tick + int(to_overheat)
+                    if stop_on_overheat:
+                        jump = to_overheat
+            jump = int(jump)
+            if jump > 0:
+                state = tuple(v + d * jump for v, d in zip(state, delta))
+                done += jump
+                tick += jump
+                _record(result, state, tick, chain, overheat_heat)
+            history = []
+            if stop_on_overheat and result.overheat_tick is not None:
+                break
+
+        energy = state[3]
+        result.samples.append((tick, CONST["AMBIENT_TEMPERATURE"] + state[0] / chain.heat_capacity, state[2], energy))
+        if stop_on_overheat and result.overheat_tick is not None:
+            break
+
+    result.ticks = tick
+    result.temperature = CONST["AMBIENT_TEMPERATURE"] + state[0] / chain.heat_capacity
+    result.energy_produced = state[4]
+    result.energy_wasted = state[5]
+    return result
+
+
+def simulate_many(
+    plants: Iterable[Tuple[FissionReactor, Turbine, Optional[Boiler]]],
+    scenario: Sequence[Segment],
+    stop_on_overheat: bool = True,
+) -> List[SimulationResult]:
+    """Run one scenario on many (reactor, turbine, boiler or None) designs."""
+    return [simulate(reactor, turbine, scenario, boiler, stop_on_overheat) for reactor, turbine, boiler in plants]
+
+
+def startup_scenario(burn_rate: float, ramp_seconds: float = 60, hold_seconds: float = 3600) -> List[Segment]:
+    """Ramp a cold reactor up to burn_rate, then hold it."""
+    return [
+        Segment(ramp_seconds, 0.0, end_burn_rate=burn_rate),
+        Segment(hold_seconds, burn_rate),
+    ]
+
+
+def turbine_trip_scenario(burn_rate: float, run_seconds: float = 600, trip_seconds: float = 600) -> List[Segment]:
+    """Run at burn_rate, then lose the turbine while the reactor keeps burning."""
+    return [
+        Segment(run_seconds, burn_rate),
+        Segment(trip_seconds, burn_rate, turbine_online=False),
+    ]
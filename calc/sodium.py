@@ -0,0 +1,157 @@
+from dataclasses import asdict, dataclass, field, replace
+from functools import lru_cache
+from math import ceil
+from typing import Iterable, Optional, Tuple
+from calc.constants import CONST
+from calc.boiler import Boiler, boiler_with_dimensions_for_flow
+from calc.boiler_grid import boiler_geometry_max_flows
+from calc.candidates import CandidateBatch
+from calc.reactor import FissionReactor, fuel_assemblies_dimensions, optimal_fission_with_dimensions
+from calc.turbine import Turbine
+from calc.turbine_grid import turbine_catalogue
+
+# Joint sizing of a sodium-cooled plant: reactor -> boiler -> turbine.
+# The plant with the fewest blocks wins. Candidates are visited smallest first
+# and a branch is dropped as soon as its block count, plus the smallest
+# possible remaining parts, cannot beat the best plant found so far.
+
+@dataclass
+class SodiumPlant:
+    reactor: FissionReactor = field(default_factory=FissionReactor)
+    boiler: Boiler = field(default_factory=Boiler)
+    turbine: Turbine = field(default_factory=Turbine)
+    sodium_flow: int = 0  # mB/t of heated sodium from the reactor
+    steam_flow: int = 0   # mB/t of steam from the boiler
+    block_count: int = 0  # blocks of the three bounding boxes
+
+    def plant_print(self) -> None:
+        print(f"A {self.block_count} blocks Sodium-cooled plant")
+        print(f"- Heated Sodium {self.sodium_flow} mB/t, Steam {self.steam_flow} mB/t\n")
+        self.reactor.fission_print()
+        print()
+        self.boiler.boiler_print()
+        print()
+        self.turbine.turbine_print()
+
+    def summarize(self) -> str:
+        return f"{self.reactor.summarize()}, {self.boiler.summarize()}, {self.turbine.summarize()}"
+
+# ---------- Utility Functions ----------
+
+def sodium_flow(fuel_assemblies: int) -> int:
+    """Heated sodium produced by a reactor burning all its assemblies."""
+    return fuel_assemblies * CONST["FISSION_SODIUM_HEATED_PER_FUEL"]
+
+
+def sodium_steam_flow(fuel_assemblies: int) -> int:
+    """Steam produced by the boilers from that heated sodium."""
+    return sodium_flow(fuel_assemblies) // CONST["SODIUM_TO_STEAM_RATIO"]
+
+
+@lru_cache(maxsize=None)
+def _reactor_candidates() -> CandidateBatch:
+    """Every reactor geometry with fuel as columns, smallest block count first.
+    Same rows as optimal_fission_with_dimensions over the whole range.
+    """
+    geometries = sorted(
+        (
+            (x, z, y)
+            for x in range(CONST["MIN_REACTOR_BASE"], CONST["MAX_REACTOR_BASE"] + 1)
+            for z in range(CONST["MIN_REACTOR_BASE"], CONST["MAX_REACTOR_BASE"] + 1)
+            for y in range(CONST["MIN_REACTOR_HEIGHT"], CONST["MAX_REACTOR_HEIGHT"] + 1)
+        ),
+        key=lambda g: g[0] * g[1] * g[2],
+    )
+    rows = [(g, fuel_assemblies_dimensions(*g)) for g in geometries]
+    rows = [row for row in rows if row[1][0] > 0]
+    xs, zs, ys = zip(*(g for g, _ in rows))
+    fuel_assemblies, control_rods = zip(*(counts for _, counts in rows))
+    return CandidateBatch.from_columns(
+        FissionReactor,
+        x=xs,
+        z=zs,
+        y=ys,
+        fuel_assemblies=fuel_assemblies,
+        control_rods=control_rods,
+        water_burn_rate=[f * CONST["FISSION_STEAM_PER_FUEL"] for f in fuel_assemblies],
+    )
+
+
+@lru_cache(maxsize=None)
+def _boiler_candidates() -> Tuple[Tuple[int, int, int, int, int], ...]:
+    """(block count, max steam flow, x, z, y) for every sodium boiler geometry, smallest first."""
+    return tuple(boiler_geometry_max_flows("sodium"))
+
+
+@lru_cache(maxsize=None)
+def _turbine_candidates() -> Tuple[Tuple[int, int, Turbine], ...]:
+    """(block count, supported flow, turbine) for the best turbine of every size, smallest first."""
+    candidates = [
+        (t.x_z * t.x_z * t.y, min(t.max_flow, t.max_water_output), t) for t in turbine_catalogue()
+    ]
+    candidates.sort(key=lambda c: c[0])
+    return tuple(candidates)
+
+
+def _best_plant(reactors: CandidateBatch, rows: Iterable[int]) -> SodiumPlant:
+    """Branch-and-bound over reactor rows (smallest first), then turbines, then boilers."""
+    xs, zs, ys = reactors.column("x"), reactors.column("z"), reactors.column("y")
+    fuel = reactors.column("fuel_assemblies")
+    boilers = _boiler_candidates()
+    turbines = _turbine_candidates()
+    min_boiler_blocks = boilers[0][0]
+    min_turbine_blocks = turbines[0][0]
+
+    best: Optional[SodiumPlant] = None
+    best_blocks = float("inf")
+    for row in rows:
+        reactor_blocks = xs[row] * zs[row] * ys[row]
+        if reactor_blocks + min_boiler_blocks + min_turbine_blocks >= best_blocks:
+            break  # every later reactor is at least as large
+        steam_flow = sodium_steam_flow(fuel[row])
+
+        turbine = None
+        for turbine_blocks, supported_flow, candidate in turbines:
+            if reactor_blocks + min_boiler_blocks + turbine_blocks >= best_blocks:
+                break
+            if supported_flow >= steam_flow:
+                turbine = candidate
+                break
+        if turbine is None:
+            continue
+
+        for boiler_blocks, max_flow, x, z, y in boilers:
+            if reactor_blocks + boiler_blocks + turbine_blocks >= best_blocks:
+                break
+            if max_flow >= steam_flow:
+                best_blocks = reactor_blocks + boiler_blocks + turbine_blocks
+                best = SodiumPlant(
+                    reactor=reactors.materialize(row),
+                    boiler=boiler_with_dimensions_for_flow(x, z, y, steam_flow),
+                    turbine=replace(turbine),
+                    sodium_flow=sodium_flow(fuel[row]),
+                    steam_flow=steam_flow,
+                    block_count=best_blocks,
+                )
+                break
+
+    if best is None:
+        raise ValueError("No sodium-cooled plant can carry this flow with a single boiler and turbine.")
+    return best
+
+# ---------- Core Functions ----------
+
+def sodium_plant_for_flow(max_flow: int) -> SodiumPlant:
+    """Smallest sodium-cooled plant producing at least max_flow mB/t of steam."""
+    steam_per_fuel = sodium_steam_flow(1)
+    fuel_assemblies = int(ceil(max_flow / steam_per_fuel))
+    reactors = _reactor_candidates()
+    fuel = reactors.column("fuel_assemblies")
+    return _best_plant(reactors, (row for row in range(len(reactors)) if fuel[row] >= fuel_assemblies))
+
+
+def sodium_plant_with_dimensions(x: int, z: int, y: int) -> SodiumPlant:
+    """Smallest boiler and turbine for a sodium-cooled reactor of given dimensions."""
+    reactors = CandidateBatch(FissionReactor)
+    reactors.append(**asdict(optimal_fission_with_dimensions(x, z, y)))
+    return _best_plant(reactors, [0])
@@ -0,0 +1,245 @@
+import inspect
+import json
+import os
+import sqlite3
+import threading
+from dataclasses import asdict, fields
+from functools import lru_cache
+from time import time_ns
+from typing import Any, Callable, Dict, Optional, Tuple, get_args, get_origin, get_type_hints
+from calc.boiler import Boiler
+from calc.constants import constants_hash
+from calc.farm import TurbineFarm, turbine_farm_for_flow
+from calc.reactor import FissionReactor
+from calc.sodium import SodiumPlant, sodium_plant_for_flow, sodium_plant_with_dimensions
+from calc.turbine import Turbine, optimal_turbine_with_dimensions, turbine_based_on_fission_reactor
+
+# Persistent results of the sizing functions in a SQLite file shared by every
+# process. A row is keyed by the function, its arguments bound to the signature
+# (so positional, keyword and default arguments give the same key) and the hash
+# of CONST, so changing a constant simply stops matching the old rows. Values
+# keep their JSON type in the key (400000 and 400000.0 are different rows) and
+# results come back with the exact types and values that were stored; only
+# equivalent arguments (vent search modes) share a key. "No valid configuration"
+# answers are stored too and raised again as ValueError.
+#
+# Only the expensive searches go through the store (turbines, farms and sodium
+# plants): the reactor functions answer in a few microseconds, faster than a
+# store hit.
+#
+# The database runs in WAL mode with a busy timeout so several workers can read
+# and write at once. Rows remember when they were last used, to within
+# _TOUCH_AFTER_NS so that most hits stay read-only, and the least recently used
+# ones are deleted once the table grows past max_rows.
+
+DEFAULT_STORE_PATH = os.path.join(os.path.dirname(__file__), "results.sqlite3")
+
+_RECORD_TYPES = {
+    record_type.__name__: record_type
+    for record_type in (Turbine, FissionReactor, Boiler, TurbineFarm, SodiumPlant)
+}
+
+_EVICT_EVERY = 64  # inserts between two eviction passes of a process
+
+_TOUCH_AFTER_NS = 60 * 10**9  # a hit refreshes last_used only once it is this old
+
+# Argument values giving the same result as another value, replaced before keying
+_EQUIVALENT_ARGUMENTS: Dict[Callable, Dict[str, Dict[Any, Any]]] = {
+    optimal_turbine_with_dimensions: {"vent_mode": {"scan": "closed_form"}},
+}
+
+# ---------- Utility Functions ----------
+
+_signature = lru_cache(maxsize=None)(inspect.signature)
+
+def store_key(function: Callable, args: Tuple, kwargs: Dict[str, Any]) -> str:
+    """function | arguments by name, defaults applied | constants hash."""
+    bound = _signature(function).bind(*args, **kwargs)
+    bound.apply_defaults()
+    equivalent = _EQUIVALENT_ARGUMENTS.get(function, {})
+    arguments = {}
+    for name, value in bound.arguments.items():
+        if isinstance(value, str):
+            value = equivalent.get(name, {}).get(value, value)
+        arguments[name] = value
+    arguments = json.dumps(arguments, sort_keys=True, separators=(",", ":"))
+    return f"{function.__module__}.{function.__qualname__}|{arguments}|{constants_hash()}"
+
+
+def _encode(result: Any) -> str:
+    return json.dumps({"type": type(result).__name__, "fields": asdict(result)}, separators=(",", ":"))
+
+
+@lru_cache(maxsize=None)
+def _record_fields(record_type: type) -> Dict[str, Tuple[Optional[type], bool]]:
+    """Per field: (record type it holds, whether it is a list of them)."""
+    hints = get_type_hints(record_type)
+    nested = {}
+    for f in fields(record_type):
+        hint = hints[f.name]
+        if get_origin(hint) is list and get_args(hint)[0] in _RECORD_TYPES.values():
+            nested[f.name] = (get_args(hint)[0], True)
+        elif hint in _RECORD_TYPES.values():
+            nested[f.name] = (hint, False)
+    return nested
+
+
+def _record(record_type: type, data: Dict[str, Any]) -> Any:
+    """Inverse of asdict for the record types, nested records included."""
+    for name, (nested_type, many) in _record_fields(record_type).items():
+        if many:
+            data[name] = [_record(nested_type, item) for item in data[name]]
+        else:
+            data[name] = _record(nested_type, data[name])
+    return record_type(**data)
+
+
+def _decode(value: str) -> Any:
+    data = json.loads(value)
+    return _record(_RECORD_TYPES[data["type"]], data["fields"])
+
+
+class ResultStore:
+    """SQLite-backed cache of sizing results, safe to share between processes and threads."""
+
+    def __init__(self, path: str = DEFAULT_STORE_PATH, max_rows: int = 100_000, timeout: float = 30.0):
+        if max_rows < 1:
+            raise ValueError("max_rows must be at least 1")
+        self.path = path
+        self.max_rows = max_rows
+        self.timeout = timeout
+        self.hits = 0
+        self.misses = 0
+        self._local = threading.local()
+        self._inserts = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite3 connections must not cross a fork or be shared between threads
+        local = self._local
+        if getattr(local, "pid", None) != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(f"PRAGMA busy_timeout={int(self.timeout * 1000)}")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, error INTEGER NOT NULL, last_used INTEGER NOT NULL)"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used)")
+            local.connection = connection
+            local.pid = os.getpid()
+        return local.connection
+
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def get(self, key: str) -> Optional[Tuple[str, bool]]:
+        """(stored value, is an error message) for a key, marking it as recently used.
+        The mark is only written when the last one is older than _TOUCH_AFTER_NS.
+        """
+        connection = self._connection()
+        row = connection.execute("SELECT value, error, last_used FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        now = time_ns()
+        if now - row[2] > _TOUCH_AFTER_NS:
+            connection.execute("UPDATE results SET last_used = ? WHERE key = ?", (now, key))
+        return row[0], bool(row[1])
+
+    def put(self, key: str, value: str, error: bool = False) -> None:
+        self._connection().execute(
+            "INSERT OR REPLACE INTO results (key, value, error, last_used) VALUES (?, ?, ?, ?)",
+            (key, value, int(error), time_ns()),
+        )
+        self._inserts += 1
+        if self._inserts % _EVICT_EVERY == 0:
+            self.evict()
+
+    def evict(self) -> int:
+        """Delete the least recently used rows beyond max_rows; returns how many were deleted."""
+        cursor = self._connection().execute(
+            "DELETE FROM results WHERE key IN ("
+            "SELECT key FROM results ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+            (self.max_rows,),
+        )
+        return cursor.rowcount
+
+    def clear(self) -> None:
+        self._connection().execute("DELETE FROM results")
+
+    def close(self) -> None:
+        """Close the connection of the calling thread."""
+        connection = getattr(self._local, "connection", None)
+        if connection is not None and self._local.pid == os.getpid():
+            connection.close()
+        self._local = threading.local()
+
+    def call(self, function: Callable, *args, **kwargs) -> Any:
+        """function(*args, **kwargs), answered from the store when possible."""
+        key = store_key(function, args, kwargs)
+        stored = self.get(key)
+        if stored is not None:
+            self.hits += 1
+            value, error = stored
+            if error:
+                raise ValueError(value)
+            return _decode(value)
+        self.misses += 1
+        try:
+            result = function(*args, **kwargs)
+        except ValueError as failure:
+            self.put(key, str(failure), error=True)
+            raise
+        self.put(key, _encode(result))
+        return result
+
+
+_default_store: Optional[ResultStore] = None
+
+
+def default_store() -> ResultStore:
+    """Store at DEFAULT_STORE_PATH, opened on first use."""
+    global _default_store
+    if _default_store is None:
+        _default_store = ResultStore(DEFAULT_STORE_PATH)
+    return _default_store
+
+
+def set_default_store(path: str, max_rows: int = 100_000) -> ResultStore:
+    global _default_store
+    if _default_store is not None:
+        _default_store.close()
+    _default_store = ResultStore(path, max_rows)
+    return _default_store
+
+# ---------- Core Functions ----------
+
+def turbine_based_on_fission_reactor_stored(water_burn_rate) -> Turbine:
+    """turbine_based_on_fission_reactor through the default store."""
+    return default_store().call(turbine_based_on_fission_reactor, water_burn_rate)
+
+
+def optimal_turbine_with_dimensions_stored(x_z: int, y: int, vent_mode: str = "scan") -> Turbine:
+    """optimal_turbine_with_dimensions through the default store."""
+    return default_store().call(optimal_turbine_with_dimensions, x_z, y, vent_mode)
+
+
+def turbine_farm_for_flow_stored(
+    steam_flow: int,
+    max_turbines: int = 16,
+    objective: str = "blocks",
+    identical: bool = False,
+    bucket: Optional[int] = None,
+) -> TurbineFarm:
+    """turbine_farm_for_flow through the default store."""
+    return default_store().call(turbine_farm_for_flow, steam_flow, max_turbines, objective, identical, bucket)
+
+
+def sodium_plant_for_flow_stored(max_flow: int) -> SodiumPlant:
+    """sodium_plant_for_flow through the default store."""
+    return default_store().call(sodium_plant_for_flow, max_flow)
+
+
+def sodium_plant_with_dimensions_stored(x: int, z: int, y: int) -> SodiumPlant:
+    """sodium_plant_with_dimensions through the default store."""
+    return default_store().call(sodium_plant_with_dimensions, x, z, y)
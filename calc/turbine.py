@@ -1,9 +1,11 @@
 from dataclasses import dataclass
-from typing import Tuple, List, Optional
+from typing import Tuple, List, Optional, Sequence
 from math import ceil
 from calc.constants import CONST
+from calc import profiling
+from calc.pareto import Objective, TURBINE_OBJECTIVES, pareto_front
 
-@dataclass
+@dataclass(slots=True)
 class Turbine:
     x_z: int = 0
     y: int = 0
@@ -103,27 +105,67 @@ def min_height(shaft_height: int, coils: int, condensers: int, x_z: int, vents:
         side_area = upper_y * (x_z - 2) * 4
         top_area = (x_z - 2) ** 2
         if (side_area + top_area) >= vents:
+            if profiling.ENABLED:
+                profiling.count("min_height.iterations", y - shaft_height - 2)
             return y  
+    if profiling.ENABLED:
+        profiling.count("min_height.iterations", max(CONST["TURBINE_MAX_HEIGHT"] - shaft_height - 2, 0))
     return 0
 
-def best_vent_count(turbine: Turbine) -> Tuple[int, float]:
-    """Find vent count giving best energy output for given turbine geometry."""
+def best_vent_count(turbine: Turbine, mode: str = "scan") -> Tuple[int, float]:
+    """Find vent count giving best energy output for given turbine geometry.
+    mode "scan" tries every vent count, "closed_form" jumps to the breakpoint.
+    """
+    return _vent_search(turbine.x_z, turbine.y, turbine.shaft_height, turbine.blades, turbine.coils, mode)
+
+def _vent_search(x_z: int, y: int, shaft_height: int, blades: int, coils: int, mode: str = "scan") -> Tuple[int, float]:
+    """best_vent_count on plain numbers, so searches need no Turbine per candidate."""
+    if mode == "closed_form":
+        if profiling.ENABLED:
+            profiling.count("best_vent_count.iterations")
+        return _best_vent_count_closed_form(x_z, y, shaft_height, blades, coils)
+    if mode != "scan":
+        raise ValueError(f"Unknown vent search mode '{mode}' (expected 'scan' or 'closed_form')")
+
     best_vent_count = 0
     best_energy_production = 0.0
+    vent_limit = max_vents(x_z, y, shaft_height)
+    if profiling.ENABLED:
+        profiling.count("best_vent_count.iterations", max(vent_limit, 0))
     
-    for vent_count in range(1, max_vents(turbine.x_z, turbine.y, turbine.shaft_height) + 1):
-        max_flow = max_flow_rate(turbine.x_z, turbine.shaft_height, vent_count)
-        condensers = optimal_condensers(turbine.x_z, turbine.y, turbine.shaft_height, turbine.coils, max_flow)
+    for vent_count in range(1, vent_limit + 1):
+        max_flow = max_flow_rate(x_z, shaft_height, vent_count)
+        condensers = optimal_condensers(x_z, y, shaft_height, coils, max_flow)
         if condensers < 0:
             continue
         
-        energy_prod = max_energy_prod(turbine.blades, turbine.coils, turbine.x_z, turbine.shaft_height, vent_count)
+        energy_prod = max_energy_prod(blades, coils, x_z, shaft_height, vent_count)
         if energy_prod > best_energy_production:
             best_energy_production = energy_prod
             best_vent_count = vent_count
     
     return best_vent_count, best_energy_production
 
+def _best_vent_count_closed_form(x_z: int, y: int, shaft_height: int, blades: int, coils: int) -> Tuple[int, float]:
+    """Same result as the scan in O(1).
+    Energy grows with vents until the vent flow reaches the tank flow, then stays flat,
+    so the first best vent count is that breakpoint (capped by the vents that fit).
+    Condensers only disqualify a geometry when there is no space left for them.
+    """
+    vent_limit = max_vents(x_z, y, shaft_height)
+    if vent_limit < 1:
+        return 0, 0.0
+    available_space = ((y - 3) - shaft_height) * (x_z - 2) ** 2 - coils
+    if available_space < 0:
+        return 0, 0.0
+
+    tank_flow = pressure_dispersers(x_z) * CONST["GENERAL_DISPERSER_GAS_FLOW"] * lower_volume(x_z, shaft_height)
+    vent_count = min(max(int(ceil(tank_flow / CONST["GENERAL_VENT_GAS_FLOW"])), 1), vent_limit)
+    energy_prod = max_energy_prod(blades, coils, x_z, shaft_height, vent_count)
+    if energy_prod > 0.0:
+        return vent_count, energy_prod
+    return 0, 0.0
+
 def turbine_size(
     x_z: int,
     y: int,
@@ -150,62 +192,89 @@ def turbine_size(
         max_water_output= max_water_output(condensers)
     )
     
-def turbine_based_on_fission_reactor(water_burn_rate: int) -> Optional[Turbine]:
-    """Return most optimal turbine for given fission reactor water burn rate."""
-    requiered_condensers = ceil(water_burn_rate / CONST["GENERAL_CONDENSER_RATE"])
+def turbine_requirements(water_burn_rate) -> Tuple[int, int]:
+    """Vents and condensers the reactor-based search asks for this water burn rate."""
     vents = ceil(water_burn_rate / CONST["GENERAL_VENT_GAS_FLOW"])
+    requiered_condensers = ceil(water_burn_rate / CONST["GENERAL_CONDENSER_RATE"])
+    return vents, requiered_condensers
+
+def reactor_turbine_candidates(vents: int, requiered_condensers: int) -> List[Turbine]:
+    """Every turbine the reactor-based search considers for these vents and condensers, in search order."""
     all_turbines: List[Turbine] = []
     
-    for length in range(5, 18, 2):
-        dispersers = pressure_dispersers(length)
-        max_shaft_height = min(2 * length - 5, CONST["TURBINE_MAX_ROTOR_HEIGHT"])
+    with profiling.stage("turbine_based_on_fission_reactor.enumerate"):
+        for length in range(5, 18, 2):
+            dispersers = pressure_dispersers(length)
+            max_shaft_height = min(2 * length - 5, CONST["TURBINE_MAX_ROTOR_HEIGHT"])
         
-        for shaft_height in range(1, max_shaft_height):
-            blades = shaft_height * 2
-            coils = coils_needed(blades)
-            
-            t = Turbine(
-                x_z= length,
-                shaft_height = shaft_height,
-                dispersers= dispersers,
-                blades= blades,
-                coils= coils,
-                vents= vents
-            )
-            t.y = min_height(shaft_height, coils, requiered_condensers, length, vents)
-            t.max_production = max_energy_prod(blades, coils, length, shaft_height, vents)
-            t.max_flow = max_flow_rate(length, shaft_height, vents)
-            t.condensers = optimal_condensers(length, t.y, shaft_height, coils, t.max_flow)
-            t.max_water_output = max_water_output(t.condensers)
-            t.capacity = energy_capacity(length, t.y)
-            t.tank_volume = lower_volume(length, shaft_height)
-            all_turbines.append(t)
+            for shaft_height in range(1, max_shaft_height):
+                blades = shaft_height * 2
+                coils = coils_needed(blades)
+                
+                t = Turbine(
+                    x_z= length,
+                    shaft_height = shaft_height,
+                    dispersers= dispersers,
+                    blades= blades,
+                    coils= coils,
+                    vents= vents
+                )
+                t.y = min_height(shaft_height, coils, requiered_condensers, length, vents)
+                t.max_production = max_energy_prod(blades, coils, length, shaft_height, vents)
+                t.max_flow = max_flow_rate(length, shaft_height, vents)
+                t.condensers = optimal_condensers(length, t.y, shaft_height, coils, t.max_flow)
+                t.max_water_output = max_water_output(t.condensers)
+                t.capacity = energy_capacity(length, t.y)
+                t.tank_volume = lower_volume(length, shaft_height)
+                all_turbines.append(t)
+    return all_turbines
+
+def valid_turbines_for_fission_reactor(water_burn_rate: int) -> List[Turbine]:
+    """Every candidate turbine able to carry the given water burn rate, in search order."""
+    vents, requiered_condensers = turbine_requirements(water_burn_rate)
+    all_turbines = reactor_turbine_candidates(vents, requiered_condensers)
     
     # Filter only valid turbines
-    valid = [
-        t for t in all_turbines
-        if min(t.max_flow, t.max_water_output) >= water_burn_rate
-        and t.condensers >= requiered_condensers
-    ]
-    
+    with profiling.stage("turbine_based_on_fission_reactor.filter"):
+        valid = [
+            t for t in all_turbines
+            if min(t.max_flow, t.max_water_output) >= water_burn_rate
+            and t.condensers >= requiered_condensers
+        ]
+    if profiling.ENABLED:
+        profiling.count("turbine_based_on_fission_reactor.candidates", len(all_turbines))
+        profiling.count("turbine_based_on_fission_reactor.passed", len(valid))
+        profiling.count("turbine_based_on_fission_reactor.failed_flow", sum(
+            1 for t in all_turbines if min(t.max_flow, t.max_water_output) < water_burn_rate
+        ))
+        profiling.count("turbine_based_on_fission_reactor.failed_condensers", sum(
+            1 for t in all_turbines if t.condensers < requiered_condensers
+        ))
+    return valid
+
+def turbine_based_on_fission_reactor(water_burn_rate: int) -> Optional[Turbine]:
+    """Return most optimal turbine for given fission reactor water burn rate."""
+    valid = valid_turbines_for_fission_reactor(water_burn_rate)
     if not valid:
         raise ValueError("No valid turbine configuration found for the given water burn rate.")
     
-    # Remove inefficient turbines
-    final_list = []
-    for t in valid:
-        keep = True
-        for other in valid:
-            if t.x_z == other.x_z and t.max_production < other.max_production:
-                keep = False
-                break
-            if keep:
-                final_list.append(t)
-
-    return max(final_list, key=lambda t: t.max_production)
-
-def optimal_turbine_with_dimensions(x_z: int, y: int) -> Turbine :
-    """Returns most optimal turbine for given dimensions."""
+    # First turbine with the highest production wins ties
+    with profiling.stage("turbine_based_on_fission_reactor.select"):
+        return max(valid, key=lambda t: t.max_production)
+
+def turbine_options_for_fission_reactor(water_burn_rate: int, objectives: Optional[Sequence[Objective]] = None) -> List[Turbine]:
+    """Return the non-dominated turbines for given water burn rate.
+    Defaults to power, block count, water output and footprint (see calc.pareto).
+    """
+    valid = valid_turbines_for_fission_reactor(water_burn_rate)
+    if not valid:
+        raise ValueError("No valid turbine configuration found for the given water burn rate.")
+    return pareto_front(valid, objectives or TURBINE_OBJECTIVES)
+
+def optimal_turbine_with_dimensions(x_z: int, y: int, vent_mode: str = "scan") -> Turbine :
+    """Returns most optimal turbine for given dimensions.
+    vent_mode is passed to best_vent_count.
+    """
     if x_z < CONST["TURBINE_MIN_BASE"] or x_z > CONST["TURBINE_MAX_BASE"]:
         raise ValueError(f"Turbine base {x_z} out of bounds ({CONST['TURBINE_MIN_BASE']}-{CONST['TURBINE_MAX_BASE']})")
     if y < CONST["TURBINE_MIN_HEIGHT"] or y > CONST["TURBINE_MAX_HEIGHT"]:
@@ -213,20 +282,22 @@ def optimal_turbine_with_dimensions(x_z: int, y: int) -> Turbine :
     if x_z % 2 == 0:
         raise ValueError("Turbine length cannot be even (shaft must be centered).")
     
+    max_shaft_height = min(2 * x_z - 5, CONST["TURBINE_MAX_ROTOR_HEIGHT"])
+    if profiling.ENABLED:
+        profiling.count("optimal_turbine_with_dimensions.candidates", max(max_shaft_height - 1, 0))
     best_turbine = None
     best_energy = 0.0
 
-    for shaft_height in range(1, min(2 * y - CONST["TURBINE_MIN_ROTOR_HEIGHT"], CONST["TURBINE_MAX_ROTOR_HEIGHT"])):
+    for shaft_height in range(1, max_shaft_height):
         blades = shaft_height * 2
         coils = coils_needed(blades)
         
-        tmp = Turbine(x_z=x_z, y=y, shaft_height=shaft_height, blades=blades, coils=coils)
-        vent_count, energy_prod = best_vent_count(tmp)
-        max_flow = max_flow_rate(x_z, shaft_height, vent_count)
-        condensers = optimal_condensers(x_z, y, shaft_height, coils, max_flow)
-        water_output = max_water_output(condensers)
+        vent_count, energy_prod = _vent_search(x_z, y, shaft_height, blades, coils, vent_mode)
         
+        # First shaft height with the highest production wins ties
         if energy_prod > best_energy:
+            max_flow = max_flow_rate(x_z, shaft_height, vent_count)
+            condensers = optimal_condensers(x_z, y, shaft_height, coils, max_flow)
             best_energy = energy_prod
             best_turbine = Turbine(
                 x_z= x_z,
@@ -240,10 +311,10 @@ def optimal_turbine_with_dimensions(x_z: int, y: int) -> Turbine :
                 capacity= energy_capacity(x_z, y),
                 max_flow= max_flow,
                 tank_volume= lower_volume(x_z, shaft_height),
-                max_water_output= water_output,
+                max_water_output= max_water_output(condensers),
                 max_production= energy_prod
             )
             
     if not best_turbine:
         raise ValueError("No valid turbine configuration found for the given dimensions.")
-    return best_turbine
\ No newline at end of file
+    return best_turbine
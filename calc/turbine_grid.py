@@ -0,0 +1,165 @@
+from math import ceil
+from typing import Dict, Iterable, List, Optional, Tuple
+from calc.constants import CONST, constants_cache
+from calc.turbine import (
+    Turbine, pressure_dispersers, coils_needed, lower_volume, blade_rate, energy_capacity,
+    optimal_turbine_with_dimensions, turbine_requirements,
+)
+
+# Column-wise evaluation of the turbine design grid searched by
+# turbine_based_on_fission_reactor. Every (length, shaft_height) candidate is a
+# row, every derived quantity is a column, and only the winning row is turned
+# into a Turbine. Results are identical to the scalar search.
+
+GridColumns = Dict[str, List]
+
+# ---------- Utility Functions ----------
+
+@constants_cache
+def _static_grid() -> Tuple[Tuple, ...]:
+    """Rows that do not depend on the burn rate, in the scalar search order."""
+    rows = []
+    for length in range(5, 18, 2):
+        dispersers = pressure_dispersers(length)
+        inner_area = (length - 2) ** 2
+        max_shaft_height = min(2 * length - 5, CONST["TURBINE_MAX_ROTOR_HEIGHT"])
+
+        for shaft_height in range(1, max_shaft_height):
+            blades = shaft_height * 2
+            coils = coils_needed(blades)
+            tank_volume = lower_volume(length, shaft_height)
+            tank_flow = dispersers * CONST["GENERAL_DISPERSER_GAS_FLOW"] * tank_volume
+            energy_per_flow = CONST["MAX_ENERGY_PER_STEAM"] * blade_rate(blades, coils)
+            rows.append((
+                length, shaft_height, dispersers, blades, coils, tank_volume,
+                tank_flow, energy_per_flow, inner_area, (length - 2) * 4,
+            ))
+    return tuple(rows)
+
+
+def _min_heights(rows: Tuple[Tuple, ...], condensers: int, vents: int) -> List[int]:
+    """Closed form of min_height for every row (0 when nothing fits)."""
+    max_height = CONST["TURBINE_MAX_HEIGHT"]
+    heights = []
+    for _, shaft_height, _, _, coils, _, _, _, inner_area, side_per_level in rows:
+        # (upper_y - 1) * inner_area >= coils + condensers
+        needed = coils + condensers
+        upper_y = 1 + -(-needed // inner_area) if needed > 0 else 1
+        # upper_y * side_per_level + inner_area >= vents
+        if vents > inner_area:
+            upper_y = max(upper_y, -(-(vents - inner_area) // side_per_level))
+        y = shaft_height + 2 + upper_y
+        heights.append(y if y <= max_height else 0)
+    return heights
+
+# ---------- Core Functions ----------
+
+def evaluate_turbine_grid(water_burn_rate) -> GridColumns:
+    """Evaluate every candidate of the reactor-based search as columns."""
+    rows = _static_grid()
+    vents, requiered_condensers = turbine_requirements(water_burn_rate)
+    vent_flow = vents * CONST["GENERAL_VENT_GAS_FLOW"]
+    condenser_rate = CONST["GENERAL_CONDENSER_RATE"]
+
+    heights = _min_heights(rows, requiered_condensers, vents)
+    flows = [min(row[6], vent_flow) for row in rows]
+    productions = [row[7] * flow for row, flow in zip(rows, flows)]
+    condensers = [
+        min(int(ceil(flow / condenser_rate)), ((y - 3) - row[1]) * row[8] - row[4])
+        for row, y, flow in zip(rows, heights, flows)
+    ]
+    water_outputs = [c * condenser_rate for c in condensers]
+    valid = [
+        min(flow, water) >= water_burn_rate and c >= requiered_condensers
+        for flow, water, c in zip(flows, water_outputs, condensers)
+    ]
+    return {
+        "x_z": [row[0] for row in rows],
+        "shaft_height": [row[1] for row in rows],
+        "y": heights,
+        "vents": [vents] * len(rows),
+        "max_flow": flows,
+        "max_production": productions,
+        "condensers": condensers,
+        "max_water_output": water_outputs,
+        "valid": valid,
+    }
+
+
+def best_grid_row(columns: GridColumns) -> int:
+    """Index of the first valid row with the highest production, or -1."""
+    best_index = -1
+    best_production = 0.0
+    for index, (production, ok) in enumerate(zip(columns["max_production"], columns["valid"])):
+        if ok and (best_index < 0 or production > best_production):
+            best_index = index
+            best_production = production
+    return best_index
+
+
+def grid_row_turbine(columns: GridColumns, index: int) -> Turbine:
+    """Materialize one grid row as a Turbine."""
+    length, shaft_height, dispersers, blades, coils, tank_volume = _static_grid()[index][:6]
+    y = columns["y"][index]
+    return Turbine(
+        x_z= length,
+        y= y,
+        vents= columns["vents"][index],
+        dispersers= dispersers,
+        condensers= columns["condensers"][index],
+        shaft_height= shaft_height,
+        blades= blades,
+        coils= coils,
+        capacity= energy_capacity(length, y),
+        max_flow= columns["max_flow"][index],
+        tank_volume= tank_volume,
+        max_production= columns["max_production"][index],
+        max_water_output= columns["max_water_output"][index],
+    )
+
+
+def turbine_based_on_fission_reactor_grid(water_burn_rate) -> Turbine:
+    """Grid version of turbine_based_on_fission_reactor, same result."""
+    columns = evaluate_turbine_grid(water_burn_rate)
+    index = best_grid_row(columns)
+    if index < 0:
+        raise ValueError("No valid turbine configuration found for the given water burn rate.")
+    return grid_row_turbine(columns, index)
+
+
+def turbines_based_on_fission_reactors(water_burn_rates: Iterable, allow_missing: bool = False) -> List[Optional[Turbine]]:
+    """Size one turbine per burn rate, sharing the grid across the batch.
+    Burn rates asking for the same vents and condensers reuse one evaluation.
+    With allow_missing, a burn rate no single turbine can carry gives None instead of raising.
+    """
+    by_requirements: Dict[Tuple[int, int], GridColumns] = {}
+    turbines = []
+    for water_burn_rate in water_burn_rates:
+        key = turbine_requirements(water_burn_rate)
+        columns = by_requirements.get(key)
+        if columns is None:
+            columns = by_requirements[key] = evaluate_turbine_grid(water_burn_rate)
+        else:
+            # Only the validity column depends on the exact burn rate
+            columns = dict(columns, valid=[
+                min(flow, water) >= water_burn_rate and c >= key[1]
+                for flow, water, c in zip(columns["max_flow"], columns["max_water_output"], columns["condensers"])
+            ])
+        index = best_grid_row(columns)
+        if index < 0:
+            if allow_missing:
+                turbines.append(None)
+                continue
+            raise ValueError("No valid turbine configuration found for the given water burn rate.")
+        turbines.append(grid_row_turbine(columns, index))
+    return turbines
+
+
+@constants_cache
+def turbine_catalogue() -> Tuple[Turbine, ...]:
+    """Best turbine for every valid (x_z, y), computed once."""
+    return tuple(
+        optimal_turbine_with_dimensions(x_z, y, "closed_form")
+        for x_z in range(CONST["TURBINE_MIN_BASE"], CONST["TURBINE_MAX_BASE"] + 1, 2)
+        for y in range(CONST["TURBINE_MIN_HEIGHT"], CONST["TURBINE_MAX_HEIGHT"] + 1)
+    )
@@ -0,0 +1,265 @@
+import glob
+import mmap
+import os
+import struct
+import sys
+from bisect import bisect_left
+from math import ceil, floor
+from typing import Dict, List, Optional, Tuple
+from calc.constants import CONST, constants_hash, register_cache
+from calc.turbine import (
+    Turbine, turbine_based_on_fission_reactor, reactor_turbine_candidates, turbine_requirements, max_vents,
+)
+
+# Precomputed answers of turbine_based_on_fission_reactor stored in a binary
+# file. The search result only depends on the vents and condensers requested by
+# the burn rate and on which candidates can carry that burn rate, so the table
+# stores, per (vents, condensers) bucket, the winning turbine for every step of
+# supported flow.
+#
+# Default tables live in the user cache directory, one file per constants
+# hash. Opening one marks it as recently used, and building one deletes all but
+# the MAX_DEFAULT_TABLES most recently used.
+
+CACHE_DIR_VARIABLE = "MEKANISM_CALCULATOR_CACHE"  # overrides the cache directory
+MAX_DEFAULT_TABLES = 4
+
+_MAGIC = b"MKTURB02"
+_HEADER = struct.Struct("<8s16sq")  # magic, constants hash, record count
+# vents and condensers of the bucket, supported flow, then the Turbine fields
+_KEY = struct.Struct("<qqq")
+_RECORD = struct.Struct("<qqq11qdq")
+
+# ---------- Utility Functions ----------
+
+def _buckets(vents: int) -> range:
+    """Condenser counts requested by the burn rates that ask for this vent count."""
+    lowest_rate = (vents - 1) * CONST["GENERAL_VENT_GAS_FLOW"]  # excluded
+    highest_rate = vents * CONST["GENERAL_VENT_GAS_FLOW"]
+    return range(
+        int(floor(lowest_rate / CONST["GENERAL_CONDENSER_RATE"])) + 1,
+        int(ceil(highest_rate / CONST["GENERAL_CONDENSER_RATE"])) + 1,
+    )
+
+
+def _bucket_steps(vents: int, condensers: int) -> List[Tuple[int, Turbine]]:
+    """(supported flow, winner) steps for one bucket, ascending by flow.
+    The winner of a step answers every burn rate above the previous step.
+    """
+    candidates = [t for t in reactor_turbine_candidates(vents, condensers) if t.condensers >= condensers]
+    # Burn rates of the bucket are above both of these
+    lowest_flow = max((vents - 1) * CONST["GENERAL_VENT_GAS_FLOW"], (condensers - 1) * CONST["GENERAL_CONDENSER_RATE"])
+    caps = [min(t.max_flow, t.max_water_output) for t in candidates]
+    order = sorted(
+        (i for i, cap in enumerate(caps) if cap > lowest_flow),
+        key=lambda i: caps[i],
+        reverse=True,
+    )
+
+    steps: List[Tuple[int, Turbine]] = []
+    best: Optional[int] = None
+    for position, i in enumerate(order):
+        t = candidates[i]
+        # First candidate in search order wins ties, like max() in the scalar search
+        if best is None or t.max_production > candidates[best].max_production or (
+            t.max_production == candidates[best].max_production and i < best
+        ):
+            best = i
+        last_of_cap = position + 1 == len(order) or caps[order[position + 1]] != caps[i]
+        if last_of_cap:
+            steps.append((caps[i], candidates[best]))
+
+    steps.reverse()
+    merged: List[Tuple[int, Turbine]] = []
+    for cap, winner in steps:
+        if merged and merged[-1][1] is winner:
+            merged[-1] = (cap, winner)
+        else:
+            merged.append((cap, winner))
+    return merged
+
+
+def _pack(vents: int, condensers: int, cap: int, t: Turbine) -> bytes:
+    return _RECORD.pack(
+        vents, condensers, cap, t.x_z, t.y, t.vents, t.dispersers, t.condensers, t.shaft_height,
+        t.blades, t.coils, t.capacity, t.max_flow, t.tank_volume, t.max_production, t.max_water_output,
+    )
+
+
+def _unpack(buffer, offset: int) -> Turbine:
+    fields = _RECORD.unpack_from(buffer, offset)
+    return Turbine(
+        x_z= fields[3],
+        y= fields[4],
+        vents= fields[5],
+        dispersers= fields[6],
+        condensers= fields[7],
+        shaft_height= fields[8],
+        blades= fields[9],
+        coils= fields[10],
+        capacity= fields[11],
+        max_flow= fields[12],
+        tank_volume= fields[13],
+        max_production= fields[14],
+        max_water_output= fields[15],
+    )
+
+# ---------- Core Functions ----------
+
+def build_turbine_table(path: str) -> int:
+    """Enumerate every reactor-based turbine answer and write the table.
+    Returns the number of records. The file is replaced atomically.
+    """
+    max_bucket = max(
+        max_vents(length, CONST["TURBINE_MAX_HEIGHT"], 1) for length in range(5, 18, 2)
+    )
+    records = []
+    for vents in range(0, max_bucket + 1):
+        for condensers in _buckets(vents):
+            for cap, winner in _bucket_steps(vents, condensers):
+                records.append(_pack(vents, condensers, cap, winner))
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, constants_hash().encode(), len(records)))
+        f.writelines(records)
+    os.replace(tmp_path, path)
+    return len(records)
+
+
+class _Keys:
+    """Read-only (vents, condensers, supported flow) view over the records, for bisect."""
+
+    def __init__(self, buffer, count: int):
+        self.buffer = buffer
+        self.count = count
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, index: int) -> Tuple[int, int, int]:
+        return _KEY.unpack_from(self.buffer, _HEADER.size + index * _RECORD.size)
+
+
+class TurbineTable:
+    """Memory-mapped turbine table. Pages are shared between processes."""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, digest, count = _HEADER.unpack_from(self._map, 0)
+        if magic != _MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a turbine table.")
+        if digest.decode() != constants_hash():
+            self.close()
+            raise ValueError(f"{path} was built with different constants, rebuild it.")
+        self._keys = _Keys(self._map, count)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __enter__(self) -> "TurbineTable":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._map.close()
+
+    def lookup(self, water_burn_rate) -> Turbine:
+        """Same answer as turbine_based_on_fission_reactor, in O(log n)."""
+        vents, condensers = turbine_requirements(water_burn_rate)
+        if vents < 0:
+            return turbine_based_on_fission_reactor(water_burn_rate)
+        index = bisect_left(self._keys, (vents, condensers, water_burn_rate))
+        if index == len(self._keys) or self._keys[index][:2] != (vents, condensers):
+            raise ValueError("No valid turbine configuration found for the given water burn rate.")
+        return _unpack(self._map, _HEADER.size + index * _RECORD.size)
+
+
+def table_digest(path: str) -> Optional[str]:
+    """Constants hash a table file was built with, None if it is missing or not a table of this version."""
+    try:
+        with open(path, "rb") as f:
+            header = f.read(_HEADER.size)
+    except FileNotFoundError:
+        return None
+    if len(header) < _HEADER.size:
+        return None
+    magic, digest, _ = _HEADER.unpack(header)
+    return digest.decode() if magic == _MAGIC else None
+
+
+def default_table_dir() -> str:
+    """$MEKANISM_CALCULATOR_CACHE, or mekanism-calculator in the user cache directory."""
+    override = os.environ.get(CACHE_DIR_VARIABLE)
+    if override:
+        return override
+    base = os.environ.get("XDG_CACHE_HOME") or os.environ.get("LOCALAPPDATA")
+    return os.path.join(base or os.path.join(os.path.expanduser("~"), ".cache"), "mekanism-calculator")
+
+
+def default_table_path(digest: str) -> str:
+    """Default table file for a constants hash."""
+    return os.path.join(default_table_dir(), f"turbine_table.{digest}.bin")
+
+
+def evict_default_tables(keep: int = MAX_DEFAULT_TABLES) -> List[str]:
+    """Delete all but the keep most recently used default tables; returns the deleted paths.
+    Processes that still map a deleted table keep reading it.
+    """
+    paths = glob.glob(os.path.join(glob.escape(default_table_dir()), "turbine_table.*.bin"))
+    paths.sort(key=os.path.getmtime, reverse=True)
+    deleted = []
+    for path in paths[keep:]:
+        try:
+            os.remove(path)
+        except OSError:
+            continue  # in use on platforms that forbid it, or already gone
+        deleted.append(path)
+    return deleted
+
+
+# Open default tables by constants hash, so a profile switch picks the matching one
+_default_tables: Dict[str, TurbineTable] = {}
+
+
+def close_default_tables() -> None:
+    """Close every open default table and forget it."""
+    while _default_tables:
+        _, table = _default_tables.popitem()
+        table.close()
+
+
+register_cache(close_default_tables)
+
+
+def turbine_based_on_fission_reactor_indexed(water_burn_rate) -> Turbine:
+    """Table version of turbine_based_on_fission_reactor.
+    Opens the default table of the current constants on first use, building it
+    if it does not exist yet.
+    """
+    digest = constants_hash()
+    table = _default_tables.get(digest)
+    if table is None:
+        path = default_table_path(digest)
+        if table_digest(path) != digest:
+            build_turbine_table(path)
+            evict_default_tables()
+        else:
+            os.utime(path)
+        table = TurbineTable(path)
+        opened = _default_tables.setdefault(digest, table)
+        if opened is not table:
+            table.close()
+        table = opened
+    return table.lookup(water_burn_rate)
+
+
+if __name__ == "__main__":
+    target = sys.argv[1] if len(sys.argv) > 1 else default_table_path(constants_hash())
+    count = build_turbine_table(target)
+    print(f"Wrote {count} turbine records to {target}")
@@ -1,9 +1,31 @@
+import argparse
+import sys
+from contextlib import nullcontext, redirect_stdout
 from calc.reactor import *
 from calc.turbine import *
 from calc.boiler import *
+from calc.sodium import *
+from calc.farm import *
+from calc import profiling
+from calc.atlas import export_atlas
+from calc.profiles import PROFILES, load_profiles, sensitivity_sweep, use_profile
+from calc.store import DEFAULT_STORE_PATH, set_default_store
+from calc.jsonl import stream_jsonl
+from calc.service import DEFAULT_PORT, serve
 
 
-def main():
+def print_turbines(water_burn_rate: int) -> None:
+    """Print the turbine for a burn rate, or a farm when one turbine is not enough."""
+    try:
+        turbine = turbine_based_on_fission_reactor(water_burn_rate)
+    except ValueError:
+        print("No single turbine can carry this reactor, splitting the steam across several.\n")
+        turbine_farm_for_flow(water_burn_rate).farm_print()
+        return
+    turbine.turbine_print()
+
+
+def interactive() -> None:
     print("=== Mekanism Fission Reactor Calculation ===")
     print("Choose an option :")
     print("1. Water-cool reactor setup")
@@ -19,29 +41,104 @@ def main():
         if sub_choice1 == '1':
             max_flow = int(input("Enter the desired max steam flow rate (mB/t): "))
             reactor = turbine_based_fission_reactor(max_flow)
-            turbine = turbine_based_on_fission_reactor(reactor.water_burn_rate)
             
             reactor.fission_print()
-            turbine.turbine_print()
+            print_turbines(reactor.water_burn_rate)
             
         elif sub_choice1 == '2':
             x = int(input("Enter reactor length (x): "))
             z = int(input("Enter reactor width (z): "))
             y = int(input("Enter reactor height (y): "))
             reactor = optimal_fission_with_dimensions(x, z, y)
-            turbine = turbine_based_on_fission_reactor(reactor.water_burn_rate)
             
             reactor.fission_print()
             print("\n")
-            turbine.turbine_print()
+            print_turbines(reactor.water_burn_rate)
 
     elif choice1 == '2':
         print("You selected Sodium-cool reactor setup.")
         setup = "sodium"
+        sub_choice1 = input("Calculate plant from (1) Desired Turbine Flow or (2) Reactor Dimensions : ")
+        if sub_choice1 == '1':
+            max_flow = int(input("Enter the desired max steam flow rate (mB/t): "))
+            plant = sodium_plant_for_flow(max_flow)
+            plant.plant_print()
+
+        elif sub_choice1 == '2':
+            x = int(input("Enter reactor length (x): "))
+            z = int(input("Enter reactor width (z): "))
+            y = int(input("Enter reactor height (y): "))
+            plant = sodium_plant_with_dimensions(x, z, y)
+            plant.plant_print()
         
     elif choice1 == '3':
         print("You selected Other calculations.")
         
 
+def run_jsonl(path: str, store: bool = False) -> None:
+    out = sys.stdout
+    # Warnings printed by the sizing functions go to stderr, results to stdout
+    with redirect_stdout(sys.stderr):
+        if path == "-":
+            errors = stream_jsonl(sys.stdin, out, store)
+        else:
+            with open(path, encoding="utf-8") as lines:
+                errors = stream_jsonl(lines, out, store)
+    if errors:
+        print(f"{errors} request(s) failed", file=sys.stderr)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Mekanism fission reactor, boiler and turbine calculator.")
+    parser.add_argument("--profile", action="store_true", help="report candidates, iterations and stage timings")
+    parser.add_argument("--jsonl", nargs="?", const="-", metavar="PATH",
+                        help="read JSON Lines requests from PATH (stdin by default) and stream results to stdout")
+    parser.add_argument("--serve", nargs="?", type=int, const=DEFAULT_PORT, metavar="PORT",
+                        help=f"serve the calculator over HTTP on localhost (port {DEFAULT_PORT} by default)")
+    parser.add_argument("--atlas", metavar="DIR",
+                        help="export the best design for every turbine, reactor and boiler size to DIR (CSV and binary)")
+    parser.add_argument("--workers", type=int, metavar="N",
+                        help="processes used by --atlas (every core by default)")
+    parser.add_argument("--profiles", metavar="PATH",
+                        help='load constant profiles from a JSON file {"name": {"CONSTANT": value}}')
+    parser.add_argument("--use-profile", metavar="NAME", help="run with the constants of a loaded profile")
+    parser.add_argument("--sweep", metavar="RATES",
+                        help="compare the optimal turbine for comma-separated fuel burn rates across every profile")
+    parser.add_argument("--store", nargs="?", const=DEFAULT_STORE_PATH, metavar="PATH",
+                        help="keep --jsonl results in a SQLite store shared across runs (calc/results.sqlite3 by default)")
+    args = parser.parse_args(argv)
+
+    if args.profile:
+        profiling.enable()
+    if args.profiles:
+        load_profiles(args.profiles)
+    if args.store:
+        set_default_store(args.store)
+    try:
+        with use_profile(args.use_profile) if args.use_profile else nullcontext():
+            run_mode(args)
+    finally:
+        if args.profile:
+            # Keep stdout a clean JSON Lines stream in headless mode
+            with redirect_stdout(sys.stderr if args.jsonl is not None else sys.stdout):
+                print()
+                profiling.report().report_print()
+
+
+def run_mode(args: argparse.Namespace) -> None:
+    if args.sweep is not None:
+        rates = [float(rate) for rate in args.sweep.split(",")]
+        sensitivity_sweep(list(PROFILES), rates).result_print()
+    elif args.serve is not None:
+        serve(port=args.serve)
+    elif args.jsonl is not None:
+        run_jsonl(args.jsonl, store=args.store is not None)
+    elif args.atlas is not None:
+        for kind, count in export_atlas(args.atlas, workers=args.workers).items():
+            print(f"Wrote {count} {kind} to {args.atlas}")
+    else:
+        interactive()
+
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
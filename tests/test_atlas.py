@@ -0,0 +1,78 @@
+import csv
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from multiprocessing import get_context
+import pytest
+from calc import atlas
+from calc.atlas import atlas_fields, export_atlas, export_atlas_kind, iter_atlas_blocks
+from calc.boiler import Boiler, boiler_handles, boiler_max_flow
+from calc.constants import CONST
+from calc.profiles import make_profile, use_profile
+from calc.reactor import FissionReactor, optimal_fission_with_dimensions
+from calc.turbine import Turbine, optimal_turbine_with_dimensions
+
+
+def _read(directory, kind):
+    """Atlas rows as field dicts, from the binary file, after checking the CSV holds the same."""
+    rows = []
+    for block in iter_atlas_blocks(str(directory / f"{kind}.bin")):
+        names = list(block)
+        rows.extend(dict(zip(names, values)) for values in zip(*block.values()))
+    with open(directory / f"{kind}.csv", newline="", encoding="utf-8") as f:
+        assert list(csv.DictReader(f)) == [{name: str(value) for name, value in row.items()} for row in rows]
+    return rows
+
+
+def test_turbines_match_the_scalar_search(tmp_path):
+    assert export_atlas_kind("turbines", str(tmp_path), workers=1, chunk_size=7) > 0
+    rows = _read(tmp_path, "turbines")
+    expected = [
+        optimal_turbine_with_dimensions(x_z, y)
+        for x_z in range(CONST["TURBINE_MIN_BASE"], CONST["TURBINE_MAX_BASE"] + 1, 2)
+        for y in range(CONST["TURBINE_MIN_HEIGHT"], CONST["TURBINE_MAX_HEIGHT"] + 1)
+    ]
+    names = [name for name, _ in atlas_fields(Turbine)]
+    assert rows == [{name: getattr(t, name) for name in names} for t in expected]
+
+
+def test_reactors_and_boilers(tmp_path):
+    counts = export_atlas(str(tmp_path), ["reactors", "water_boilers"], workers=1, chunk_size=500)
+    reactors = _read(tmp_path, "reactors")
+    assert len(reactors) == counts["reactors"]
+    for row in reactors[::11]:
+        sized = optimal_fission_with_dimensions(row["x"], row["z"], row["y"])
+        assert (row["fuel_assemblies"], row["control_rods"], row["water_burn_rate"]) == \
+            (sized.fuel_assemblies, sized.control_rods, sized.water_burn_rate)
+    assert set(atlas_fields(FissionReactor)) >= {("boil_efficiency", "d"), ("x", "q")}
+
+    boilers = _read(tmp_path, "water_boilers")
+    assert len(boilers) == counts["water_boilers"]
+    for row in boilers[::7]:
+        boiler = Boiler(**row)
+        assert boiler_handles(boiler, boiler_max_flow(boiler.x, boiler.z, boiler.y, False), False)
+
+
+def test_spawned_workers_use_the_active_profile(tmp_path, monkeypatch):
+    monkeypatch.setattr(atlas, "ProcessPoolExecutor", partial(ProcessPoolExecutor, mp_context=get_context("spawn")))
+    local, pool = tmp_path / "local", tmp_path / "pool"
+    local.mkdir()
+    pool.mkdir()
+    with use_profile(make_profile({"GENERAL_VENT_GAS_FLOW": 64_000, "GENERAL_CONDENSER_RATE": 96_000})):
+        export_atlas_kind("turbines", str(local), workers=1, chunk_size=16)
+        export_atlas_kind("turbines", str(pool), workers=2, chunk_size=16)
+        rows = _read(pool, "turbines")
+        assert rows == _read(local, "turbines")
+        last = optimal_turbine_with_dimensions(rows[-1]["x_z"], rows[-1]["y"])
+        assert (rows[-1]["vents"], rows[-1]["max_flow"]) == (last.vents, last.max_flow)
+    with pytest.raises(ValueError, match="different constants"):
+        next(iter_atlas_blocks(str(pool / "turbines.bin")))
+
+
+def test_bad_arguments_raise(tmp_path):
+    with pytest.raises(ValueError, match="Unknown atlas kind"):
+        export_atlas(str(tmp_path), ["castles"])
+    with pytest.raises(ValueError, match="chunk_size"):
+        export_atlas_kind("turbines", str(tmp_path), chunk_size=0)
+    (tmp_path / "junk.bin").write_bytes(b"\0" * 64)
+    with pytest.raises(ValueError, match="not a design atlas"):
+        next(iter_atlas_blocks(str(tmp_path / "junk.bin")))
@@ -0,0 +1,55 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+import pytest
+from calc import batch
+from calc.batch import chunked, size_water_setup, size_water_setups
+from calc.profiles import make_profile, use_profile
+from calc.reactor import optimal_fission_with_dimensions, turbine_based_fission_reactor
+from calc.turbine import turbine_based_on_fission_reactor
+
+REQUESTS = [20000, 400000, 400000.0, 1234567, (5, 5, 6), [9, 7, 12]]
+
+
+def _scalar(request):
+    if isinstance(request, (tuple, list)):
+        reactor = optimal_fission_with_dimensions(*request)
+    else:
+        reactor = turbine_based_fission_reactor(request)
+    return reactor, turbine_based_on_fission_reactor(reactor.water_burn_rate)
+
+
+def test_chunked():
+    assert list(chunked(range(7), 3)) == [[0, 1, 2], [3, 4, 5], [6]]
+    assert list(chunked([], 3)) == []
+
+
+def test_matches_the_scalar_functions():
+    assert size_water_setups(REQUESTS) == [_scalar(request) for request in REQUESTS]
+
+
+def test_process_pool_keeps_input_order():
+    assert size_water_setups(REQUESTS, workers=2, chunk_size=1) == size_water_setups(REQUESTS)
+
+
+def test_spawned_workers_use_the_active_profile(monkeypatch):
+    spawn = multiprocessing.get_context("spawn")
+    monkeypatch.setattr(batch, "ProcessPoolExecutor", partial(ProcessPoolExecutor, mp_context=spawn))
+    with use_profile(make_profile({"GENERAL_VENT_GAS_FLOW": 64000, "FISSION_STEAM_PER_FUEL": 25000})):
+        expected = [_scalar(request) for request in REQUESTS]
+        assert size_water_setups(REQUESTS, workers=2, chunk_size=2) == expected
+    assert expected != [_scalar(request) for request in REQUESTS]
+
+
+def test_errors_stop_the_batch_unless_returned():
+    requests = [400000, (5, 5), 800000]
+    with pytest.raises(ValueError, match=r"\(x, z, y\)"):
+        size_water_setups(requests)
+    results = size_water_setups(requests, return_errors=True)
+    assert isinstance(results[1], ValueError)
+    assert results[0] == size_water_setup(400000) and results[2] == size_water_setup(800000)
+
+
+def test_chunk_size_must_be_positive():
+    with pytest.raises(ValueError, match="chunk_size"):
+        size_water_setups([400000], chunk_size=0)
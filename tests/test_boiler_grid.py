@@ -0,0 +1,79 @@
+import pytest
+from calc.boiler import boiler_handles, boiler_max_flow, boiler_size, max_boil_rate
+from calc.boiler_grid import (
+    boiler_geometry_max_flows, boiler_steam_flow, optimal_boiler_with_dimensions, smallest_boiler_for_flow,
+)
+from calc.constants import CONST
+
+
+def _geometries():
+    for x in range(CONST["BOILER_MIN_BASE"], CONST["BOILER_MAX_BASE"] + 1):
+        for z in range(CONST["BOILER_MIN_BASE"], CONST["BOILER_MAX_BASE"] + 1):
+            for y in range(CONST["BOILER_MIN_HEIGHT"], CONST["BOILER_MAX_HEIGHT"] + 1):
+                yield x, z, y
+
+
+def _layout_flow(boiler, sodium):
+    """Highest steam flow boiler_handles accepts for this layout."""
+    flow = max_boil_rate(boiler)
+    if sodium:
+        ratio = CONST["SODIUM_TO_STEAM_RATIO"]
+        flow = min(flow, boiler.heated_coolant_capacity // ratio, boiler.coolant_capacity // ratio)
+    return flow
+
+
+def _scalar_max_flow(x, z, y, sodium):
+    """Best flow over every steam cavity height and heating element count."""
+    best = 0
+    for steam_cavity_height in range(1, y - 3):
+        water_cavity = (x - 2) * (z - 2) * (y - 3 - steam_cavity_height)
+        for heating_element in range(1, water_cavity):
+            best = max(best, _layout_flow(boiler_size(x, z, y, steam_cavity_height, heating_element), sodium))
+    return best
+
+
+@pytest.mark.parametrize("coolant", ["sodium", "water"])
+@pytest.mark.parametrize("dimensions", [(3, 3, 4), (3, 3, 6), (5, 5, 6), (7, 9, 12), (12, 5, 18), (18, 18, 18)])
+def test_dimensions_match_every_layout(dimensions, coolant):
+    sodium = coolant == "sodium"
+    expected = _scalar_max_flow(*dimensions, sodium)
+    if expected == 0:
+        with pytest.raises(ValueError, match="No boiler layout"):
+            optimal_boiler_with_dimensions(*dimensions, coolant)
+        return
+    boiler = optimal_boiler_with_dimensions(*dimensions, coolant)
+    assert (boiler.x, boiler.z, boiler.y) == dimensions
+    assert boiler_handles(boiler, expected, sodium)
+    assert boiler_max_flow(*dimensions, sodium) == expected
+
+
+@pytest.mark.parametrize("coolant", ["sodium", "water"])
+def test_geometry_flows_match_the_scalar_search(coolant):
+    sodium = coolant == "sodium"
+    expected = [(x * z * y, boiler_max_flow(x, z, y, sodium), x, z, y) for x, z, y in _geometries()]
+    expected = sorted((g for g in expected if g[1] > 0), key=lambda g: (g[0], g[2], g[3], g[4]))
+    assert boiler_geometry_max_flows(coolant) == expected
+
+
+@pytest.mark.parametrize("coolant", ["sodium", "water"])
+@pytest.mark.parametrize("flow", [1, 10_000, 400_000, 2_000_000, 25_000_000, 90_000_000])
+def test_smallest_boiler_is_the_smallest_that_handles_the_flow(flow, coolant):
+    sodium = coolant == "sodium"
+    steam_flow = boiler_steam_flow(flow, coolant)
+    fitting = [x * z * y for x, z, y in _geometries() if boiler_max_flow(x, z, y, sodium) >= steam_flow]
+    if not fitting:
+        with pytest.raises(ValueError, match="No single boiler"):
+            smallest_boiler_for_flow(flow, coolant)
+        return
+    boiler = smallest_boiler_for_flow(flow, coolant)
+    assert boiler_handles(boiler, steam_flow, sodium)
+    assert boiler.x * boiler.z * boiler.y == min(fitting)
+
+
+def test_unknown_coolant_and_bounds_raise():
+    with pytest.raises(ValueError, match="Unknown coolant"):
+        smallest_boiler_for_flow(1000, "lava")
+    with pytest.raises(ValueError, match="out of bounds"):
+        optimal_boiler_with_dimensions(2, 5, 6)
+    with pytest.raises(ValueError, match="out of bounds"):
+        optimal_boiler_with_dimensions(5, 5, 19)
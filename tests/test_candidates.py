@@ -0,0 +1,48 @@
+from array import array
+import pytest
+from calc.candidates import CandidateBatch
+from calc.reactor import FissionReactor
+from calc.turbine import Turbine, optimal_turbine_with_dimensions
+
+
+def test_rows_materialize_to_the_records_they_came_from():
+    turbines = [optimal_turbine_with_dimensions(x_z, y) for x_z, y in ((5, 5), (9, 12), (17, 18))]
+    batch = CandidateBatch(Turbine)
+    for t in turbines:
+        batch.append(**{name: getattr(t, name) for name in batch.columns})
+    assert len(batch) == 3
+    assert batch.materialize_rows(range(3)) == turbines
+    assert isinstance(batch.column("max_production"), array) and isinstance(batch.column("x_z"), array)
+
+
+def test_from_columns_fills_missing_columns_with_zeros():
+    batch = CandidateBatch.from_columns(FissionReactor, x=[5, 7], z=[5, 7], y=[6, 9])
+    assert batch.materialize(1) == FissionReactor(x=7, z=7, y=9)
+
+
+def test_argmax_keeps_the_first_row_on_ties():
+    batch = CandidateBatch.from_columns(Turbine, x_z=[5, 7, 9, 11], max_production=[1.0, 3.0, 3.0, 2.0])
+    assert batch.argmax("max_production") == 1
+    assert batch.argmax("max_production", [0, 3]) == 3
+    assert batch.argmax("max_production", []) == -1
+
+
+@pytest.mark.parametrize("value", [2 ** 70, 12.5])
+def test_values_an_int_column_cannot_hold_fall_back_to_a_list(value):
+    batch = CandidateBatch(Turbine)
+    batch.append(x_z=5, max_flow=1000)
+    batch.append(x_z=7, max_flow=value)
+    assert batch.column("max_flow") == [1000, value]
+    assert batch.materialize(1).max_flow == value
+
+    columns = CandidateBatch.from_columns(Turbine, max_flow=[1000, value])
+    assert columns.column("max_flow") == [1000, value]
+
+
+def test_unknown_fields_and_ragged_columns_raise():
+    with pytest.raises(ValueError, match="no numeric field 'warp'"):
+        CandidateBatch(Turbine).append(warp=1)
+    with pytest.raises(ValueError, match="no numeric field 'energy_si_prefix'"):
+        CandidateBatch.from_columns(Turbine, energy_si_prefix=["k"])
+    with pytest.raises(ValueError, match="expected 2"):
+        CandidateBatch.from_columns(Turbine, x_z=[5, 7], y=[5])
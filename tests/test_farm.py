@@ -0,0 +1,66 @@
+from itertools import combinations_with_replacement
+from math import ceil
+import pytest
+from calc.constants import CONST
+from calc.farm import energy_per_flow, supported_flow, turbine_farm_for_flow
+from calc.pareto import turbine_block_count
+from calc.turbine_grid import turbine_catalogue
+
+FLOWS = [32000, 500000, 1_234_567, 5_000_000, 20_000_000, 30_000_000, 45_000_000]
+
+
+def _production(turbines, steam_flow):
+    """Steam filled into the most productive turbines first, each producing at its real flow."""
+    power, remaining = 0.0, steam_flow
+    for t in sorted(turbines, key=energy_per_flow, reverse=True):
+        used = min(supported_flow(t), remaining)
+        power += energy_per_flow(t) * used
+        remaining -= used
+    return power
+
+
+def _brute_force(steam_flow, max_turbines, objective, identical):
+    """(blocks, power) of the best farm over every catalogue design, or None."""
+    bucket = CONST["GENERAL_VENT_GAS_FLOW"]
+    demand = int(ceil(steam_flow / bucket))
+    designs = [t for t in turbine_catalogue() if supported_flow(t) >= bucket]
+    best = None
+    for count in range(1, max_turbines + 1):
+        farms = [[t] * count for t in designs] if identical else combinations_with_replacement(designs, count)
+        for farm in farms:
+            if sum(supported_flow(t) // bucket for t in farm) < demand:
+                continue
+            blocks, power = sum(turbine_block_count(t) for t in farm), _production(farm, steam_flow)
+            key = (-blocks, power) if objective == "blocks" else (power, -blocks)
+            if best is None or key > best[0] and not key == pytest.approx(best[0]):
+                best = (key, (blocks, power))
+    return None if best is None else best[1]
+
+
+@pytest.mark.parametrize("identical", [False, True])
+@pytest.mark.parametrize("objective", ["blocks", "power"])
+@pytest.mark.parametrize("max_turbines", [1, 2])
+@pytest.mark.parametrize("steam_flow", FLOWS)
+def test_plan_matches_brute_force(steam_flow, max_turbines, objective, identical):
+    expected = _brute_force(steam_flow, max_turbines, objective, identical)
+    if expected is None:
+        with pytest.raises(ValueError, match=f"more than {max_turbines} turbines"):
+            turbine_farm_for_flow(steam_flow, max_turbines, objective, identical)
+        return
+    farm = turbine_farm_for_flow(steam_flow, max_turbines, objective, identical)
+    assert (farm.block_count, farm.max_production) == (expected[0], pytest.approx(expected[1]))
+
+
+@pytest.mark.parametrize("objective", ["blocks", "power"])
+def test_farm_carries_the_flow_at_its_real_production(objective):
+    farm = turbine_farm_for_flow(100_000_000, objective=objective)
+    assert sum(farm.flows) == farm.steam_flow == 100_000_000
+    assert all(0 <= flow <= supported_flow(t) for t, flow in zip(farm.turbines, farm.flows))
+    assert farm.max_flow >= farm.steam_flow
+    assert farm.max_production == pytest.approx(_production(farm.turbines, farm.steam_flow))
+    assert len(farm.turbines) <= 16
+
+
+def test_unknown_objective_raises():
+    with pytest.raises(ValueError, match="Unknown objective"):
+        turbine_farm_for_flow(1_000_000, objective="cost")
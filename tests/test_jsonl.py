@@ -0,0 +1,55 @@
+import io
+import json
+from dataclasses import asdict
+import pytest
+from calc.jsonl import iter_jsonl_results, solve_request, stream_jsonl
+from calc.reactor import turbine_based_fission_reactor
+from calc.turbine import turbine_based_on_fission_reactor
+
+
+def test_water_flow_request_matches_the_sizing_functions():
+    result = solve_request({"setup": "water", "mode": "flow", "max_flow": 400000})
+    reactor = turbine_based_fission_reactor(400000)
+    assert result["reactor"] == asdict(reactor)
+    assert result["turbine"] == asdict(turbine_based_on_fission_reactor(reactor.water_burn_rate))
+
+
+def test_integral_float_is_accepted():
+    assert solve_request({"max_flow": 400000.0}) == solve_request({"max_flow": 400000})
+
+
+@pytest.mark.parametrize("line, message", [
+    ('{"max_flow": Infinity}', "whole number"),
+    ('{"max_flow": -Infinity}', "whole number"),
+    ('{"max_flow": NaN}', "whole number"),
+    ('{"max_flow": 400000.5}', "whole number"),
+    ('{"max_flow": "400000"}', "must be a number"),
+    ('{"max_flow": true}', "must be a number"),
+    ('{"mode": "dimensions", "x": 5, "z": 5}', "'y' must be a number"),
+    ('{"setup": "lava"}', "Unknown setup"),
+    ('{"mode": "guess"}', "Unknown mode"),
+    ('[400000]', "JSON object"),
+    ('{"max_flow": 4000', "Expecting"),
+])
+def test_bad_line_yields_an_error_and_the_stream_goes_on(line, message):
+    results = list(iter_jsonl_results([line, '{"id": "next", "max_flow": 400000}']))
+    assert len(results) == 2
+    assert results[0]["line"] == 1
+    assert message in results[0]["error"]
+    assert results[1]["line"] == 2 and results[1]["id"] == "next"
+    assert "error" not in results[1]
+
+
+def test_error_keeps_the_request_id():
+    (result,) = iter_jsonl_results(['{"id": 7, "max_flow": Infinity}'])
+    assert result["id"] == 7 and "error" in result
+
+
+def test_stream_writes_one_line_per_request_and_counts_errors():
+    lines = ['{"max_flow": 400000}', "", "   ", "not json", '{"mode": "dimensions", "x": 5, "z": 5, "y": 6}']
+    out = io.StringIO()
+    assert stream_jsonl(lines, out) == 1
+    written = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert [result["line"] for result in written] == [1, 4, 5]
+    assert "error" in written[1]
+    assert written[2]["mode"] == "dimensions"
@@ -0,0 +1,71 @@
+import random
+import pytest
+from calc.layout import (
+    ReactorLayout, best_layout, candidate_layouts, checker_layout, exposed_faces, layout_reactor, touching_pairs,
+    valid_layout,
+)
+from calc.reactor import checker_fuel_surface_area, fuel_assemblies_dimensions
+
+DIMENSIONS = [(x, z, y) for x in range(3, 9) for z in range(3, 8) for y in range(4, 9)]
+
+
+def _cells(bits, width, depth, height):
+    return {
+        (col, row, level)
+        for level in range(height) for row in range(depth) for col in range(width)
+        if bits >> ((level * depth + row) * width + col) & 1
+    }
+
+
+def _touching_pairs_scalar(bits, width, depth, height):
+    cells = _cells(bits, width, depth, height)
+    return sum(
+        (col + dc, row + dr, level + dl) in cells
+        for col, row, level in cells
+        for dc, dr, dl in ((1, 0, 0), (0, 1, 0), (0, 0, 1))
+    )
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_touching_pairs_match_a_cell_by_cell_count(seed):
+    rng = random.Random(seed)
+    width, depth, height = rng.randint(1, 6), rng.randint(1, 6), rng.randint(1, 6)
+    bits = rng.getrandbits(width * depth * height)
+    assert touching_pairs(bits, width, depth, height) == _touching_pairs_scalar(bits, width, depth, height)
+
+
+@pytest.mark.parametrize("x, z, y", DIMENSIONS)
+def test_checker_layout_matches_the_reactor_formulas(x, z, y):
+    layout = checker_layout(x, z, y)
+    assert valid_layout(layout)
+    reactor = layout_reactor(layout)
+    assert (reactor.fuel_assemblies, reactor.control_rods) == fuel_assemblies_dimensions(x, z, y)
+    assert exposed_faces(layout) == checker_fuel_surface_area(x, z, y)
+
+
+@pytest.mark.parametrize("x, z, y", [(5, 5, 6), (7, 6, 9), (9, 9, 12)])
+def test_best_layout_meets_the_target_with_the_most_fuel(x, z, y):
+    layout = best_layout(x, z, y)
+    reactor = layout_reactor(layout)
+    assert valid_layout(layout)
+    assert reactor.boil_efficiency == 1.0
+    assert reactor.fuel_assemblies == max(c.fuel.bit_count() for c in candidate_layouts(x, z, y))
+    assert reactor.fuel_assemblies >= fuel_assemblies_dimensions(x, z, y)[0]
+
+
+def test_best_layout_is_a_copy():
+    layout = best_layout(7, 7, 8)
+    layout.fuel = 0
+    assert best_layout(7, 7, 8).fuel
+
+
+def test_invalid_layouts():
+    assert not valid_layout(ReactorLayout(5, 5, 6, fuel=1, control_rods=0))  # no rod above the fuel
+    assert not valid_layout(ReactorLayout(5, 5, 6, fuel=1, control_rods=1))  # overlap
+    assert not valid_layout(ReactorLayout(5, 5, 6, fuel=1 << 100))           # outside the interior
+
+
+def test_unreachable_target_raises():
+    with pytest.raises(ValueError, match="No fuel layout"):
+        best_layout(5, 5, 6, target=7)
+    assert list(candidate_layouts(2, 5, 6)) == []
@@ -0,0 +1,80 @@
+import pytest
+from calc.matching import pairs_within_footprint, reactors_for_turbine, supported_flow, turbines_for_reactor
+from calc.reactor import turbine_based_fission_reactor
+from calc.turbine import (
+    max_energy_prod, max_flow_rate, max_vents, optimal_condensers, optimal_turbine_with_dimensions,
+    turbine_based_on_fission_reactor,
+)
+
+
+def _waste(steam, flow, saturate):
+    return (steam - flow) / steam if saturate else (flow - steam) / flow
+
+
+@pytest.mark.parametrize("max_flow, saturate", [
+    (200000, True), (400000, True), (400000, False), (1000000, True), (1000000, False),
+])
+def test_sized_reactors_find_turbines_within_waste(max_flow, saturate):
+    reactor = turbine_based_fission_reactor(max_flow)
+    matches = turbines_for_reactor(reactor, 0.05, saturate)
+    assert matches
+    keys = [(_waste(reactor.water_burn_rate, supported_flow(t), saturate), t.x_z * t.x_z * t.y) for t in matches]
+    assert all(0 <= waste <= 0.05 for waste, _ in keys)
+    assert keys == sorted(keys)
+
+
+def test_matches_are_turbines_the_scalar_functions_describe():
+    reactor = turbine_based_fission_reactor(400000)
+    for t in turbines_for_reactor(reactor, 0.05, True):
+        assert 1 <= t.vents <= max_vents(t.x_z, t.y, t.shaft_height)
+        assert t.max_flow == max_flow_rate(t.x_z, t.shaft_height, t.vents)
+        assert t.condensers == optimal_condensers(t.x_z, t.y, t.shaft_height, t.coils, t.max_flow)
+        assert t.max_production == max_energy_prod(t.blades, t.coils, t.x_z, t.shaft_height, t.vents)
+        assert t.max_production <= optimal_turbine_with_dimensions(t.x_z, t.y).max_production
+
+
+@pytest.mark.parametrize("max_flow", [200000, 800000, 1500000])
+def test_the_design_the_sizer_picks_is_indexed(max_flow):
+    reactor = turbine_based_fission_reactor(max_flow)
+    turbine = turbine_based_on_fission_reactor(reactor.water_burn_rate)
+    flow = supported_flow(turbine)
+    waste = (flow - reactor.water_burn_rate) / flow + 0.001
+    same = [
+        t for t in turbines_for_reactor(reactor, waste, False)
+        if (t.x_z, t.y, supported_flow(t)) == (turbine.x_z, turbine.y, flow)
+    ]
+    assert len(same) == 1 and same[0].max_production >= turbine.max_production
+
+
+def test_results_are_not_shared():
+    reactor = turbine_based_fission_reactor(400000)
+    first = turbines_for_reactor(reactor)
+    first[0].vents = -1
+    assert turbines_for_reactor(reactor)[0].vents != -1
+    pairs = pairs_within_footprint(7)
+    assert pairs[0][0] is not pairs[1][0] and pairs[0][1] is not pairs[1][1]
+
+
+def test_reactors_for_turbine_within_waste():
+    turbine = optimal_turbine_with_dimensions(9, 12)
+    flow = supported_flow(turbine)
+    reactors = reactors_for_turbine(turbine, 0.05, False)
+    assert reactors
+    assert all(flow * 0.95 <= r.water_burn_rate <= flow for r in reactors)
+
+
+def test_pairs_fit_the_footprint():
+    pairs = pairs_within_footprint(7, 0.02)
+    assert pairs
+    for reactor, turbine in pairs:
+        assert max(reactor.x, reactor.z, turbine.x_z) <= 7
+        assert _waste(reactor.water_burn_rate, supported_flow(turbine), True) <= 0.02
+
+
+@pytest.mark.parametrize("waste", [-0.1, 1, 1.5])
+def test_waste_must_be_a_fraction(waste):
+    reactor = turbine_based_fission_reactor(400000)
+    with pytest.raises(ValueError, match="waste"):
+        turbines_for_reactor(reactor, waste)
+    with pytest.raises(ValueError, match="waste"):
+        pairs_within_footprint(7, waste)
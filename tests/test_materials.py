@@ -0,0 +1,98 @@
+from math import ceil
+import pytest
+from calc.boiler import boiler_size, inner_area, max_boil_rate
+from calc.constants import CONST
+from calc.materials import (
+    boiler_materials, fits_budget, max_burn_reactor, max_flow_boiler, max_power_turbine, reactor_materials,
+    turbine_materials,
+)
+from calc.reactor_grid import evaluate_reactor_grid
+from calc.turbine import (
+    Turbine, coils_needed, max_energy_prod, max_flow_rate, max_vents, optimal_condensers, pressure_dispersers,
+)
+from calc.turbine_grid import turbine_catalogue
+
+
+def _turbine_designs(vent_limit):
+    for x_z in range(CONST["TURBINE_MIN_BASE"], CONST["TURBINE_MAX_BASE"] + 1, 2):
+        for y in range(CONST["TURBINE_MIN_HEIGHT"], CONST["TURBINE_MAX_HEIGHT"] + 1):
+            for shaft_height in range(1, min(2 * x_z - 5, CONST["TURBINE_MAX_ROTOR_HEIGHT"])):
+                blades = shaft_height * 2
+                coils = coils_needed(blades)
+                for vents in range(1, min(max_vents(x_z, y, shaft_height), vent_limit) + 1):
+                    max_flow = max_flow_rate(x_z, shaft_height, vents)
+                    condensers = optimal_condensers(x_z, y, shaft_height, coils, max_flow)
+                    if condensers < 0:
+                        continue
+                    yield Turbine(
+                        x_z=x_z, y=y, vents=vents, dispersers=pressure_dispersers(x_z), condensers=condensers,
+                        shaft_height=shaft_height, blades=blades, coils=coils, max_flow=max_flow,
+                        max_production=max_energy_prod(blades, coils, x_z, shaft_height, vents),
+                    )
+
+
+def _boiler_flow(boiler, sodium):
+    flow = max_boil_rate(boiler)
+    if sodium:
+        ratio = CONST["SODIUM_TO_STEAM_RATIO"]
+        flow = min(flow, boiler.heated_coolant_capacity // ratio, boiler.coolant_capacity // ratio)
+    return flow
+
+
+def _boiler_layouts(element_limit):
+    for x in range(CONST["BOILER_MIN_BASE"], CONST["BOILER_MAX_BASE"] + 1):
+        for z in range(CONST["BOILER_MIN_BASE"], CONST["BOILER_MAX_BASE"] + 1):
+            for y in range(CONST["BOILER_MIN_HEIGHT"], CONST["BOILER_MAX_HEIGHT"] + 1):
+                for steam_cavity_height in range(1, y - 3):
+                    water_cavity = inner_area(x, z) * (y - 3 - steam_cavity_height)
+                    for elements in range(1, min(element_limit, water_cavity - 1) + 1):
+                        yield boiler_size(x, z, y, steam_cavity_height, elements)
+
+
+@pytest.mark.parametrize("budget", [{"vents": 12}, {"vents": 12, "glass": 150, "coils": 3}, {"vents": 6, "rotors": 2}])
+def test_turbine_is_the_best_buildable(budget):
+    best = max(
+        (t for t in _turbine_designs(budget["vents"]) if fits_budget(turbine_materials(t), budget)),
+        key=lambda t: (t.max_production, -t.x_z * t.x_z * t.y),
+    )
+    turbine = max_power_turbine(budget)
+    assert fits_budget(turbine_materials(turbine), budget)
+    assert (turbine.max_production, turbine.x_z * turbine.x_z * turbine.y) == \
+        pytest.approx((best.max_production, best.x_z * best.x_z * best.y))
+
+
+@pytest.mark.parametrize("coolant", ["sodium", "water"])
+@pytest.mark.parametrize("budget", [{"heating_elements": 1, "glass": 97}, {"heating_elements": 2, "casing": 60}])
+def test_boiler_is_the_best_buildable(coolant, budget):
+    sodium = coolant == "sodium"
+    best = max(
+        (b for b in _boiler_layouts(budget["heating_elements"]) if fits_budget(boiler_materials(b, sodium), budget)),
+        key=lambda b: (_boiler_flow(b, sodium), -b.x * b.z * b.y),
+    )
+    boiler = max_flow_boiler(budget, coolant)
+    assert fits_budget(boiler_materials(boiler, sodium), budget)
+    assert (_boiler_flow(boiler, sodium), boiler.x * boiler.z * boiler.y) == (_boiler_flow(best, sodium), best.x * best.z * best.y)
+
+
+def test_unlimited_budget_reaches_the_best_designs():
+    assert max_power_turbine({}).max_production == max(t.max_production for t in turbine_catalogue())
+    assert max_burn_reactor({}).fuel_assemblies == max(evaluate_reactor_grid()["fuel_assemblies"])
+
+
+@pytest.mark.parametrize("budget", [{"control_rods": 5}, {"fuel_assemblies": 37, "casing": 70}, {"glass": 40}])
+def test_reactor_fits_and_is_consistent(budget):
+    reactor = max_burn_reactor(budget)
+    assert fits_budget(reactor_materials(reactor), budget)
+    levels = reactor.y - 3
+    assert reactor.control_rods == ceil(reactor.fuel_assemblies / levels)
+    assert reactor.water_burn_rate == reactor.fuel_assemblies * CONST["FISSION_STEAM_PER_FUEL"]
+
+
+@pytest.mark.parametrize("search, message", [
+    (max_power_turbine, "No turbine"), (max_burn_reactor, "No reactor"), (max_flow_boiler, "No boiler"),
+])
+def test_budget_errors(search, message):
+    with pytest.raises(ValueError, match="Unknown materials"):
+        search({"unobtainium": 1})
+    with pytest.raises(ValueError, match=message):
+        search({"casing": 0})
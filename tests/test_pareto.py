@@ -0,0 +1,45 @@
+import random
+from collections import namedtuple
+import pytest
+from calc.pareto import dominates, pareto_front
+from calc.turbine_grid import turbine_catalogue
+
+Point = namedtuple("Point", "a b c d")
+
+
+def _objectives(count: int):
+    return [((lambda p, i=i: p[i]), i % 2 == 0) for i in range(count)]
+
+
+def _brute_force(candidates, objectives):
+    return [c for c in candidates if not any(dominates(o, c, objectives) for o in candidates)]
+
+
+@pytest.mark.parametrize("count", [1, 2, 3, 4])
+@pytest.mark.parametrize("seed", range(5))
+def test_front_matches_pairwise_dominance(count, seed):
+    rng = random.Random(seed)
+    # Few distinct values, so ties and duplicate points are common
+    candidates = [Point(*(rng.randint(0, 6) for _ in range(4))) for _ in range(300)]
+    objectives = _objectives(count)
+    assert pareto_front(candidates, objectives) == _brute_force(candidates, objectives)
+
+
+def test_default_turbine_objectives():
+    catalogue = list(turbine_catalogue())
+    front = pareto_front(catalogue)
+    assert front == _brute_force(catalogue, None)
+    assert max(catalogue, key=lambda t: t.max_production) in front
+
+
+def test_identical_candidates_are_kept_together():
+    candidates = [Point(0, 0, 0, 0), Point(1, 0, 0, 0), Point(1, 0, 0, 0)]
+    front = pareto_front(candidates, _objectives(3))
+    assert front == candidates[1:]
+    assert front[0] is candidates[1] and front[1] is candidates[2]
+
+
+def test_empty_and_unknown_candidates():
+    assert pareto_front([]) == []
+    with pytest.raises(ValueError, match="No default objectives"):
+        pareto_front([Point(1, 2, 3, 4)])
@@ -0,0 +1,101 @@
+import asyncio
+import threading
+import pytest
+from calc.constants import CONST
+from calc.profiles import (
+    DEFAULT_PROFILE, current_constants, make_profile, pin_profile, register_profile, sensitivity_sweep,
+    set_profile, unpin_profile, use_profile,
+)
+from calc.service import SizingService
+from calc.turbine import turbine_based_on_fission_reactor
+
+RATES = [1, 10, 20, 100, 1435, 5000]
+
+
+@pytest.fixture
+def profiles():
+    register_profile("fast_vents", {"GENERAL_VENT_GAS_FLOW": 64_000})
+    register_profile("same", {})
+    yield
+    set_profile(DEFAULT_PROFILE)
+
+
+def _layout(turbine):
+    return turbine and (turbine.x_z, turbine.y, turbine.shaft_height, turbine.vents, turbine.condensers)
+
+
+def _scalar(rate):
+    try:
+        return turbine_based_on_fission_reactor(rate * CONST["FISSION_STEAM_PER_FUEL"])
+    except ValueError:
+        return None
+
+
+def test_sweep_matches_the_scalar_search_under_each_profile(profiles):
+    result = sensitivity_sweep([DEFAULT_PROFILE, "fast_vents", "same"], RATES)
+    for name, row in zip(result.profiles, result.turbines):
+        with use_profile(name):
+            assert row == [_scalar(rate) for rate in RATES]
+    assert result.turbines[2] is result.turbines[0]
+    assert None in result.turbines[0]
+    assert current_constants() == make_profile({})
+
+
+def test_changed_lists_the_layouts_that_differ(profiles):
+    result = sensitivity_sweep([DEFAULT_PROFILE, "fast_vents", "same"], RATES)
+    changed = result.changed()
+    assert changed and all(name == "fast_vents" for name, _ in changed)
+    assert changed == [
+        ("fast_vents", rate) for rate, base, other in zip(RATES, *result.turbines[:2]) if _layout(base) != _layout(other)
+    ]
+
+
+def test_unknown_profiles_raise():
+    with pytest.raises(ValueError, match="Unknown profile"):
+        sensitivity_sweep([DEFAULT_PROFILE, "missing"], RATES)
+
+
+def test_switching_a_pinned_profile_raises(profiles):
+    pinned = pin_profile()
+    try:
+        with pytest.raises(RuntimeError, match="pinned"):
+            set_profile("fast_vents")
+        with use_profile("same"):  # same constants, nothing to switch
+            assert current_constants() == pinned
+    finally:
+        unpin_profile()
+    with use_profile("fast_vents"):
+        assert CONST["GENERAL_VENT_GAS_FLOW"] == 64_000
+    with pytest.raises(RuntimeError, match="without pin_profile"):
+        unpin_profile()
+
+
+def test_service_pins_the_profile_while_it_listens(profiles):
+    async def main():
+        server = await SizingService().start("127.0.0.1", 0)
+        async with server:
+            with pytest.raises(RuntimeError, match="pinned"):
+                set_profile("fast_vents")
+        await asyncio.sleep(0)
+    asyncio.run(main())
+    set_profile("fast_vents")
+    assert CONST["GENERAL_VENT_GAS_FLOW"] == 64_000
+
+
+def test_pin_waits_for_blocks_of_other_threads(profiles):
+    entered, release = threading.Event(), threading.Event()
+
+    def block():
+        with use_profile("fast_vents"):
+            entered.set()
+            release.wait(10)
+
+    thread = threading.Thread(target=block)
+    thread.start()
+    entered.wait(10)
+    threading.Timer(0.05, release.set).start()
+    try:
+        assert pin_profile() == make_profile({})
+    finally:
+        unpin_profile()
+        thread.join()
@@ -0,0 +1,72 @@
+import pytest
+from calc import profiling
+from calc.constants import CONST
+from calc.profiles import clear_caches
+from calc.reactor import turbine_based_fission_reactor
+from calc.turbine import min_height, turbine_based_on_fission_reactor
+
+
+@pytest.fixture
+def profiler():
+    profiling.enable()
+    yield
+    profiling.disable()
+    profiling.reset()
+
+
+def _grow_iterations(fuel_assemblies):
+    """Bases the grow loop of turbine_based_fission_reactor tries, counted by hand."""
+    tried = 0
+    for base in range(4, CONST["MAX_REACTOR_BASE"]):
+        tried += 1
+        inner = base - 2
+        if -(-inner * inner // 2) * inner > fuel_assemblies + -(-inner * inner // 2):
+            break
+    return tried
+
+
+@pytest.mark.parametrize("max_flow", [0, 20000, 400000, 4_000_000, 10 ** 12])
+def test_grow_iterations_count_every_base_tried(profiler, max_flow):
+    turbine_based_fission_reactor(max_flow)
+    expected = _grow_iterations(max_flow // CONST["FISSION_STEAM_PER_FUEL"])
+    assert profiling.report().counters["turbine_based_fission_reactor.grow_iterations"] == expected
+
+
+def test_grow_iterations_with_no_base_to_try(profiler, monkeypatch):
+    monkeypatch.setitem(CONST, "MAX_REACTOR_BASE", 4)
+    try:
+        turbine_based_fission_reactor(400000)
+        assert profiling.report().counters["turbine_based_fission_reactor.grow_iterations"] == 0
+    finally:
+        monkeypatch.undo()
+        clear_caches()
+
+
+@pytest.mark.parametrize("args", [(5, 1, 2, 1, 1), (9, 4, 7, 20, 60), (17, 13, 7, 10, 10 ** 6)])
+def test_min_height_iterations(profiler, args):
+    x_z, shaft_height, coils, condensers, vents = args
+    y = min_height(shaft_height, coils, condensers, x_z, vents)
+    tried = (y or CONST["TURBINE_MAX_HEIGHT"]) - shaft_height - 2
+    assert profiling.report().counters["min_height.iterations"] == tried
+
+
+def test_stages_are_timed_and_reports_are_snapshots(profiler):
+    turbine_based_on_fission_reactor(400000)
+    turbine_based_on_fission_reactor(400000)
+    report = profiling.report()
+    assert report.stage_calls["turbine_based_on_fission_reactor.enumerate"] == 2
+    assert report.timings["turbine_based_on_fission_reactor.enumerate"] > 0
+    report.counters.clear()
+    assert profiling.report().counters
+    profiling.enable()
+    assert profiling.report().as_dict() == {"counters": {}, "timings": {}, "stage_calls": {}}
+
+
+def test_disabled_profiler_records_nothing():
+    profiling.reset()
+    turbine_based_fission_reactor(400000)
+    turbine_based_on_fission_reactor(400000)
+    profiling.count("manual")
+    with profiling.stage("manual"):
+        pass
+    assert profiling.report().as_dict() == {"counters": {}, "timings": {}, "stage_calls": {}}
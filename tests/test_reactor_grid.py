@@ -0,0 +1,88 @@
+import pytest
+from calc.constants import CONST
+from calc.reactor import (
+    boil_efficiency, casing_blocks, checker_fuel_surface_area, fuel_assemblies_dimensions, heat_capacity,
+    optimal_fission_with_dimensions,
+)
+from calc.reactor_grid import (
+    REACTOR_GRID_OBJECTIVES, evaluate_reactor_grid, grid_row_reactor, reactor_options_for_flow,
+    smallest_reactor_for_flow,
+)
+
+# Fields optimal_fission_with_dimensions fills in
+SIZED_FIELDS = ("x", "z", "y", "fuel_assemblies", "control_rods", "water_burn_rate")
+
+
+def _geometries():
+    """Every reactor geometry in (blocks, x, z, y) order."""
+    return sorted(
+        (x * z * y, x, z, y)
+        for x in range(CONST["MIN_REACTOR_BASE"], CONST["MAX_REACTOR_BASE"] + 1)
+        for z in range(CONST["MIN_REACTOR_BASE"], CONST["MAX_REACTOR_BASE"] + 1)
+        for y in range(CONST["MIN_REACTOR_HEIGHT"], CONST["MAX_REACTOR_HEIGHT"] + 1)
+    )
+
+
+def _values(x, z, y):
+    fuel = fuel_assemblies_dimensions(x, z, y)[0]
+    surface_area = checker_fuel_surface_area(x, z, y)
+    return {
+        "fuel_assemblies": fuel,
+        "casing_blocks": casing_blocks(x, z, y),
+        "heat_capacity": heat_capacity(x, z, y),
+        "boil_efficiency": boil_efficiency(surface_area, fuel),
+    }
+
+
+def _brute_force_front(fuel_needed, objectives):
+    candidates = [(x, z, y) for _, x, z, y in _geometries() if fuel_assemblies_dimensions(x, z, y)[0] >= fuel_needed]
+    keys = {}
+    for g in candidates:
+        values = _values(*g)
+        keys[g] = [values[name] if maximize else -values[name] for name, maximize in objectives]
+
+    def dominates(a, b):
+        return all(p >= q for p, q in zip(keys[a], keys[b])) and keys[a] != keys[b]
+    return [g for g in candidates if not any(dominates(other, g) for other in candidates)]
+
+
+def test_rows_match_the_scalar_functions():
+    columns = evaluate_reactor_grid()
+    assert [(x, z, y) for _, x, z, y in _geometries()] == list(zip(columns["x"], columns["z"], columns["y"]))
+    for index in range(0, len(columns["x"]), 7):
+        reactor = grid_row_reactor(index)
+        x, z, y = reactor.x, reactor.z, reactor.y
+        sized = optimal_fission_with_dimensions(x, z, y)
+        assert [getattr(reactor, name) for name in SIZED_FIELDS] == [getattr(sized, name) for name in SIZED_FIELDS]
+        values = _values(x, z, y)
+        assert (reactor.heat_capacity, reactor.boil_efficiency) == (values["heat_capacity"], values["boil_efficiency"])
+        assert reactor.fuel_surface_area == checker_fuel_surface_area(x, z, y)
+        assert reactor.max_burn_rate == reactor.fuel_assemblies
+
+
+@pytest.mark.parametrize("max_flow", [0, 20000, 400000, 4_000_000, 20_000_000, 38_400_000])
+def test_smallest_reactor_is_the_first_geometry_holding_the_fuel(max_flow):
+    needed = max_flow // CONST["FISSION_STEAM_PER_FUEL"]
+    expected = next((x, z, y) for _, x, z, y in _geometries() if fuel_assemblies_dimensions(x, z, y)[0] >= needed)
+    reactor = smallest_reactor_for_flow(max_flow)
+    assert (reactor.x, reactor.z, reactor.y) == expected
+
+
+@pytest.mark.parametrize("objectives", [
+    REACTOR_GRID_OBJECTIVES,
+    (("casing_blocks", False), ("heat_capacity", True)),
+    (("fuel_assemblies", True), ("boil_efficiency", True)),
+])
+@pytest.mark.parametrize("max_flow", [12_000_000, 24_000_000, 30_000_000])
+def test_options_match_pairwise_dominance(max_flow, objectives):
+    needed = max_flow // CONST["FISSION_STEAM_PER_FUEL"]
+    options = reactor_options_for_flow(max_flow, objectives)
+    assert [(r.x, r.z, r.y) for r in options] == _brute_force_front(needed, objectives)
+
+
+def test_too_much_fuel_raises():
+    flow = (max(evaluate_reactor_grid()["fuel_assemblies"]) + 1) * CONST["FISSION_STEAM_PER_FUEL"]
+    with pytest.raises(ValueError, match="No single reactor"):
+        smallest_reactor_for_flow(flow)
+    with pytest.raises(ValueError, match="No single reactor"):
+        reactor_options_for_flow(flow)
@@ -0,0 +1,101 @@
+import asyncio
+import json
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
+from calc import service
+from calc.service import SizingService
+from calc.turbine import turbine_based_on_fission_reactor
+
+
+async def _get(port: int, target: str):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"GET {target} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, body = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(body)
+
+
+def _serve(sizing: SizingService, scenario):
+    """Run scenario(port) against the service listening on an ephemeral localhost port."""
+    async def main():
+        server = await sizing.start("127.0.0.1", 0)
+        async with server:
+            return await asyncio.wait_for(scenario(server.sockets[0].getsockname()[1]), 30)
+    return asyncio.run(main())
+
+
+def test_identical_requests_are_computed_once_then_cached(monkeypatch):
+    calls = []
+    release = threading.Event()
+
+    def slow_turbine(flow):
+        calls.append(flow)
+        release.wait(10)
+        return turbine_based_on_fission_reactor(flow)
+    monkeypatch.setattr(service, "turbine_based_on_fission_reactor", slow_turbine)
+    sizing = SizingService()
+
+    async def scenario(port):
+        pending = [asyncio.ensure_future(_get(port, "/turbine?flow=400000")) for _ in range(5)]
+        while sizing.stats.requests < 5:
+            await asyncio.sleep(0.01)
+        release.set()
+        responses = await asyncio.gather(*pending)
+        return responses, await _get(port, "/turbine?flow=400000")
+
+    responses, cached = _serve(sizing, scenario)
+    expected = asdict(turbine_based_on_fission_reactor(400000))
+    assert calls == [400000]
+    assert responses == [(200, expected)] * 5
+    assert cached == (200, expected)
+    assert (sizing.stats.computed, sizing.stats.coalesced, sizing.stats.cache_hits) == (1, 4, 1)
+
+
+def test_error_statuses(monkeypatch):
+    def broken(*args):
+        raise RuntimeError("boom")
+    monkeypatch.setattr(service, "turbine_based_fission_reactor", broken)
+
+    async def scenario(port):
+        return [await _get(port, target) for target in (
+            "/turbine?flow=abc", "/nowhere", "/turbine?x_z=6&y=10", "/reactor?flow=400000", "/stats",
+        )]
+
+    (bad, missing, invalid, failed, stats) = _serve(SizingService(), scenario)
+    assert bad[0] == 400 and "integer" in bad[1]["error"]
+    assert missing[0] == 404
+    assert invalid[0] == 422 and "even" in invalid[1]["error"]
+    assert failed == (500, {"error": "Internal error: RuntimeError"})
+    assert stats[0] == 200 and stats[1]["errors"] == 4
+
+
+def test_out_of_range_parameters_are_bad_requests():
+    huge = "9" * 400
+    targets = (
+        "/turbine?flow=1e400", f"/turbine?flow={huge}", "/turbine?flow=-5", "/turbine?flow=1999",
+        f"/turbine?flow={1436 * 20000}", f"/reactor?flow={huge}", "/turbine?x_z=19&y=10", "/turbine?x_z=9&y=4",
+        f"/reactor?x=5&z={huge}&y=6", "/reactor?x=5&z=5&y=19", f"/setup?setup=sodium&max_flow={huge}",
+        "/setup?mode=dimensions&x=2&z=5&y=6",
+    )
+
+    async def scenario(port):
+        return [await _get(port, target) for target in targets]
+
+    sizing = SizingService()
+    responses = _serve(sizing, scenario)
+    assert [status for status, _ in responses] == [400] * len(targets)
+    assert "integer" in responses[0][1]["error"]
+    assert all("must be between" in body["error"] for _, body in responses[1:])
+    assert (sizing.stats.computed, sizing.stats.errors) == (0, len(targets))
+
+
+def test_process_pool_executor():
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        async def scenario(port):
+            return await asyncio.gather(_get(port, "/turbine?x_z=9&y=12"), _get(port, "/reactor?x=5&z=5&y=6"))
+        turbine, reactor = _serve(SizingService(executor=pool), scenario)
+    assert turbine[0] == 200 and (turbine[1]["x_z"], turbine[1]["y"]) == (9, 12)
+    assert reactor[0] == 200 and reactor[1]["fuel_assemblies"] > 0
@@ -0,0 +1,79 @@
+import pytest
+from calc.boiler import boiler_with_dimensions_for_flow
+from calc.constants import CONST
+from calc.reactor import turbine_based_fission_reactor
+from calc.simulate import (
+    Segment, _chain, _step, simulate, simulate_many, startup_scenario, turbine_trip_scenario,
+)
+from calc.turbine import turbine_based_on_fission_reactor
+
+
+def _plant(max_flow):
+    reactor = turbine_based_fission_reactor(max_flow)
+    return reactor, turbine_based_on_fission_reactor(reactor.water_burn_rate)
+
+
+def _stepped(reactor, turbine, scenario, boiler=None):
+    """Every tick stepped, no jumps: final state and first overheating tick."""
+    chain = _chain(reactor, turbine, boiler)
+    overheat_heat = (CONST["MAX_TEMPERATURE"] - CONST["AMBIENT_TEMPERATURE"]) * chain.heat_capacity
+    state, tick, overheat_tick = (0.0,) * 6, 0, None
+    for segment in scenario:
+        ticks = int(round(segment.seconds * CONST["TICKS_PER_SECOND"]))
+        for done in range(ticks):
+            burn_rate = segment.burn_rate
+            if segment.end_burn_rate is not None:
+                burn_rate += (segment.end_burn_rate - segment.burn_rate) * (done + 1) / ticks
+            state = _step(state, chain, burn_rate, segment.turbine_online, segment.load, [])
+            tick += 1
+            if overheat_tick is None and state[0] >= overheat_heat:
+                overheat_tick = tick
+    return chain, state, overheat_tick
+
+
+def _scenarios(burn_rate):
+    return [
+        startup_scenario(burn_rate, ramp_seconds=10, hold_seconds=300),
+        turbine_trip_scenario(burn_rate, run_seconds=60, trip_seconds=600),
+        [Segment(120, burn_rate * 2), Segment(60, burn_rate / 2, load=1e6), Segment(60, 0.0, turbine_online=False)],
+    ]
+
+
+@pytest.mark.parametrize("scenario_index", range(3))
+@pytest.mark.parametrize("sodium", [False, True])
+def test_jumps_match_stepping_every_tick(scenario_index, sodium):
+    reactor, turbine = _plant(400000)
+    boiler = boiler_with_dimensions_for_flow(9, 9, 12, reactor.water_burn_rate) if sodium else None
+    scenario = _scenarios(reactor.max_burn_rate)[scenario_index]
+    result = simulate(reactor, turbine, scenario, boiler, stop_on_overheat=False)
+    chain, state, overheat_tick = _stepped(reactor, turbine, scenario, boiler)
+
+    assert result.ticks == sum(int(round(s.seconds * CONST["TICKS_PER_SECOND"])) for s in scenario)
+    assert result.steps < result.ticks
+    assert result.overheat_tick == overheat_tick
+    assert result.temperature == pytest.approx(CONST["AMBIENT_TEMPERATURE"] + state[0] / chain.heat_capacity, rel=1e-9)
+    assert result.energy_produced == pytest.approx(state[4], rel=1e-9)
+    assert result.energy_wasted == pytest.approx(state[5], rel=1e-9, abs=1e-6)
+
+
+def test_turbine_trip_overheats_and_stops():
+    reactor, turbine = _plant(400000)
+    scenario = turbine_trip_scenario(reactor.max_burn_rate, run_seconds=60, trip_seconds=3600)
+    result = simulate(reactor, turbine, scenario)
+    assert result.overheat_tick is not None
+    assert result.ticks == result.overheat_tick
+    assert result.time_to_overheat == result.overheat_tick / CONST["TICKS_PER_SECOND"]
+
+
+def test_simulate_many_runs_each_plant():
+    plants = [(*_plant(flow), None) for flow in (200000, 400000)]
+    scenario = startup_scenario(5, ramp_seconds=5, hold_seconds=30)
+    assert simulate_many(plants, scenario) == [simulate(r, t, scenario) for r, t, _ in plants]
+
+
+def test_negative_burn_rate_raises():
+    reactor, turbine = _plant(400000)
+    with pytest.raises(ValueError, match="negative"):
+        simulate(reactor, turbine, [Segment(10, -1)])
+    with pytest.raises(ValueError, match="negative"):
+        simulate(reactor, turbine, [Segment(10, 1, end_burn_rate=-1)])
@@ -0,0 +1,87 @@
+from math import ceil
+import pytest
+from calc.boiler import boiler_handles, boiler_max_flow
+from calc.constants import CONST
+from calc.reactor import fuel_assemblies_dimensions, optimal_fission_with_dimensions
+from calc.sodium import sodium_flow, sodium_plant_for_flow, sodium_plant_with_dimensions, sodium_steam_flow
+from calc.turbine_grid import turbine_catalogue
+
+
+def _range(low, high):
+    return range(CONST[low], CONST[high] + 1)
+
+
+def _reactors():
+    for x in _range("MIN_REACTOR_BASE", "MAX_REACTOR_BASE"):
+        for z in _range("MIN_REACTOR_BASE", "MAX_REACTOR_BASE"):
+            for y in _range("MIN_REACTOR_HEIGHT", "MAX_REACTOR_HEIGHT"):
+                yield x, z, y
+
+
+def _smallest_parts(steam_flows):
+    """Fewest boiler and turbine blocks carrying each steam flow, by scanning every geometry."""
+    boilers = [
+        (x * z * y, boiler_max_flow(x, z, y))
+        for x in _range("BOILER_MIN_BASE", "BOILER_MAX_BASE")
+        for z in _range("BOILER_MIN_BASE", "BOILER_MAX_BASE")
+        for y in _range("BOILER_MIN_HEIGHT", "BOILER_MAX_HEIGHT")
+    ]
+    turbines = [(t.x_z * t.x_z * t.y, min(t.max_flow, t.max_water_output)) for t in turbine_catalogue()]
+    smallest = {}
+    for steam in set(steam_flows):
+        boiler = min((blocks for blocks, flow in boilers if flow >= steam), default=None)
+        turbine = min((blocks for blocks, flow in turbines if flow >= steam), default=None)
+        smallest[steam] = None if boiler is None or turbine is None else boiler + turbine
+    return smallest
+
+
+def _check_plant(plant):
+    x, z, y = plant.reactor.x, plant.reactor.z, plant.reactor.y
+    assert plant.reactor == optimal_fission_with_dimensions(x, z, y)
+    assert plant.sodium_flow == sodium_flow(plant.reactor.fuel_assemblies)
+    assert plant.steam_flow == sodium_steam_flow(plant.reactor.fuel_assemblies)
+    assert boiler_handles(plant.boiler, plant.steam_flow)
+    assert min(plant.turbine.max_flow, plant.turbine.max_water_output) >= plant.steam_flow
+    parts = (x * z * y, plant.boiler.x * plant.boiler.z * plant.boiler.y, plant.turbine.x_z ** 2 * plant.turbine.y)
+    assert plant.block_count == sum(parts)
+
+
+@pytest.fixture(scope="module")
+def reactors():
+    """(blocks, fuel assemblies, steam flow) of every reactor geometry that holds fuel."""
+    rows = []
+    for x, z, y in _reactors():
+        fuel = fuel_assemblies_dimensions(x, z, y)[0]
+        if fuel > 0:
+            rows.append((x * z * y, fuel, sodium_steam_flow(fuel)))
+    return rows, _smallest_parts(steam for _, _, steam in rows)
+
+
+@pytest.mark.parametrize("max_flow", [1, 20000, 20001, 400000, 1_000_000, 4_000_000, 9_000_000, 20_000_000])
+def test_plant_for_flow_is_the_smallest(reactors, max_flow):
+    rows, smallest = reactors
+    needed = ceil(max_flow / sodium_steam_flow(1))
+    plants = [blocks + smallest[steam] for blocks, fuel, steam in rows if fuel >= needed and smallest[steam]]
+    if not plants:
+        with pytest.raises(ValueError, match="No sodium-cooled plant"):
+            sodium_plant_for_flow(max_flow)
+        return
+    plant = sodium_plant_for_flow(max_flow)
+    _check_plant(plant)
+    assert plant.reactor.fuel_assemblies >= needed
+    assert plant.block_count == min(plants)
+
+
+@pytest.mark.parametrize("dimensions", [(3, 3, 4), (5, 5, 6), (7, 9, 12), (11, 11, 11), (18, 18, 18)])
+def test_plant_with_dimensions_is_the_smallest(dimensions):
+    fuel = fuel_assemblies_dimensions(*dimensions)[0]
+    steam = sodium_steam_flow(fuel)
+    parts = _smallest_parts([steam])[steam]
+    if parts is None:
+        with pytest.raises(ValueError, match="No sodium-cooled plant"):
+            sodium_plant_with_dimensions(*dimensions)
+        return
+    plant = sodium_plant_with_dimensions(*dimensions)
+    _check_plant(plant)
+    assert (plant.reactor.x, plant.reactor.z, plant.reactor.y) == dimensions
+    assert plant.block_count == dimensions[0] * dimensions[1] * dimensions[2] + parts
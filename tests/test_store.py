@@ -0,0 +1,95 @@
+import pytest
+from calc.farm import turbine_farm_for_flow
+from calc.profiles import make_profile, use_profile
+from calc.sodium import sodium_plant_for_flow, sodium_plant_with_dimensions
+from calc.store import ResultStore, store_key
+from calc.turbine import optimal_turbine_with_dimensions, turbine_based_on_fission_reactor
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ResultStore(str(tmp_path / "results.sqlite3"))
+    yield store
+    store.close()
+
+
+def test_hits_return_what_the_function_returned(store):
+    expected = turbine_based_on_fission_reactor(400000)
+    assert store.call(turbine_based_on_fission_reactor, 400000) == expected
+    assert store.call(turbine_based_on_fission_reactor, water_burn_rate=400000) == expected
+    assert (store.hits, store.misses, len(store)) == (1, 1, 1)
+
+
+def test_equivalent_arguments_share_a_row(store):
+    assert store_key(optimal_turbine_with_dimensions, (9, 12), {}) == \
+        store_key(optimal_turbine_with_dimensions, (9, 12), {"vent_mode": "closed_form"})
+    store.call(optimal_turbine_with_dimensions, 9, 12, "scan")
+    assert store.call(optimal_turbine_with_dimensions, 9, 12, "closed_form") == optimal_turbine_with_dimensions(9, 12)
+    assert len(store) == 1
+
+
+def test_errors_are_stored_and_raised_again(store):
+    for _ in range(2):
+        with pytest.raises(ValueError, match="even"):
+            store.call(optimal_turbine_with_dimensions, 8, 12)
+    assert (store.hits, store.misses) == (1, 1)
+
+
+def test_unknown_vent_mode_is_not_keyed_as_a_valid_one(store):
+    with pytest.raises(ValueError, match="Unknown vent search mode"):
+        store.call(optimal_turbine_with_dimensions, 9, 12, "guess")
+    assert store.call(optimal_turbine_with_dimensions, 9, 12) == optimal_turbine_with_dimensions(9, 12)
+
+
+def test_values_keep_their_type(store):
+    assert store_key(turbine_based_on_fission_reactor, (400000.0,), {}) != \
+        store_key(turbine_based_on_fission_reactor, (400000,), {})
+    for flow in (5_000_000.0, 5_000_000, 5_000_000.0, 5_000_000):
+        farm = store.call(turbine_farm_for_flow, flow)
+        assert farm == turbine_farm_for_flow(flow)
+        assert type(farm.steam_flow) is type(flow) and type(farm.max_production) is float
+    assert (store.hits, store.misses) == (2, 2)
+
+
+@pytest.mark.parametrize("function, args", [
+    (turbine_farm_for_flow, (5_000_000,)),
+    (turbine_farm_for_flow, (5_000_000, 4, "power", True)),
+    (sodium_plant_for_flow, (400000,)),
+    (sodium_plant_with_dimensions, (9, 9, 12)),
+])
+def test_nested_results_round_trip(store, function, args):
+    expected = function(*args)
+    for _ in range(2):
+        assert store.call(function, *args) == expected
+    assert store.hits == 1
+
+
+def test_other_constants_miss(store):
+    store.call(turbine_based_on_fission_reactor, 400000)
+    with use_profile(make_profile({"GENERAL_VENT_GAS_FLOW": 64000})):
+        assert store.call(turbine_based_on_fission_reactor, 400000) == turbine_based_on_fission_reactor(400000)
+    assert (store.hits, store.misses) == (0, 2)
+
+
+def test_fresh_hits_do_not_write(store):
+    store.call(turbine_based_on_fission_reactor, 400000)
+    statements = []
+    store._connection().set_trace_callback(statements.append)
+    store.call(turbine_based_on_fission_reactor, 400000)
+    assert statements and all(statement.startswith("SELECT") for statement in statements)
+
+
+def test_least_recently_used_rows_are_evicted(tmp_path):
+    store = ResultStore(str(tmp_path / "results.sqlite3"), max_rows=2)
+    for flow in (100000, 200000, 300000):
+        store.call(turbine_based_on_fission_reactor, flow)
+    assert store.evict() == 1
+    assert len(store) == 2
+    store.call(turbine_based_on_fission_reactor, 100000)
+    assert store.misses == 4
+    store.close()
+
+
+def test_max_rows_must_be_positive(tmp_path):
+    with pytest.raises(ValueError, match="max_rows"):
+        ResultStore(str(tmp_path / "results.sqlite3"), max_rows=0)
@@ -0,0 +1,36 @@
+import pytest
+from calc.constants import CONST
+from calc.profiles import clear_caches
+from calc.turbine import optimal_turbine_with_dimensions, turbine_based_on_fission_reactor
+from calc.turbine_grid import (
+    turbine_based_on_fission_reactor_grid, turbine_catalogue, turbines_based_on_fission_reactors,
+)
+
+RATES = [1, 19999, 20000, 123456.5, 400000, 1000000, 2000000]
+
+
+@pytest.mark.parametrize("rate", RATES)
+def test_grid_matches_the_scalar_search(rate):
+    assert turbine_based_on_fission_reactor_grid(rate) == turbine_based_on_fission_reactor(rate)
+
+
+def test_batch_matches_one_at_a_time():
+    rates = RATES + [400000, 10 ** 9]
+    turbines = turbines_based_on_fission_reactors(rates, allow_missing=True)
+    assert turbines[:-1] == [turbine_based_on_fission_reactor(rate) for rate in rates[:-1]]
+    assert turbines[-1] is None
+    with pytest.raises(ValueError, match="No valid turbine"):
+        turbines_based_on_fission_reactors([10 ** 9])
+
+
+def test_direct_constant_edits_are_not_served_from_the_cache(monkeypatch):
+    turbine_based_on_fission_reactor_grid(400000)
+    turbine_catalogue()
+    monkeypatch.setitem(CONST, "TURBINE_MAX_ROTOR_HEIGHT", 6)
+    try:
+        assert turbine_based_on_fission_reactor_grid(400000) == turbine_based_on_fission_reactor(400000)
+        assert turbine_catalogue()[-1] == optimal_turbine_with_dimensions(17, CONST["TURBINE_MAX_HEIGHT"])
+        assert max(t.shaft_height for t in turbine_catalogue()) == 5
+    finally:
+        monkeypatch.undo()
+        clear_caches()
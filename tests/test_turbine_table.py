@@ -0,0 +1,67 @@
+import os
+import pytest
+from calc import turbine_table
+from calc.constants import CONST, constants_hash
+from calc.profiles import clear_caches
+from calc.turbine import turbine_based_on_fission_reactor
+from calc.turbine_table import (
+    CACHE_DIR_VARIABLE, TurbineTable, build_turbine_table, default_table_path, evict_default_tables,
+    turbine_based_on_fission_reactor_indexed,
+)
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv(CACHE_DIR_VARIABLE, str(tmp_path))
+    yield tmp_path
+    clear_caches()
+
+
+@pytest.fixture(scope="module")
+def table(tmp_path_factory):
+    path = tmp_path_factory.mktemp("table") / "turbine_table.bin"
+    build_turbine_table(str(path))
+    with TurbineTable(str(path)) as table:
+        yield table
+
+
+@pytest.mark.parametrize("rate", [1, 19999, 20000, 20001, 123456.5, 400000, 1000000, 2000000])
+def test_lookup_matches_the_scalar_search(table, rate):
+    assert table.lookup(rate) == turbine_based_on_fission_reactor(rate)
+
+
+def test_default_table_is_built_in_the_cache_dir(cache_dir):
+    assert turbine_based_on_fission_reactor_indexed(400000) == turbine_based_on_fission_reactor(400000)
+    assert os.listdir(cache_dir) == [os.path.basename(default_table_path(constants_hash()))]
+
+
+def test_clearing_caches_closes_the_open_tables(cache_dir):
+    turbine_based_on_fission_reactor_indexed(400000)
+    (table,) = turbine_table._default_tables.values()
+    clear_caches()
+    assert not turbine_table._default_tables
+    assert table._map.closed
+
+
+def test_stale_tables_are_evicted(cache_dir):
+    for age in range(6):
+        path = cache_dir / f"turbine_table.{age:040x}.bin"
+        path.write_bytes(b"")
+        os.utime(path, (1000 - age, 1000 - age))
+    (cache_dir / "notes.txt").write_text("kept")
+    deleted = evict_default_tables(keep=4)
+    assert sorted(os.path.basename(p) for p in deleted) == [f"turbine_table.{age:040x}.bin" for age in (4, 5)]
+    assert len(os.listdir(cache_dir)) == 5
+
+
+def test_table_of_other_constants_is_rejected(tmp_path, monkeypatch):
+    path = str(tmp_path / "turbine_table.bin")
+    build_turbine_table(path)
+    monkeypatch.setitem(CONST, "GENERAL_VENT_GAS_FLOW", CONST["GENERAL_VENT_GAS_FLOW"] * 2)
+    clear_caches()
+    try:
+        with pytest.raises(ValueError, match="different constants"):
+            TurbineTable(path)
+    finally:
+        monkeypatch.undo()
+        clear_caches()